@@ -6,7 +6,7 @@ import colored_traceback
 from tabulate import tabulate
 
 from gocker.arguments import parse_main_args, ArgumentAction
-from gocker.gui import gui
+from gocker.gui import gui, headless
 from gocker.arguments import get_docker_socket_paths
 from gocker.gui.shortcut import shortcuts
 
@@ -50,7 +50,20 @@ def main() -> None:
             print(f"Can't find a valid docker.sock path in {repr(get_docker_socket_paths())}")
             sys.exit(1)
 
-        gui(args.docker_host, args.fsevents_address, args.fsevents_port)
+        gui(args)
+        sys.exit(0)
+
+    if args.action == ArgumentAction.ACTION_HEADLESS:
+        init_logger(args.loglevel)
+        logging.info("Starting headless")
+        if args.docker_host is None:
+            print(f"Can't find a valid docker.sock path in {repr(get_docker_socket_paths())}")
+            sys.exit(1)
+        if args.metrics_port is None:
+            print("--metrics-port is required by the headless action")
+            sys.exit(1)
+
+        headless(args)
         sys.exit(0)
 
     if args.action == ArgumentAction.ACTION_SHORTCUT_LIST:
@@ -2,6 +2,7 @@ import argparse
 import logging
 import os
 import json
+import re
 import shutil
 
 from gocker.process import process_exec
@@ -9,9 +10,53 @@ from gocker.process import process_exec
 
 class ArgumentAction:
     ACTION_GUI = 'gui'
+    ACTION_HEADLESS = 'headless'
     ACTION_SHORTCUT_LIST = 'shortcut-list'
 
 
+class LogOverflowPolicy:
+    BLOCK = 'block'
+    DROP_OLDEST = 'drop-oldest'
+    SAMPLE = 'sample'
+
+
+# indented stack frames (java, python), chained java exceptions and php stack traces
+DEFAULT_LOG_MULTILINE_CONTINUATION = r'\s|Caused by: |Stack trace:|#\d+ |\.\.\. \d+ more'
+
+
+class MetricsBackend:
+    STREAM = 'stream'
+    ONESHOT = 'oneshot'
+    CGROUP = 'cgroup'
+
+
+def log_tail_type(value):
+    if value == 'all':
+        return value
+    try:
+        return int(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError('must be a number of lines or "all"') from error
+
+
+def positive_int_type(value):
+    try:
+        number = int(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError('must be a number') from error
+    if number < 1:
+        raise argparse.ArgumentTypeError('must be at least 1')
+    return number
+
+
+def regex_type(value):
+    try:
+        re.compile(value)
+    except re.error as error:
+        raise argparse.ArgumentTypeError('invalid regex: %s' % error) from error
+    return value
+
+
 def get_docker_socket_paths():
     for context_string in process_exec([shutil.which('docker'), "context", "ls", "--format", "json"]).split("\n"):
         context = json.loads(context_string)
@@ -79,4 +124,173 @@ def parse_main_args():
         dest='fsevents_port',
         default=8087,
     )
+    parser.add_argument(
+        '--metrics-max-connections',
+        help='maximum number of concurrent docker stats connections',
+        type=int,
+        dest='metrics_max_connections',
+        default=32,
+    )
+    parser.add_argument(
+        '--metrics-backend',
+        help='container metrics source, "stream" keeps a stats stream open per container,\n'
+             '"oneshot" polls every container on a shared one second tick,\n'
+             '"cgroup" reads /sys/fs/cgroup and needs gocker on the docker host',
+        dest='metrics_backend',
+        choices=[getattr(MetricsBackend, name) for name in dir(MetricsBackend) if not name.startswith('_')],
+        default=MetricsBackend.STREAM,
+    )
+    parser.add_argument(
+        '--cgroup-root',
+        help='cgroup filesystem mount point',
+        dest='cgroup_root',
+        default='/sys/fs/cgroup',
+    )
+    parser.add_argument(
+        '--metrics-history',
+        help='seconds of cpu/memory history kept per container',
+        type=positive_int_type,
+        dest='metrics_history',
+        default=600,
+    )
+    parser.add_argument(
+        '--metrics-slow-interval',
+        help='seconds between two samples of an idle container that is not displayed',
+        type=float,
+        dest='metrics_slow_interval',
+        default=10,
+    )
+    parser.add_argument(
+        '--metrics-busy-threshold',
+        help='cpu percentage above which a container is always sampled every second',
+        type=float,
+        dest='metrics_busy_threshold',
+        default=5,
+    )
+    parser.add_argument(
+        '--metrics-port',
+        help='serve the container metrics in OpenMetrics format on this port, required by the headless action',
+        type=int,
+        dest='metrics_port',
+        default=None,
+    )
+    parser.add_argument(
+        '--metrics-address',
+        help='address the OpenMetrics endpoint listens on',
+        dest='metrics_address',
+        default='127.0.0.1',
+    )
+    parser.add_argument(
+        '--log-tail',
+        help='number of past lines displayed when the logs of a container are shown, "all" for the whole history',
+        type=log_tail_type,
+        dest='log_tail',
+        default=200,
+    )
+    parser.add_argument(
+        '--log-all-tail',
+        help='number of past lines displayed per container when all the logs are shown',
+        type=log_tail_type,
+        dest='log_all_tail',
+        default=20,
+    )
+    parser.add_argument(
+        '--log-since',
+        help='only display past lines of the last LOG_SINCE seconds when the logs of a container are shown',
+        type=float,
+        dest='log_since',
+        default=None,
+    )
+    parser.add_argument(
+        '--log-buffer-size',
+        help='maximum number of lines of a log stream waiting to be displayed',
+        type=int,
+        dest='log_buffer_size',
+        default=10000,
+    )
+    parser.add_argument(
+        '--log-overflow',
+        help='what to do when the buffer of a log stream is full, "block" stops reading the stream,\n'
+             '"drop-oldest" discards the oldest waiting lines, "sample" only keeps 1 line out of N',
+        dest='log_overflow',
+        choices=[getattr(LogOverflowPolicy, name) for name in dir(LogOverflowPolicy) if not name.startswith('_')],
+        default=LogOverflowPolicy.DROP_OLDEST,
+    )
+    parser.add_argument(
+        '--log-flood-threshold',
+        help='lines per second above which only a sample of the lines of a log stream is displayed, 0 to disable',
+        type=int,
+        dest='log_flood_threshold',
+        default=500,
+    )
+    parser.add_argument(
+        '--log-reorder-window',
+        help='seconds the log lines wait to be displayed in timestamp order across containers, 0 to disable',
+        type=float,
+        dest='log_reorder_window',
+        default=0.25,
+    )
+    parser.add_argument(
+        '--log-timestamps',
+        help='display the timestamp of the log lines',
+        action='store_true',
+        dest='log_timestamps',
+    )
+    parser.add_argument(
+        '--log-multiline-start',
+        help='regex matching the first line of a log entry, the lines that do not match it are folded\n'
+             'in the previous entry (e.g. "\\d{4}-\\d\\d-\\d\\d" for a leading date)',
+        type=regex_type,
+        dest='log_multiline_start',
+        default=None,
+    )
+    parser.add_argument(
+        '--log-multiline-continuation',
+        help='regex matching the lines folded in the previous log entry when --log-multiline-start is not set,\n'
+             'an empty value disables the folding',
+        type=regex_type,
+        dest='log_multiline_continuation',
+        default=DEFAULT_LOG_MULTILINE_CONTINUATION,
+    )
+    parser.add_argument(
+        '--log-json-fields',
+        help='comma separated fields (or dotted paths) extracted from json log lines, they can be queried\n'
+             'in the log filter after a ":" (e.g. ":level=error duration>500"), an empty value disables the extraction',
+        dest='log_json_fields',
+        default='level,msg,trace_id,duration',
+    )
+    parser.add_argument(
+        '--log-max-lines',
+        help='maximum number of lines kept in the log pane',
+        type=int,
+        dest='log_max_lines',
+        default=10000,
+    )
+    parser.add_argument(
+        '--log-archive-dir',
+        help='directory where the received log lines are archived as gzip json lines segments, disabled by default',
+        dest='log_archive_dir',
+        default=None,
+    )
+    parser.add_argument(
+        '--log-archive-segment-size',
+        help='size in MiB of a log archive segment before a new one is started',
+        type=int,
+        dest='log_archive_segment_size',
+        default=64,
+    )
+    parser.add_argument(
+        '--log-archive-retention',
+        help='maximum size in MiB of all the log archive segments, the oldest ones are removed',
+        type=int,
+        dest='log_archive_retention',
+        default=1024,
+    )
+    parser.add_argument(
+        '--reconcile-interval',
+        help='seconds between two full container list refreshes, docker events are applied immediately',
+        type=float,
+        dest='reconcile_interval',
+        default=30,
+    )
     return parser
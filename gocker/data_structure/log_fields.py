@@ -0,0 +1,154 @@
+import json
+import math
+import operator
+import re
+import shlex
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+LOG_FIELD_CONDITION = re.compile(r'^([\w.@-]+)(!=|>=|<=|=|>|<|~)(.*)$', re.DOTALL)
+NUMERIC_OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+}
+
+
+def format_field_value(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, separators=(',', ':'))
+
+
+def get_field_number(value: Any) -> float:
+    if isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return math.nan
+    return math.nan
+
+
+class LogFieldExtractor:
+    """
+    Detects the json log lines and extracts the value of the configured `fields`,
+    a field can be a dotted path in nested objects (`http.status`).
+    """
+
+    def __init__(self, fields: List[str]):
+        self.fields = fields
+        self.paths = [field.split('.') for field in fields]
+
+    def is_enabled(self):
+        return len(self.fields) > 0
+
+    def extract(self, line: str) -> Optional[Dict[str, Any]]:
+        if not line.startswith('{'):
+            return None
+        try:
+            document = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(document, dict):
+            return None
+        fields = {}
+        for field, path in zip(self.fields, self.paths):
+            value = document
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if value is not None:
+                fields[field] = value
+        return fields
+
+
+@dataclass
+class LogFieldCondition:
+    field: str
+    operator: str
+    value: str
+    number: float
+    pattern: Optional[re.Pattern] = None
+
+    def matches_value(self, value: str) -> bool:
+        if self.operator == '~':
+            return self.pattern.search(value) is not None
+        equal = value.lower() == self.value.lower() or get_field_number(value) == self.number
+        return equal if self.operator == '=' else not equal
+
+
+def parse_field_query(text: str, fields: List[str]) -> Optional[List[LogFieldCondition]]:
+    """
+    Parses a filter made of conditions on extracted fields, all of them have to match
+    (`level=error duration>500 msg~"timed? out"`).
+    Returns None when the text is not such a query: an unknown field, a comparison with a non numeric value...
+    """
+    try:
+        terms = shlex.split(text)
+    except ValueError:
+        return None
+    conditions = []
+    for term in terms:
+        match = LOG_FIELD_CONDITION.match(term)
+        if match is None or match.group(1) not in fields:
+            return None
+        field, condition_operator, value = match.groups()
+        condition = LogFieldCondition(field, condition_operator, value, get_field_number(value))
+        if condition_operator in NUMERIC_OPERATORS and math.isnan(condition.number):
+            return None
+        if condition_operator == '~':
+            try:
+                condition.pattern = re.compile(value, re.IGNORECASE)
+            except re.error:
+                return None
+        conditions.append(condition)
+    return conditions if conditions else None
+
+
+class LogFieldColumn:
+    """
+    Values of one field for the entries of a log store chunk: a code per entry, indexing the distinct values
+    of the chunk (0 when the entry has no value), and the value as a number (nan when it is not one).
+    A condition is evaluated once per distinct value, then on the codes or the numbers of the entries.
+    """
+    __slots__ = ('codes', 'numbers', 'values', 'value_codes')
+
+    def __init__(self, size: int):
+        self.codes = array('L', [0]) * size
+        self.numbers = array('d', [math.nan]) * size
+        self.values: List[str] = ['']
+        self.value_codes: Dict[str, int] = {}
+
+    def append(self, value: Any):
+        if value is None:
+            self.codes.append(0)
+            self.numbers.append(math.nan)
+            return
+        text = format_field_value(value)
+        code = self.value_codes.get(text)
+        if code is None:
+            code = len(self.values)
+            self.value_codes[text] = code
+            self.values.append(text)
+        self.codes.append(code)
+        self.numbers.append(get_field_number(value))
+
+    def get(self, index: int) -> Optional[str]:
+        code = self.codes[index]
+        return self.values[code] if code > 0 else None
+
+    def match(self, condition: LogFieldCondition, indexes: List[int]) -> List[int]:
+        if condition.operator in NUMERIC_OPERATORS:
+            compare = NUMERIC_OPERATORS[condition.operator]
+            numbers = self.numbers
+            return [index for index in indexes if compare(numbers[index], condition.number)]
+        codes = self.codes
+        matching_codes = {
+            code for code, value in enumerate(self.values) if code > 0 and condition.matches_value(value)
+        }
+        return [index for index in indexes if codes[index] in matching_codes]
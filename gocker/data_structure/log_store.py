@@ -0,0 +1,234 @@
+import itertools
+import math
+import re
+import sys
+from array import array
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from gocker.data_structure.log_fields import LogFieldColumn, LogFieldCondition
+from gocker.data_structure.trigram_index import TRIGRAM_BLOCK_SIZE, TrigramIndex, get_required_trigrams
+
+LOG_STORE_CHUNK_SIZE = 4096
+STREAM_NAMES = ['stdout', 'stderr', 'stdin']
+
+
+@dataclass
+class LogEntry:
+    position: int
+    context: str
+    lines: List[str]
+    stream: str
+    timestamp: Optional[float]
+
+    @property
+    def text(self):
+        return '\n'.join(self.lines)
+
+
+class LogStoreChunk:
+    """
+    Up to LOG_STORE_CHUNK_SIZE log entries: the utf-8 text of all the entries in one bytearray with
+    their end offsets, and arrays of context indexes, stream codes and timestamps.
+    Lines folded in an entry after it was added are kept aside in `folded`.
+    The fields extracted from json lines are stored by column in `fields`, a column is only created once
+    an entry of the chunk has that field.
+    """
+    __slots__ = ('buffer', 'offsets', 'contexts', 'streams', 'timestamps', 'folded', 'fields')
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.offsets = array('L')
+        self.contexts = array('L')
+        self.streams = bytearray()
+        self.timestamps = array('d')
+        self.folded: Dict[int, List[str]] = {}
+        self.fields: Dict[str, LogFieldColumn] = {}
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def append(self, context: int, text: str, stream: int, timestamp: float, fields: Optional[Dict[str, Any]]):
+        if fields:
+            for field in fields:
+                if field not in self.fields:
+                    self.fields[field] = LogFieldColumn(len(self))
+        for field, column in self.fields.items():
+            column.append(fields.get(field) if fields else None)
+        self.buffer += text.encode('utf-8')
+        self.offsets.append(len(self.buffer))
+        self.contexts.append(context)
+        self.streams.append(stream)
+        self.timestamps.append(timestamp)
+
+    def get_text(self, index: int) -> str:
+        start = self.offsets[index - 1] if index > 0 else 0
+        return self.buffer[start:self.offsets[index]].decode('utf-8')
+
+
+# pylint: disable=too-many-instance-attributes
+class LogStore:
+    """
+    Compact storage of the log entries displayed in the log pane.
+    Entries are addressed by an absolute position that keeps growing, only the last `max_entries`
+    entries are kept, whole chunks are released once all their entries are out.
+    Context names are interned and stored as indexes.
+    The search text of an entry is `context text`, a trigram index of these texts narrows regex searches
+    down to the blocks of entries containing the literals of the regex.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.index = TrigramIndex()
+        self.chunks: Deque[LogStoreChunk] = deque()
+        self.first_chunk_position = 0
+        self.start = 0
+        self.end = 0
+        self.contexts: List[str] = []
+        self.context_indexes: Dict[str, int] = {}
+
+    def __len__(self):
+        return self.end - self.start
+
+    def __contains__(self, position: int):
+        return self.start <= position < self.end
+
+    def append(
+            self,
+            context: str,
+            text: str,
+            stream: str = 'stdout',
+            timestamp: Optional[float] = None,
+            fields: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        if not self.chunks or len(self.chunks[-1]) >= LOG_STORE_CHUNK_SIZE:
+            self.chunks.append(LogStoreChunk())
+        self.chunks[-1].append(
+            self.__get_context_index(context),
+            text,
+            STREAM_NAMES.index(stream) if stream in STREAM_NAMES else 0,
+            math.nan if timestamp is None else timestamp,
+            fields,
+        )
+        self.index.add(self.end, context + ' ' + text)
+        self.end += 1
+        self.__trim()
+        return self.end - 1
+
+    def fold(self, position: int, text: str):
+        if position not in self:
+            return
+        chunk, index = self.__locate(position)
+        chunk.folded.setdefault(index, []).append(text)
+        self.index.add(position, text)
+
+    def get(self, position: int) -> LogEntry:
+        chunk, index = self.__locate(position)
+        timestamp = chunk.timestamps[index]
+        return LogEntry(
+            position,
+            self.contexts[chunk.contexts[index]],
+            [chunk.get_text(index)] + chunk.folded.get(index, []),
+            STREAM_NAMES[chunk.streams[index]],
+            None if math.isnan(timestamp) else timestamp,
+        )
+
+    def get_search_text(self, position: int) -> str:
+        chunk, index = self.__locate(position)
+        text = chunk.get_text(index)
+        if index in chunk.folded:
+            text = '\n'.join([text] + chunk.folded[index])
+        return self.contexts[chunk.contexts[index]] + ' ' + text
+
+    def search(self, pattern: re.Pattern, start: Optional[int] = None) -> List[int]:
+        """
+        Positions, from `start`, of the entries whose search text matches `pattern`.
+        """
+        return [
+            position
+            for candidates in self.get_candidate_ranges(pattern, start)
+            for position in candidates
+            if pattern.search(self.get_search_text(position))
+        ]
+
+    def get_candidate_ranges(self, pattern: re.Pattern, start: Optional[int] = None, end: Optional[int] = None) \
+            -> List[range]:
+        """
+        Ranges of the positions, between `start` and `end`, that may match `pattern` according to the trigram index.
+        """
+        start = self.start if start is None else max(start, self.start)
+        end = self.end if end is None else min(end, self.end)
+        blocks = self.index.get_candidate_blocks(get_required_trigrams(pattern))
+        if blocks is None:
+            return [range(start, end)] if start < end else []
+        ranges = [
+            range(max(block * TRIGRAM_BLOCK_SIZE, start), min((block + 1) * TRIGRAM_BLOCK_SIZE, end))
+            for block in blocks
+        ]
+        return [candidates for candidates in ranges if len(candidates) > 0]
+
+    def get_field(self, position: int, field: str) -> Optional[str]:
+        chunk, index = self.__locate(position)
+        column = chunk.fields.get(field)
+        return column.get(index) if column is not None else None
+
+    def get_field_candidate_ranges(
+            self,
+            conditions: List[LogFieldCondition],
+            start: Optional[int] = None,
+            end: Optional[int] = None,
+    ) -> List[range]:
+        """
+        Ranges of the positions, between `start` and `end`, of the chunks that have all the fields of `conditions`.
+        """
+        start = self.start if start is None else max(start, self.start)
+        end = self.end if end is None else min(end, self.end)
+        ranges = [
+            range(max(chunk_position, start), min(chunk_position + LOG_STORE_CHUNK_SIZE, end))
+            for chunk_position, chunk in zip(
+                itertools.count(self.first_chunk_position, LOG_STORE_CHUNK_SIZE),
+                self.chunks,
+            )
+            if all(condition.field in chunk.fields for condition in conditions)
+        ]
+        return [candidates for candidates in ranges if len(candidates) > 0]
+
+    def match_fields(self, conditions: List[LogFieldCondition], positions: List[int]) -> List[int]:
+        """
+        Positions, among `positions`, of the entries whose fields match all the `conditions`,
+        evaluated on the field columns of the chunks.
+        """
+        matches = []
+        positions = [position for position in positions if position in self]
+        for chunk_offset, chunk_positions in itertools.groupby(
+                positions,
+                lambda position: (position - self.first_chunk_position) // LOG_STORE_CHUNK_SIZE
+        ):
+            chunk = self.chunks[chunk_offset]
+            chunk_position = self.first_chunk_position + chunk_offset * LOG_STORE_CHUNK_SIZE
+            indexes = [position - chunk_position for position in chunk_positions]
+            for condition in conditions:
+                column = chunk.fields.get(condition.field)
+                indexes = column.match(condition, indexes) if column is not None and indexes else []
+            matches.extend(chunk_position + index for index in indexes)
+        return matches
+
+    def __locate(self, position: int):
+        offset = position - self.first_chunk_position
+        return self.chunks[offset // LOG_STORE_CHUNK_SIZE], offset % LOG_STORE_CHUNK_SIZE
+
+    def __get_context_index(self, context: str) -> int:
+        if context not in self.context_indexes:
+            self.context_indexes[context] = len(self.contexts)
+            self.contexts.append(sys.intern(context))
+        return self.context_indexes[context]
+
+    def __trim(self):
+        if self.end - self.start <= self.max_entries:
+            return
+        self.start = self.end - self.max_entries
+        self.index.discard_before(self.start)
+        while self.first_chunk_position + LOG_STORE_CHUNK_SIZE <= self.start:
+            self.chunks.popleft()
+            self.first_chunk_position += LOG_STORE_CHUNK_SIZE
@@ -0,0 +1,31 @@
+from array import array
+from typing import List
+
+
+class RingBuffer:
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError('RingBuffer size must be positive')
+        self.__data = array('d', [0.0]) * size
+        self.__size = size
+        self.__index = 0
+        self.__count = 0
+
+    def __len__(self):
+        return self.__count
+
+    def append(self, value: float):
+        self.__data[self.__index] = value
+        self.__index = (self.__index + 1) % self.__size
+        if self.__count < self.__size:
+            self.__count += 1
+
+    def last(self, count: int) -> List[float]:
+        count = min(count, self.__count)
+        start = (self.__index - count) % self.__size
+        if start + count <= self.__size:
+            return self.__data[start:start + count].tolist()
+        return self.__data[start:].tolist() + self.__data[:start + count - self.__size].tolist()
+
+    def values(self) -> List[float]:
+        return self.last(self.__count)
@@ -0,0 +1,123 @@
+import re
+from array import array
+from typing import Dict, List, Optional, Set
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # python < 3.11
+    import sre_constants  # pylint: disable=deprecated-module
+    import sre_parse  # pylint: disable=deprecated-module
+
+TRIGRAM_BLOCK_SIZE = 64
+# ascii letters that also match non ascii characters when ignoring case: ſ, K (kelvin sign), İ and ı
+IGNORECASE_NON_ASCII_LETTERS = frozenset('iks')
+REPEAT_OPCODES = [sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT] + (
+    [sre_constants.POSSESSIVE_REPEAT] if hasattr(sre_constants, 'POSSESSIVE_REPEAT') else []
+)
+
+
+def get_trigrams(text: str) -> Set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+def get_required_literals(parsed, ignore_case: bool = False) -> List[str]:
+    """
+    Lowercase ascii strings that every match of a parsed regex contains:
+    runs of literals outside of alternations and optional parts.
+    When ignoring case, runs also end at the letters that match a non ascii character,
+    whose trigrams are not the ones of the lowercase text.
+    """
+    literals = []
+    run = []
+    for opcode, argument in parsed:
+        if opcode == sre_constants.LITERAL and argument < 128 and argument != ord('\n'):
+            literal = chr(argument).lower()
+            if not ignore_case or literal not in IGNORECASE_NON_ASCII_LETTERS:
+                run.append(literal)
+                continue
+        literals.append(''.join(run))
+        run = []
+        if opcode in REPEAT_OPCODES and argument[0] >= 1:
+            literals.extend(get_required_literals(argument[2], ignore_case))
+        elif opcode == sre_constants.SUBPATTERN:
+            group_ignore_case = (ignore_case or argument[1] & re.IGNORECASE) and not argument[2] & re.IGNORECASE
+            literals.extend(get_required_literals(argument[-1], bool(group_ignore_case)))
+    literals.append(''.join(run))
+    return [literal for literal in literals if literal]
+
+
+def get_required_trigrams(pattern: re.Pattern) -> Set[str]:
+    trigrams = set()
+    parsed = sre_parse.parse(pattern.pattern, pattern.flags)
+    for literal in get_required_literals(parsed, bool(pattern.flags & re.IGNORECASE)):
+        trigrams.update(get_trigrams(literal))
+    return trigrams
+
+
+class TrigramIndex:
+    """
+    Incremental index of the lowercase trigrams of the texts added at increasing positions.
+    Positions are grouped in blocks of TRIGRAM_BLOCK_SIZE, a trigram maps to the blocks that contain it:
+    the trigrams of the current block are gathered in a set and only added to the postings once the
+    block is complete, a lookup returns candidate blocks whose texts still have to be checked.
+    """
+
+    def __init__(self):
+        self.postings: Dict[str, array] = {}
+        self.block = 0
+        self.block_trigrams: Set[str] = set()
+        self.first_block = 0
+        self.stale_blocks = 0
+
+    def add(self, position: int, text: str):
+        block = position // TRIGRAM_BLOCK_SIZE
+        if block < self.block:
+            self.__add_trigrams(block, get_trigrams(text.lower()))
+            return
+        if block > self.block:
+            self.__add_trigrams(self.block, self.block_trigrams)
+            self.block = block
+            self.block_trigrams = set()
+        self.block_trigrams.update(get_trigrams(text.lower()))
+
+    def get_candidate_blocks(self, trigrams: Set[str]) -> Optional[List[int]]:
+        """
+        Blocks that may contain all the trigrams, None when there is no trigram to look for.
+        """
+        if not trigrams:
+            return None
+        postings = sorted((self.postings.get(trigram, array('I')) for trigram in trigrams), key=len)
+        blocks = set(postings[0])
+        for posting in postings[1:]:
+            if not blocks:
+                break
+            blocks.intersection_update(posting)
+        if trigrams.issubset(self.block_trigrams):
+            blocks.add(self.block)
+        return sorted(block for block in blocks if block >= self.first_block)
+
+    def discard_before(self, position: int):
+        """
+        Forgets the blocks before the one of `position`, postings are compacted once there are
+        more forgotten blocks than live ones.
+        """
+        first_block = position // TRIGRAM_BLOCK_SIZE
+        self.stale_blocks += first_block - self.first_block
+        self.first_block = first_block
+        if self.stale_blocks <= self.block - self.first_block + 1:
+            return
+        self.stale_blocks = 0
+        for trigram in list(self.postings):
+            posting = array('I', (block for block in self.postings[trigram] if block >= first_block))
+            if posting:
+                self.postings[trigram] = posting
+            else:
+                del self.postings[trigram]
+
+    def __add_trigrams(self, block: int, trigrams: Set[str]):
+        for trigram in trigrams:
+            posting = self.postings.get(trigram)
+            if posting is None:
+                self.postings[trigram] = array('I', [block])
+            elif posting[-1] != block:
+                posting.append(block)
@@ -1,10 +1,14 @@
 import logging
 import sys
 import threading
+import time
 
 import gocker
 from gocker.gui.app import App
 from gocker.gui.dependency_injection import Container
+from gocker.gui.services.docker_container.docker_containers_service import DockerContainerService
+from gocker.gui.services.docker_container.docker_events import DockerEventsThread
+from gocker.gui.services.openmetrics_exporter import OpenMetricsExporter
 from gocker.threads import StoppableThread
 
 
@@ -30,15 +34,44 @@ def update_gui(stop_event, message_queue):
         message_queue.put('')
 
 
-def gui(docker_host_url, fsevent_address, fsevent_port):
-    sys.excepthook = handle_exception
-    threading.excepthook = handle_threading_exception
+def init_container(args):
     container = Container()
 
-    container.config.docker.host_url.from_value(docker_host_url)
-    container.config.fsevents.address.from_value(fsevent_address)
-    container.config.fsevents.port.from_value(fsevent_port)
+    container.config.docker.host_url.from_value(args.docker_host)
+    container.config.fsevents.address.from_value(args.fsevents_address)
+    container.config.fsevents.port.from_value(args.fsevents_port)
+    container.config.metrics.max_connections.from_value(args.metrics_max_connections)
+    container.config.metrics.backend.from_value(args.metrics_backend)
+    container.config.metrics.cgroup_root.from_value(args.cgroup_root)
+    container.config.metrics.history_size.from_value(args.metrics_history)
+    container.config.metrics.slow_interval.from_value(args.metrics_slow_interval)
+    container.config.metrics.busy_threshold.from_value(args.metrics_busy_threshold)
+    container.config.metrics.port.from_value(args.metrics_port)
+    container.config.metrics.address.from_value(args.metrics_address)
+    container.config.inventory.reconcile_interval.from_value(args.reconcile_interval)
+    container.config.logs.tail.from_value(args.log_tail)
+    container.config.logs.all_tail.from_value(args.log_all_tail)
+    container.config.logs.since.from_value(args.log_since)
+    container.config.logs.buffer_size.from_value(args.log_buffer_size)
+    container.config.logs.overflow_policy.from_value(args.log_overflow)
+    container.config.logs.flood_threshold.from_value(args.log_flood_threshold)
+    container.config.logs.max_lines.from_value(args.log_max_lines)
+    container.config.logs.reorder_window.from_value(args.log_reorder_window)
+    container.config.logs.timestamps.from_value(args.log_timestamps)
+    container.config.logs.multiline_start.from_value(args.log_multiline_start)
+    container.config.logs.multiline_continuation.from_value(args.log_multiline_continuation)
+    container.config.logs.json_fields.from_value([field for field in args.log_json_fields.split(',') if field])
+    container.config.logs.archive_dir.from_value(args.log_archive_dir)
+    container.config.logs.archive_segment_size.from_value(args.log_archive_segment_size * 1024 * 1024)
+    container.config.logs.archive_retention.from_value(args.log_archive_retention * 1024 * 1024)
     container.wire(packages=[gocker])
+    return container
+
+
+def gui(args):
+    sys.excepthook = handle_exception
+    threading.excepthook = handle_threading_exception
+    container = init_container(args)
 
     gui_app = App()
 
@@ -53,3 +86,23 @@ def gui(docker_host_url, fsevent_address, fsevent_port):
     except KeyboardInterrupt:
         gui_updater_thread.stop()
         gui_app.stop()
+
+
+def headless(args):
+    sys.excepthook = handle_exception
+    threading.excepthook = handle_threading_exception
+    init_container(args)
+
+    metrics_exporter = OpenMetricsExporter()
+    metrics_exporter.start()
+    docker_container_collector = DockerContainerService()
+    docker_container_collector.start()
+    docker_events_thread = DockerEventsThread()
+    docker_events_thread.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        docker_events_thread.stop()
+        docker_container_collector.stop()
+        metrics_exporter.stop()
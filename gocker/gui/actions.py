@@ -3,6 +3,7 @@ class ContainerActions:
     SHELL: str = 'shell'
     KILL: str = 'kill'
     INSPECT: str = 'inspect'
+    METRICS: str = 'metrics'
     TAG: str = 'tag'
 
 
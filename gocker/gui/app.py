@@ -3,7 +3,7 @@ import logging
 import os
 import queue
 import shutil
-from typing import List
+from typing import Dict
 
 from datetime import datetime
 from threading import RLock
@@ -18,19 +18,23 @@ from gocker.gui.actions import ContainerActions, SubprocessActions
 from gocker.gui.bus import listener, set_listeners
 from gocker.gui.commands import SubprocessActionCommand, ContainerActionCommand
 from gocker.gui.components.container_inspect import PopupContainerInspect
-from gocker.gui.components.container_log_list import ContainerLogListView
+from gocker.gui.components.container_log_list import ContainerLogListView, format_log_title
+from gocker.gui.components.container_metrics import PopupContainerMetrics
 from gocker.gui.components.containers_list import ContainersListView
 from gocker.gui.components.event_list import EventListView
 from gocker.gui.components.services_tree import ServicesTreeView
 from gocker.gui.components.shortcuts_help import PopupShortcutsHelp
 from gocker.gui.components.stack import Stack
 from gocker.gui.dependency_injection import Container
-from gocker.gui.events import LogReceivedEvent, ContainerLifecycleEvent, \
-    ContainerMetricsEvent, SubprocessMetricsEvent, SystemEvent
+from gocker.gui.events import LogReceivedEvent, LogBatchReceivedEvent, LogCountersEvent, ContainerLifecycleEvent, \
+    ContainerMetricsEvent, ContainerMetricsTickEvent, SubprocessMetricsEvent, SystemEvent
 from gocker.gui.helpers.tabular_items import TabularItems
 from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
 from gocker.gui.services.docker_container.docker_compose_service import DockerComposeService
 from gocker.gui.services.docker_container.docker_containers_service import DockerContainerService
+from gocker.gui.services.log_archive import LogArchiveThread
+from gocker.gui.services.log_multiplexer import LogMultiplexerThread
+from gocker.gui.services.openmetrics_exporter import OpenMetricsExporter
 from gocker.gui.services.docker_container.docker_events import DockerEventsThread
 from gocker.gui.services.docker_container.docker_logs_collector_service import DockerLogsCollectorService
 from gocker.gui.services.fs_event.fs_events import FsEventsLogThread
@@ -66,6 +70,12 @@ _palette = {
     ("container_memory_usage", 'brown', 'black'),
     ("container_memory_usage_selected", 'black', 'brown'),
 
+    ("sparkline", 'dark cyan', 'black'),
+    ("sparkline_selected", 'black', 'brown'),
+
+    ("log_stderr", 'light red', 'black'),
+    ("log_stderr_selected", 'black', 'brown'),
+
     ("scroll_line", 'brown', 'black'),
     ("scroll_line_selected", 'black', 'brown'),
 }
@@ -108,7 +118,7 @@ class App:
 
         set_listeners(self, self.bus)
 
-        self.containers_list: List[DockerContainerMetric] = None
+        self.containers_list: Dict[str, DockerContainerMetric] = {}
         self.selected_container = None
 
         self.subprocesses_treeview = ServicesTreeView()
@@ -117,10 +127,18 @@ class App:
 
         self.containers_list_view = ContainersListView()
         urwid.connect_signal(self.containers_list_view, 'container_changed', self.__container_changed)
+        urwid.connect_signal(
+            self.containers_list_view,
+            'visible_containers_changed',
+            self.__visible_containers_changed
+        )
 
         self.docker_insect_popup = PopupContainerInspect()
         urwid.connect_signal(self.docker_insect_popup, 'validated', self.__show_main_screen)
 
+        self.container_metrics_popup = PopupContainerMetrics()
+        urwid.connect_signal(self.container_metrics_popup, 'validated', self.__show_main_screen)
+
         self.shortcuts_help_popup = PopupShortcutsHelp()
         urwid.connect_signal(self.shortcuts_help_popup, 'validated', self.__show_main_screen)
 
@@ -172,6 +190,9 @@ class App:
         self.message_queue = message_queue
         self.check_messages(self.loop, None)
 
+        self.metrics_exporter: OpenMetricsExporter = OpenMetricsExporter()
+        self.metrics_exporter.start()
+
         self.docker_container_collector: DockerContainerService = DockerContainerService()
         self.docker_container_collector.start()
 
@@ -184,8 +205,15 @@ class App:
         self.docker_subprocesses_thread: DockerSubprocessesThread = DockerSubprocessesThread()
         self.docker_subprocesses_thread.start()
 
-        self.docker_logs: DockerLogsCollectorService = DockerLogsCollectorService()
-        self.subprocess_logs: SubprocessLogsCollectorService = SubprocessLogsCollectorService()
+        self.log_archive: LogArchiveThread = LogArchiveThread()
+        self.log_archive.start()
+
+        self.container_log_listview.filter_thread.start()
+
+        self.log_multiplexer: LogMultiplexerThread = LogMultiplexerThread()
+        self.log_multiplexer.start()
+        self.docker_logs: DockerLogsCollectorService = DockerLogsCollectorService(self.log_multiplexer)
+        self.subprocess_logs: SubprocessLogsCollectorService = SubprocessLogsCollectorService(self.log_multiplexer)
         self.docker_compose_collector: DockerComposeService = DockerComposeService()
 
     def stop(self):
@@ -193,8 +221,12 @@ class App:
             self.loop.stop()
         self.docker_events_thread.stop()
         self.docker_container_collector.stop()
+        self.metrics_exporter.stop()
         self.subprocess_logs.stop()
         self.docker_logs.stop()
+        self.log_multiplexer.stop()
+        self.log_archive.stop()
+        self.container_log_listview.filter_thread.stop()
         self.docker_events_thread.stop()
 
     def check_messages(self, loop, *_args):
@@ -208,7 +240,7 @@ class App:
         if not self.loop_screen_is_started():
             return
         self.containers_list_view.set_containers_list(
-            self.containers_list,
+            list(self.containers_list.values()),
             self.docker_logs.get_logged(),
             self.tagged_container_name,
         )
@@ -230,14 +262,25 @@ class App:
     def __container_changed(self, container_name):
         self.selected_container = container_name
 
+    def __visible_containers_changed(self, container_ids):
+        self.docker_container_collector.set_visible_containers(container_ids)
+
     @listener
     def container_lifecycle_event_listener(self, event: ContainerLifecycleEvent):
         pass
 
     @listener
     def container_metrics_event_listener(self, event: ContainerMetricsEvent):
-        self.containers_list = event.metric_list
-        self.__draw_containers_list()
+        for container_id in event.removed:
+            self.containers_list.pop(container_id, None)
+        for container in event.added + event.changed:
+            self.containers_list[container.container_id] = container
+        self.containers_list_view.apply_containers_delta(event.added, event.changed, event.removed)
+
+    # pylint: disable=unused-argument
+    @listener
+    def container_metrics_tick_listener(self, event: ContainerMetricsTickEvent):
+        self.containers_list_view.refresh_visible_rows()
 
     @listener
     def subprocess_metrics_event_listener(self, event: SubprocessMetricsEvent):
@@ -282,6 +325,12 @@ class App:
                 return
             self.__show_main_screen()
 
+        if command.action == ContainerActions.METRICS:
+            if self.loop.widget == self.frame:
+                self.__display_container_metrics(command.container_name)
+                return
+            self.__show_main_screen()
+
         if command.action == ContainerActions.TAG:
             if self.tagged_container_name is None:
                 self.tagged_container_name = command.container_name
@@ -321,6 +370,21 @@ class App:
         with self.draw_lock:
             self.container_log_listview.add_line(event.context, event.line)
 
+    @listener
+    def log_counters_event_listener(self, event: LogCountersEvent):
+        with self.draw_lock:
+            self.container_log_listview_frame.original_widget.set_title(
+                format_log_title(event.accepted, event.dropped, event.sampling, event.lines_rate, event.bytes_rate)
+            )
+            self.containers_list_view.set_log_rates(event.lines_rate, event.sampling)
+
+    @listener
+    def log_batch_received_event_listener(self, event: LogBatchReceivedEvent):
+        with self.draw_lock:
+            self.container_log_listview.add_lines([
+                (log.context, log.line, log.stream, log.timestamp, log.continuation, log.fields) for log in event.logs
+            ])
+
     def __shell_command(self, command, wait=True):
         logging.debug('Starting "%s"' % command)
         self.loop.screen.stop()
@@ -360,6 +424,20 @@ class App:
             ).split('\n')
         )
 
+    def __display_container_metrics(self, container_name):
+        container_metrics = [
+            container for container in self.containers_list.values() if container.container_name == container_name
+        ]
+        if len(container_metrics) == 0:
+            return
+        self.loop.widget = urwid.Overlay(
+            self.container_metrics_popup,
+            self.frame,
+            align='center', width=('relative', 97),
+            valign='middle', height=('relative', 50)
+        )
+        self.container_metrics_popup.display(container_metrics[0])
+
     # pylint: disable=too-many-return-statements
     # pylint: disable=too-many-branches
     def unhandled_input(self, key):
@@ -375,8 +453,9 @@ class App:
             return
 
         if key == shortcuts.get('SHOW_ALL_LOG').key:
-            for container_name in [container['Names'][0][1:] for container in self.docker_client.containers(False)]:
-                self.docker_logs.add_log(container_name)
+            self.docker_logs.add_all_logs(
+                [container['Names'][0][1:] for container in self.docker_client.containers(False)]
+            )
             self.__draw_containers_list()
             return
 
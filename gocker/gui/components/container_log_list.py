@@ -1,15 +1,41 @@
-import re
+import bisect
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Dict, List, Optional, Tuple
 
 import urwid
+from dependency_injector.wiring import Provide
 
+from gocker.data_structure.log_store import LogStore
+from gocker.gui.dependency_injection import Container
+from gocker.gui.helpers.byte_size import format_count_rate, format_rate
 from gocker.gui.helpers.colored_name import register_by_name
 from gocker.gui.helpers.urwidhelper import translate_text_for_urwid
+from gocker.gui.services.log_filter import LogFilter, LogFilterThread, parse_log_filter
+from gocker.gui.shortcut import shortcuts
+
+LOG_WIDGET_CACHE_SIZE = 256
+
+
+def format_log_timestamp(timestamp: Optional[float]):
+    if timestamp is None:
+        return '-'
+    return '%s.%03d' % (time.strftime('%H:%M:%S', time.localtime(timestamp)), int(timestamp * 1000) % 1000)
 
 
 class ContainerLogListViewItem(urwid.WidgetWrap):
-    def __init__(self, container_name, line):
+    """
+    One log entry, a line and the lines folded in it (stack trace...),
+    the folded lines are only displayed when the entry is expanded.
+    """
+
+    # pylint: disable=too-many-arguments
+    def __init__(self, container_name, lines, stream='stdout', timestamp=None, show_timestamp=False, expanded=False):
         self.container_name = container_name
-        self.line = line
+        self.lines = lines
+        self.stream = stream
+        self.timestamp = timestamp
         color = register_by_name(container_name) if container_name[0:2] != '--' else 'FF0000'
         cols = [
             ('fixed', 20, urwid.AttrWrap(
@@ -17,14 +43,26 @@ class ContainerLogListViewItem(urwid.WidgetWrap):
                 urwid.AttrSpec('#%s' % color, '#000000', 256),
                 urwid.AttrSpec('#000000', '#c4a000', 256)
             )),
-            ('weight', 10, urwid.AttrWrap(
-                urwid.Text(translate_text_for_urwid(line)),
+        ] + ([
+            ('fixed', 12, urwid.AttrWrap(
+                urwid.Text(format_log_timestamp(timestamp), wrap='clip'),
                 'container_name',
                 'container_name_selected'
             )),
+        ] if show_timestamp else []) + [
+            ('weight', 10, urwid.AttrWrap(
+                urwid.Text(self.__get_markup(expanded)),
+                'log_stderr' if stream == 'stderr' else 'container_name',
+                'log_stderr_selected' if stream == 'stderr' else 'container_name_selected'
+            )),
         ]
         urwid.WidgetWrap.__init__(self, urwid.Columns(cols, focus_column=0, dividechars=2))
 
+    def __get_markup(self, expanded):
+        if expanded or len(self.lines) == 1:
+            return translate_text_for_urwid('\n'.join(self.lines))
+        return [translate_text_for_urwid(self.lines[0]), ' [+%d lines]' % (len(self.lines) - 1)]
+
     def selectable(self):
         return True
 
@@ -33,16 +71,163 @@ class ContainerLogListViewItem(urwid.WidgetWrap):
         return key
 
 
-class ContainerLogListView(urwid.WidgetWrap):
+class LogListWalker(urwid.ListWalker):
+    """
+    Walks the entries of a LogStore (or only the positions in `filtered`), positions are store positions.
+    Widgets are only built for the rows urwid asks for, the last LOG_WIDGET_CACHE_SIZE are kept.
+    """
+
+    def __init__(self, store: LogStore, show_timestamps: bool):
+        self.store = store
+        self.show_timestamps = show_timestamps
+        self.filtered: Optional[List[int]] = None
+        self.expanded = set()
+        self.widgets: OrderedDict = OrderedDict()
+        self.focus = None
+
+    def get_focus(self):
+        position = self.__get_valid_position(self.focus)
+        if position is None:
+            return None, None
+        return self.__get_widget(position), position
+
+    def set_focus(self, position):
+        self.focus = position
+        self._modified()
+
+    def get_next(self, position):
+        if self.filtered is None:
+            next_position = max(position + 1, self.store.start)
+            return self.__get_row(next_position if next_position < self.store.end else None)
+        index = bisect.bisect_right(self.filtered, position)
+        return self.__get_row(self.filtered[index] if index < len(self.filtered) else None)
+
+    def get_prev(self, position):
+        if self.filtered is None:
+            return self.__get_row(position - 1 if position - 1 >= self.store.start else None)
+        index = bisect.bisect_left(self.filtered, position)
+        return self.__get_row(self.filtered[index - 1] if index > 0 else None)
+
+    def get_last_position(self):
+        if self.filtered is None:
+            return self.store.end - 1 if len(self.store) > 0 else None
+        return self.filtered[-1] if self.filtered else None
+
+    def invalidate(self, position: int):
+        self.widgets.pop(position, None)
+
+    def toggle_expanded(self, position: int):
+        self.expanded ^= {position}
+        self.invalidate(position)
+        self._modified()
+
+    def trim(self):
+        if self.filtered is not None:
+            del self.filtered[:bisect.bisect_left(self.filtered, self.store.start)]
+        self.expanded = {position for position in self.expanded if position in self.store}
 
-    def __init__(self):
-        self.walker = urwid.SimpleFocusListWalker([])
+    def __get_row(self, position):
+        if position is None:
+            return None, None
+        return self.__get_widget(position), position
+
+    def __get_valid_position(self, position):
+        if position is None:
+            return self.get_last_position()
+        if self.filtered is None:
+            if len(self.store) == 0:
+                return None
+            return min(max(position, self.store.start), self.store.end - 1)
+        if not self.filtered:
+            return None
+        index = min(bisect.bisect_left(self.filtered, position), len(self.filtered) - 1)
+        return self.filtered[index]
+
+    def __get_widget(self, position: int):
+        if position in self.widgets:
+            self.widgets.move_to_end(position)
+            return self.widgets[position]
+        entry = self.store.get(position)
+        widget = ContainerLogListViewItem(
+            entry.context,
+            entry.lines,
+            entry.stream,
+            entry.timestamp,
+            self.show_timestamps,
+            position in self.expanded,
+        )
+        self.widgets[position] = widget
+        if len(self.widgets) > LOG_WIDGET_CACHE_SIZE:
+            self.widgets.popitem(last=False)
+        return widget
+
+
+LOG_TITLE_MAX_SOURCES = 3
+
+
+def format_filter_status(matches: int, progress: float):
+    if progress < 1.0:
+        return 'scanning %d%%, %d matches' % (progress * 100, matches)
+    return '%d matches' % matches
+
+
+def format_log_title(
+        accepted: Dict[str, int],
+        dropped: Dict[str, int],
+        sampling: Dict[str, int],
+        lines_rate: Dict[str, float],
+        bytes_rate: Dict[str, float],
+):
+    total_dropped = sum(dropped.values())
+    title = 'Logs - %d lines, %s %s' % (
+        sum(accepted.values()),
+        format_count_rate(sum(lines_rate.values())),
+        format_rate(sum(bytes_rate.values())),
+    )
+    if total_dropped == 0:
+        return title
+    sources = sorted(
+        [context for context, count in dropped.items() if count > 0],
+        key=lambda context: dropped[context],
+        reverse=True
+    )
+    return '%s, %d dropped (%s%s)' % (
+        title,
+        total_dropped,
+        ', '.join(
+            '%s: %d of %d%s' % (
+                context,
+                dropped[context],
+                accepted[context],
+                ' sampling 1/%d' % sampling[context] if sampling.get(context, 1) > 1 else '',
+            ) for context in sources[:LOG_TITLE_MAX_SOURCES]
+        ),
+        ', ...' if len(sources) > LOG_TITLE_MAX_SOURCES else '',
+    )
+
+
+class ContainerLogListView(urwid.WidgetWrap):
+    # pylint: disable=too-many-instance-attributes
+    def __init__(
+            self,
+            max_lines: int = Provide[Container.config.logs.max_lines],
+            show_timestamps: bool = Provide[Container.config.logs.timestamps],
+            draw_lock: RLock = Provide[Container.draw_lock],
+            json_fields: List[str] = Provide[Container.config.logs.json_fields],
+    ):
+        self.max_lines = max_lines
+        self.draw_lock = draw_lock
+        self.json_fields = json_fields
+        self.store = LogStore(max_lines)
+        self.walker = LogListWalker(self.store, show_timestamps)
         self.search_edit = urwid.Edit('Filter: ', align="left", multiline=False)
+        self.filter_status = urwid.Text('', align='right')
         self.filter = None
-        self.lines = []
+        self.filter_thread = LogFilterThread(self.store, self.__add_matches)
+        self.groups: Dict[Tuple[str, str], int] = {}
 
         self.frame = urwid.Frame(
-            header=self.search_edit,
+            header=urwid.Columns([self.search_edit, ('pack', self.filter_status)], dividechars=1),
             body=urwid.ListBox(self.walker),
             focus_part='body'
         )
@@ -60,38 +245,73 @@ class ContainerLogListView(urwid.WidgetWrap):
 
         if key == 'enter' and self.frame.get_focus_path()[0] == 'header':
             self.display_search = False
-            if self.search_edit.get_edit_text() == '':
-                self.filter = None
-            else:
-                self.filter = re.compile(self.search_edit.get_edit_text(), re.IGNORECASE)
-            self.__reload_list()
+            self.set_filter(parse_log_filter(self.search_edit.get_edit_text(), self.json_fields))
             self.frame.set_focus('body')
             return None
 
         if key == 'esc' and self.frame.get_focus_path()[0] == 'header':
             self.display_search = False
-            self.filter = None
+            self.set_filter(None)
             self.search_edit.set_edit_text('')
             self.frame.set_focus('body')
             return None
 
+        if key == shortcuts.get('TOGGLE_LOG_GROUP').key and self.frame.get_focus_path()[0] == 'body':
+            _, position = self.walker.get_focus()
+            if position is not None and len(self.store.get(position).lines) > 1:
+                self.walker.toggle_expanded(position)
+                return None
+
         return self.frame.keypress(size, key)
 
     def add_line(self, container_name, line):
-        if len(line) == 0:
+        self.add_lines([(container_name, line, 'stdout', None, False, None)])
+
+    def add_lines(self, lines):
+        positions = []
+        for container_name, line, stream, timestamp, continuation, fields in lines[-self.max_lines:]:
+            if len(line) == 0:
+                continue
+            group = self.groups.get((container_name, stream))
+            if continuation and group is not None and group in self.store:
+                self.store.fold(group, line)
+                self.walker.invalidate(group)
+                positions.append(group)
+                continue
+            position = self.store.append(container_name, line, stream, timestamp, fields)
+            self.groups[(container_name, stream)] = position
+            positions.append(position)
+        if len(positions) == 0:
             return
-        container_log_list_view_item = ContainerLogListViewItem(container_name, line)
-        self.lines.append(container_log_list_view_item)
-        if self.filter is not None and self.filter.search(container_name + ' ' + line):
-            self.walker.extend([container_log_list_view_item])
-        if self.filter is None:
-            self.walker.extend([container_log_list_view_item])
-        self.walker.set_focus(len(self.walker) - 1)
-
-    def __reload_list(self):
-        while len(self.walker) > 0:
-            self.walker.pop()
-        if self.filter is None:
-            self.walker.extend(self.lines)
+        if self.filter is not None:
+            self.filter_thread.add_positions(positions)
+        self.walker.trim()
+        self.walker.set_focus(self.walker.get_last_position())
+
+    def set_filter(self, log_filter: Optional[LogFilter]):
+        """
+        Displays the entries matching `log_filter` (all of them with None), the matches are found by the
+        LogFilterThread and added as the scan progresses.
+        """
+        with self.draw_lock:
+            self.filter = log_filter
+            self.walker.filtered = None if log_filter is None else []
+            self.filter_status.set_text('')
+            self.filter_thread.apply(log_filter)
+            if log_filter is not None and not self.filter_thread.is_scanning():
+                self.filter_status.set_text(format_filter_status(0, 1.0))
+            self.walker.set_focus(self.walker.get_last_position())
+
+    def __add_matches(self, positions: List[int], progress: float):
+        filtered = self.walker.filtered
+        if filtered is None:
             return
-        self.walker.extend([line for line in self.lines if self.filter.search(line.container_name + ' ' + line.line)])
+        for position in positions:
+            index = bisect.bisect_left(filtered, position)
+            if index < len(filtered) and filtered[index] == position:
+                continue
+            filtered.insert(index, position)
+        self.walker.trim()
+        self.filter_status.set_text(format_filter_status(len(filtered), progress))
+        if positions:
+            self.walker.set_focus(self.walker.get_last_position())
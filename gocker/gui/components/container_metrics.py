@@ -0,0 +1,76 @@
+import math
+
+import urwid
+
+from gocker.data_structure.ring_buffer import RingBuffer
+from gocker.gui.helpers.scrollview import ScrollView
+from gocker.gui.helpers.sparkline import sparkline
+from gocker.gui.helpers.tabular_items import TabularItems
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.shortcut import shortcuts
+
+HISTORY_WIDTH = 120
+
+
+def format_history(title, history: RingBuffer, value_format, minimum=None):
+    values = history.values() if history is not None else []
+    known_values = [value for value in values if not math.isnan(value)]
+    if not known_values:
+        return [title, '  -', '']
+    return [
+        '%s  min %s  avg %s  max %s  (last %d seconds)' % (
+            title,
+            value_format(min(known_values)),
+            value_format(sum(known_values) / len(known_values)),
+            value_format(max(known_values)),
+            len(values),
+        ),
+        '  ' + sparkline(values, HISTORY_WIDTH, minimum),
+        '',
+    ]
+
+
+class PopupContainerMetrics(urwid.WidgetWrap):
+    signals = ['validated']
+
+    def __init__(self):  # pylint: disable=super-init-not-called
+        self.display_scroll_view = ScrollView()
+        self.frame = urwid.AttrMap(urwid.Frame(
+            body=urwid.LineBox(self.display_scroll_view, title='Metrics history'),
+            footer=urwid.GridFlow([urwid.Button('Ok', self.validated)], 8, 1, 1, 'center'),
+            focus_part='footer'
+        ), 'bg')
+        self.tabular_items = TabularItems(self.frame.original_widget, [
+            ['body'],
+            ['footer', 0],
+        ])
+        self.__super.__init__(self.frame)
+
+    def validated(self, _):
+        urwid.emit_signal(self, 'validated', 'ok')
+
+    def display(self, container_metrics: DockerContainerMetric):
+        self.display_scroll_view.set_lines(
+            [container_metrics.container_name, ''] +
+            format_history('CPU', container_metrics.cpu_history, '{:.2f} %'.format, 0.0) +
+            format_history(
+                'Memory',
+                container_metrics.memory_history,
+                lambda value: '{:,d}'.format(int(value)).replace(',', ' ')
+            )
+        )
+
+    def unhandled_input(self, key):
+        if key == 'esc':
+            urwid.emit_signal(self, 'validated', 'ok')
+            return True
+
+        if key == shortcuts.get('SELECT_NEXT_PANE').key:
+            self.tabular_items.handle_next()
+            return True
+
+        if key == shortcuts.get('SELECT_PREVIOUS_PANE').key:
+            self.tabular_items.handle_previous()
+            return True
+
+        return True
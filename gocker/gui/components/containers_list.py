@@ -1,6 +1,6 @@
 import logging
 import re
-from typing import List
+from typing import Dict, List, Set
 
 import urwid
 from dependency_injector.wiring import Provide
@@ -10,10 +10,52 @@ from gocker.data_structure.circular_list import CircularList
 from gocker.gui.actions import ContainerActions
 from gocker.gui.commands import ContainerActionCommand
 from gocker.gui.dependency_injection import Container
+from gocker.gui.helpers.byte_size import format_count_rate, format_rate
 from gocker.gui.helpers.colored_name import register_by_name
+from gocker.gui.helpers.sparkline import sparkline
 from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
 from gocker.gui.shortcut import shortcuts
 
+SPARKLINE_WIDTH = 10
+RATE_WIDTH = 10
+LOG_RATE_WIDTH = 14
+RATE_COLUMNS = [
+    ('network_rx_rate', 'Net rx'),
+    ('network_tx_rate', 'Net tx'),
+    ('block_read_rate', 'Disk r'),
+    ('block_write_rate', 'Disk w'),
+]
+
+
+def format_log_rate(lines_rate: float, sampling: int):
+    if sampling > 1:
+        return '%s 1/%d' % (format_count_rate(lines_rate), sampling)
+    return format_count_rate(lines_rate)
+
+
+class VisibleRowsListBox(urwid.ListBox):  # pylint: disable=too-many-ancestors
+    signals = ['visible_changed']
+
+    def __init__(self, body):
+        super().__init__(body)
+        self.visible_widgets = []
+
+    # pylint: disable=unpacking-non-sequence
+    def render(self, size, focus=False):
+        canvas = super().render(size, focus)
+        middle, top, bottom = self.calculate_visible(size, focus)
+        visible_widgets = []
+        if middle is not None:
+            _, top_widgets = top
+            _, bottom_widgets = bottom
+            visible_widgets = [widget for widget, _, _ in reversed(top_widgets)] + \
+                              [middle[1]] + \
+                              [widget for widget, _, _ in bottom_widgets]
+        if visible_widgets != self.visible_widgets:
+            self.visible_widgets = visible_widgets
+            urwid.emit_signal(self, 'visible_changed', visible_widgets)
+        return canvas
+
 
 class ContainersListViewHeader(urwid.WidgetWrap):
     def __init__(
@@ -30,8 +72,17 @@ class ContainersListViewHeader(urwid.WidgetWrap):
             ('fixed', 3, urwid.Text('L')),
             ('fixed', 8, urwid.Text(cpu_header, align=urwid.RIGHT)),
             ('fixed', 3, urwid.Text(' ')),
+            ('fixed', SPARKLINE_WIDTH, urwid.Text('History')),
             ('fixed', 20, urwid.Text(memory_header, align=urwid.RIGHT)),
             ('fixed', 3, urwid.Text(' ')),
+            ('fixed', SPARKLINE_WIDTH, urwid.Text('History')),
+        ] + [
+            ('fixed', RATE_WIDTH, urwid.Text(
+                '%s %s' % (sort_order_text, title) if sort_column == column_name else title,
+                align=urwid.RIGHT
+            )) for column_name, title in RATE_COLUMNS
+        ] + [
+            ('fixed', LOG_RATE_WIDTH, urwid.Text('Logs', align=urwid.RIGHT)),
             ('fixed', 25, urwid.Text('Status')),
             ('weight', 60, urwid.Text('Ports'))
         ]
@@ -44,10 +95,12 @@ class ContainersListViewItem(urwid.WidgetWrap):
             container_metrics: DockerContainerMetric,
             is_logged: bool,
             is_tagged: bool,
+            log_rate: str,
             bus: EventBus = Provide[Container.bus],
     ):
         self.bus = bus
         self.container_metrics = container_metrics
+        self.container_name = container_metrics.container_name
         cols = [
             ('fixed', 40, urwid.AttrWrap(
                 urwid.Text(container_metrics.container_name),
@@ -72,6 +125,7 @@ class ContainersListViewItem(urwid.WidgetWrap):
             )),
             ('fixed', 3,
              self.get_trend(container_metrics.cpu_percentage, container_metrics.cpu_percentage_previous)),
+            ('fixed', SPARKLINE_WIDTH, self.get_sparkline(container_metrics.cpu_history, 0.0)),
             ('fixed', 20, urwid.AttrWrap(
                 urwid.Text('{:>20,d}'
                            .format(container_metrics.memory_usage)
@@ -80,6 +134,19 @@ class ContainersListViewItem(urwid.WidgetWrap):
                 'container_memory_usage_selected'
             )),
             ('fixed', 3, self.get_trend(container_metrics.memory_usage, container_metrics.memory_usage_previous)),
+            ('fixed', SPARKLINE_WIDTH, self.get_sparkline(container_metrics.memory_history)),
+        ] + [
+            ('fixed', RATE_WIDTH, urwid.AttrWrap(
+                urwid.Text(format_rate(getattr(container_metrics, column_name)), align=urwid.RIGHT),
+                'container_memory_usage',
+                'container_memory_usage_selected'
+            )) for column_name, _ in RATE_COLUMNS
+        ] + [
+            ('fixed', LOG_RATE_WIDTH, urwid.AttrWrap(
+                urwid.Text(log_rate, align=urwid.RIGHT),
+                'container_memory_usage',
+                'container_memory_usage_selected'
+            )),
             ('fixed', 25, urwid.AttrWrap(
                 urwid.Text(container_metrics.status, wrap='clip'),
                 'container_memory_usage',
@@ -167,9 +234,20 @@ class ContainersListViewItem(urwid.WidgetWrap):
             'trend_down_selected'
         )
 
+    @staticmethod
+    def get_sparkline(history, minimum=None):
+        return urwid.AttrWrap(
+            urwid.Text(
+                sparkline(history.last(SPARKLINE_WIDTH), SPARKLINE_WIDTH, minimum) if history is not None else '-'
+            ),
+            'sparkline',
+            'sparkline_selected'
+        )
+
     def selectable(self):
         return self.container_metrics is not None
 
+    # pylint: disable=too-many-return-statements
     def keypress(self, _, key):
         container_name = self.container_metrics.container_name
 
@@ -201,6 +279,13 @@ class ContainersListViewItem(urwid.WidgetWrap):
             ))
             return None
 
+        if key == shortcuts.get('CONTAINER_METRICS').key:
+            self.bus.emit(ContainerActionCommand.__name__, ContainerActionCommand(
+                ContainerActions.METRICS,
+                container_name
+            ))
+            return None
+
         if key == shortcuts.get('TAG_CONTAINER').key:
             self.bus.emit(ContainerActionCommand.__name__, ContainerActionCommand(
                 ContainerActions.TAG,
@@ -214,17 +299,28 @@ class ContainersListViewItem(urwid.WidgetWrap):
 class ContainersListView(urwid.WidgetWrap):
     # pylint: disable=too-many-instance-attributes
     def __init__(self):
-        urwid.register_signal(self.__class__, ['container_changed'])
+        urwid.register_signal(self.__class__, ['container_changed', 'visible_containers_changed'])
         self.walker_header = urwid.SimpleFocusListWalker([])
         self.walker = urwid.SimpleFocusListWalker([])
         self.focus_index = None
         self.search_edit = urwid.Edit('Filter: ', align="left", multiline=False)
         self.filter = None
-        self.containers = []
+        self.containers: Dict[str, DockerContainerMetric] = {}
+        self.items: Dict[str, ContainersListViewItem] = {}
+        self.positions: Dict[str, int] = {}
+        self.visible_container_ids: Set[str] = set()
         self.logged_containers = []
         self.tagged_container_name = None
-        self.sort_columns = CircularList('container_name', 'cpu_percentage', 'memory_usage')
+        self.log_rates: Dict[str, str] = {}
+        self.sort_columns = CircularList(
+            'container_name',
+            'cpu_percentage',
+            'memory_usage',
+            *[column_name for column_name, _ in RATE_COLUMNS]
+        )
         self.sort_order_desc = False
+        self.listbox = VisibleRowsListBox(self.walker)
+        urwid.connect_signal(self.listbox, 'visible_changed', self.__visible_changed)
 
         self.frame = urwid.Frame(
             header=self.search_edit,
@@ -233,7 +329,7 @@ class ContainersListView(urwid.WidgetWrap):
                     urwid.ListBox(self.walker_header),
                     height=1
                 ),
-                body=urwid.ListBox(self.walker),
+                body=self.listbox,
                 focus_part='body'
             ),
             focus_part='body'
@@ -244,6 +340,14 @@ class ContainersListView(urwid.WidgetWrap):
             urwid.AttrMap(self.frame, 'bg')
         )
         self.display_search = False
+        self.reload_list()
+
+    def __visible_changed(self, visible_widgets):
+        visible_container_ids = {widget.container_metrics.container_id for widget in visible_widgets}
+        if visible_container_ids == self.visible_container_ids:
+            return
+        self.visible_container_ids = visible_container_ids
+        urwid.emit_signal(self, 'visible_containers_changed', visible_container_ids)
 
     def modified(self):
         focus_w, _ = self.walker.get_focus()
@@ -296,24 +400,81 @@ class ContainersListView(urwid.WidgetWrap):
     ):
         self.logged_containers = logged_containers
         self.tagged_container_name = tagged_container_name
+        self.containers = {container.container_id: container for container in containers}
+        self.__keep_focus(self.reload_list)
+
+    def apply_containers_delta(
+            self,
+            added: List[DockerContainerMetric],
+            changed: List[DockerContainerMetric],
+            removed: List[str],
+    ):
+        is_in_place = (
+            len(added) == 0 and len(removed) == 0 and self.sort_columns.current() == 'container_name' and
+            all(self.__is_in_place(container) for container in changed)
+        )
+        for container_id in removed:
+            self.containers.pop(container_id, None)
+            self.items.pop(container_id, None)
+        for container in added + changed:
+            self.containers[container.container_id] = container
+            self.items.pop(container.container_id, None)
+
+        if is_in_place:
+            self.__keep_focus(lambda: self.__replace_items(changed))
+            return
+        self.__keep_focus(self.__refresh_walker)
+
+    def __is_in_place(self, container: DockerContainerMetric):
+        if container.container_id not in self.positions:
+            return self.filter is not None and not self.filter.search(container.container_name)
+        item = self.items.get(container.container_id)
+        return item is not None and item.container_name == container.container_name
+
+    def refresh_visible_rows(self):
+        """
+        Rebuilds the visible rows on every metrics tick: their sparklines scroll and their trends
+        move even when the container version, hence the delta, did not change.
+        """
+        visible = [
+            self.containers[container_id] for container_id in self.visible_container_ids
+            if container_id in self.containers
+        ]
+        if len(visible) == 0:
+            return
+        for container in visible:
+            self.items.pop(container.container_id, None)
+        self.__keep_focus(lambda: self.__replace_items(visible))
+
+    def set_log_rates(self, lines_rate: Dict[str, float], sampling: Dict[str, int]):
+        log_rates = {
+            context: format_log_rate(rate, sampling.get(context, 1)) for context, rate in lines_rate.items()
+        }
+        changed = [
+            container for container in self.containers.values()
+            if log_rates.get(container.container_name) != self.log_rates.get(container.container_name)
+        ]
+        self.log_rates = log_rates
+        if len(changed) == 0:
+            return
+        for container in changed:
+            self.items.pop(container.container_id, None)
+        self.__keep_focus(lambda: self.__replace_items(changed))
+
+    def __keep_focus(self, update: callable):
         urwid.disconnect_signal(self.walker, 'modified', self.modified)
         focus, _ = self.walker.get_focus()
-        previous_focused_item_name = None if (
+        previous_focused_item_id = None if (
                 focus is None or focus.container_metrics is None
-        ) else focus.container_metrics.container_name
-        self.containers = containers
+        ) else focus.container_metrics.container_id
 
-        self.reload_list()
+        update()
 
         urwid.connect_signal(self.walker, 'modified', self.modified)
 
-        if previous_focused_item_name is not None:
-            index = -1
-            for container in self.get_filtered_containers():
-                index = index + 1
-                if container.container_name == previous_focused_item_name:
-                    self.walker.set_focus(index)
-                    return
+        if previous_focused_item_id in self.positions:
+            self.walker.set_focus(self.positions[previous_focused_item_id])
+            return
         try:
             self.walker.set_focus(0 if len(self.containers) == 0 else 1)
         except IndexError:
@@ -321,7 +482,7 @@ class ContainersListView(urwid.WidgetWrap):
 
     def get_filtered_containers(self):
         containers = sorted(
-            self.containers,
+            self.containers.values(),
             key=lambda containerStat: containerStat.get_column(self.sort_columns.current()),
             reverse=self.sort_order_desc
         )
@@ -337,12 +498,25 @@ class ContainersListView(urwid.WidgetWrap):
             self.walker_header.pop()
         self.walker_header.extend([ContainersListViewHeader(sort_column, self.sort_order_desc)])
 
-        while len(self.walker) > 0:
-            self.walker.pop()
-        return self.walker.extend(
-            [ContainersListViewItem(
+        self.items = {}
+        self.__refresh_walker()
+
+    def __refresh_walker(self):
+        containers = self.get_filtered_containers()
+        self.positions = {container.container_id: index for index, container in enumerate(containers)}
+        self.walker[:] = [self.__get_item(container) for container in containers]
+
+    def __replace_items(self, containers: List[DockerContainerMetric]):
+        for container in containers:
+            if container.container_id in self.positions:
+                self.walker[self.positions[container.container_id]] = self.__get_item(container)
+
+    def __get_item(self, container: DockerContainerMetric):
+        if container.container_id not in self.items:
+            self.items[container.container_id] = ContainersListViewItem(
                 container,
                 container.container_name in self.logged_containers,
-                container.container_name == self.tagged_container_name
-            ) for container in self.get_filtered_containers()]
-        )
+                container.container_name == self.tagged_container_name,
+                self.log_rates.get(container.container_name, ''),
+            )
+        return self.items[container.container_id]
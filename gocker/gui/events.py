@@ -1,8 +1,9 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Any, Dict, List, Optional
 
 from gocker.gui.services.docker_container.dataclass import DockerComposeProject
 from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.log_buffer import LogLine
 
 
 @dataclass
@@ -23,6 +24,38 @@ class ContainerStoppedEvent:
 class LogReceivedEvent:
     context: str
     line: str
+    stream: str = 'stdout'
+    timestamp: Optional[float] = None
+    continuation: bool = False
+    fields: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class LogBatchReceivedEvent:
+    logs: List[LogReceivedEvent]
+
+
+@dataclass
+class LogLinesIngestedEvent:
+    context: str
+    lines: List[LogLine]
+
+
+@dataclass
+class LogCountersEvent:
+    accepted: Dict[str, int]
+    dropped: Dict[str, int]
+    sampling: Dict[str, int]
+    lines_rate: Dict[str, float]
+    bytes_rate: Dict[str, float]
+
+
+@dataclass
+class DockerContainerEvent:
+    action: str
+    container_id: str
+    attributes: dict
+    time: float = None
 
 
 @dataclass
@@ -40,7 +73,14 @@ class SystemEvent:
 
 @dataclass
 class ContainerMetricsEvent:
-    metric_list: List[DockerContainerMetric]
+    added: List[DockerContainerMetric]
+    changed: List[DockerContainerMetric]
+    removed: List[str]
+
+
+@dataclass
+class ContainerMetricsTickEvent:
+    metrics: List[DockerContainerMetric]
 
 
 @dataclass
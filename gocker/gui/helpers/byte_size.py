@@ -0,0 +1,21 @@
+BYTE_SIZE_UNITS = ['B', 'K', 'M', 'G', 'T']
+
+
+def format_rate(rate):
+    if rate is None:
+        return '-'
+    for unit in BYTE_SIZE_UNITS:
+        if rate < 1000 or unit == BYTE_SIZE_UNITS[-1]:
+            return ('%d%s/s' if unit == 'B' else '%.1f%s/s') % (rate, unit)
+        rate /= 1024
+    return '-'
+
+
+def format_count_rate(rate):
+    if rate is None:
+        return '-'
+    if rate < 1000:
+        return '%d/s' % rate
+    if rate < 1000000:
+        return '%.1fk/s' % (rate / 1000)
+    return '%.1fM/s' % (rate / 1000000)
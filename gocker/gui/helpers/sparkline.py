@@ -0,0 +1,32 @@
+import math
+from typing import List
+
+SPARKLINE_TICKS = '▁▂▃▄▅▆▇█'
+
+
+def downsample(values: List[float], width: int) -> List[float]:
+    if len(values) <= width:
+        return values
+    bucket_size = len(values) / width
+    result = []
+    for index in range(width):
+        bucket = [
+            value for value in values[int(index * bucket_size):int((index + 1) * bucket_size)]
+            if not math.isnan(value)
+        ]
+        result.append(max(bucket) if bucket else math.nan)
+    return result
+
+
+def sparkline(values: List[float], width: int, minimum: float = None) -> str:
+    values = downsample(values, width)
+    known_values = [value for value in values if not math.isnan(value)]
+    if not known_values:
+        return ' ' * width
+    maximum = max(known_values)
+    minimum = min(known_values) if minimum is None else min([minimum] + known_values)
+    scale = (len(SPARKLINE_TICKS) - 1) / (maximum - minimum) if maximum > minimum else 0
+    return ''.join(
+        ' ' if math.isnan(value) else SPARKLINE_TICKS[int((value - minimum) * scale)]
+        for value in values
+    ).rjust(width)
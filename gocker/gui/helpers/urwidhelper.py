@@ -15,32 +15,35 @@ Urwid Helper
 
     Methods:
         - translate_text_for_urwid: Converts an ANSII escaped string into an urwid equivalent.
-        - translate_color: Convert a 3/4 bit ANSII escape code into the equivalent urwid color
-        - get_ansii_group_matches_for_text: Get a iterator of (ansicodes: int[], text: str) found within the text.
+        - get_sgr_state: Applies the parameters of a SGR escape sequence to a (fg, bg, flags) state.
+        - get_attr_spec: Get the (interned) urwid AttrSpec of a (fg, bg, flags) state.
 
     Derived from:
         https://github.com/Nanoseb/ncTelegram/blob/master/ncTelegram/ui_msgwidget.py#L218
 """
 
 import re
-from typing import Tuple, List, Union, Iterator
+from typing import Dict, Tuple, List
 
 import urwid
 
-"""
+r"""
 Explained using: https://regex101.com/
 
-    [\x1b\033]          match one of "\x1b" or "\033"
-    \[                  match "[" (literal) 
-    (                   capture group 1
-        [\d;]+              integer or literal ';' literal (one or many)
-    )                   end capture group 1
-    m                   match "m" literal
-    (                   capture group 2
-        [^\x1b\033]+        match all characters but "\x1b" or "\033" (text between next group)
-    )                   end capture group 2
+    \x1b                match the escape character
+    (?:                 either
+        \[                  a CSI sequence: "[" (literal)
+        ([0-9;:<=>?]*)      capture group 1: parameters
+        [ -/]*              intermediate bytes
+        ([@-~])             capture group 2: final byte, "m" for a SGR (colors and styles) sequence
+    |                   or
+        \][^\x07\x1b]*      an OSC sequence (window title, hyperlink...)
+        (?:\x07|\x1b\\)?    ended by BEL or ST
+    |                   or
+        [ -/]*[0-~]?        any other escape (charset, save cursor...)
+    )
 """
-ANSI_ESCAPE_REGEX = r"[\x1b\033]\[([\d;]+)m([^\x1b\033]+)"
+ESCAPE_SEQUENCE_REGEX = re.compile(r"\x1b(?:\[([0-9;:<=>?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)?|[ -/]*[0-~]?)")
 
 fg_lookup = {
     30: "black",
@@ -81,86 +84,143 @@ bg_lookup = {
 }
 
 
-def translate_color(attr: Union[str, Tuple, List[int]]) -> Tuple[str, str]:
-    """
-    Translates a 3/4 bit ANSII escape code into the equivalent urwid color:
-    Source: https://en.wikipedia.org/wiki/ANSI_escape_code#3/4_bit
-
-    >>> translate_color([91])
-    ('light red', '')
+SgrState = Tuple[str, str, int]
 
-    >>> translate_color([91])
-    ('light red', '')
+SGR_FLAGS = ['bold', 'italics', 'underline', 'blink', 'standout', 'strikethrough']
+BOLD, ITALICS, UNDERLINE, BLINK, STANDOUT, STRIKETHROUGH = [1 << index for index in range(len(SGR_FLAGS))]
+sgr_flag_on = {1: BOLD, 3: ITALICS, 4: UNDERLINE, 5: BLINK, 6: BLINK, 7: STANDOUT, 9: STRIKETHROUGH}
+sgr_flag_off = {21: BOLD, 22: BOLD, 23: ITALICS, 24: UNDERLINE, 25: BLINK, 27: STANDOUT, 29: STRIKETHROUGH}
+color_16_lookup = [fg_lookup[code] for code in list(range(30, 38)) + list(range(90, 98))]
 
-    >>> translate_color([107])
-    ('', 'white')
+DEFAULT_SGR_STATE: SgrState = ('', '', 0)
+SGR_CACHE_SIZE = 4096
+_sgr_states: Dict[Tuple[SgrState, str], SgrState] = {}
+_attr_specs: Dict[SgrState, urwid.AttrSpec] = {}
 
-    >>> translate_color([91, 101])
-    ('light red', 'light red')
 
-    >>> translate_color("91;101")
-    ('light red', 'light red')
+def get_extended_color(parameters: List[str]) -> Tuple[str, int]:
+    """
+    Reads a 256 colors ("5;n") or true color ("2;r;g;b") color,
+    returns the urwid color ('' when invalid) and the number of parameters read.
 
-    >>> translate_color("")
-    ('', '')
+    >>> get_extended_color(["5", "196"])
+    ('h196', 2)
 
-    :param attr: string (should be semi-colon (;) delimited) | Tuple | List[int]
-    :return: Tuple[foreground: str, background: str]
+    >>> get_extended_color(["5", "9"])
+    ('light red', 2)
 
+    >>> get_extended_color(["2", "255", "128", "0"])
+    ('#ff8000', 4)
     """
-    if isinstance(attr, int):
-        list_attr = [attr]
-    elif isinstance(attr, (tuple, list)):
-        list_attr = attr
-    elif isinstance(attr, str):
-        list_attr = [int(i) for i in attr.split(";") if len(i) > 0]
-    else:
-        list_attr = [0]
-
-    fg = ''
-    bg = ''
-
-    for elem in list_attr:
-        if elem == 0:
-            # reset, special case
-            fg, bg = '', ''
-            continue
+    try:
+        if parameters[0] == "5":
+            index = int(parameters[1])
+            if index < 16:
+                return color_16_lookup[index], 2
+            return ("h%d" % index if index < 256 else ""), 2
+        if parameters[0] == "2" and len(parameters) >= 4:
+            return "#%02x%02x%02x" % tuple(min(int(part or 0), 255) for part in parameters[-3:]), 4
+    except (IndexError, ValueError):
+        pass
+    return "", len(parameters)
+
+
+def get_sgr_state(state: SgrState, parameters: str) -> SgrState:
+    """
+    Applies the parameters of a SGR escape sequence ("\\033[...m") to a (fg, bg, flags) state:
+    reset, styles, 8/16 colors, 256 colors and true colors, with ";" or ":" separated sub parameters.
+    The transitions are cached, a log line usually reuses a handful of them.
 
-        if elem in fg_lookup:
-            fg = fg_lookup[elem]
-        if elem in bg_lookup:
-            bg = bg_lookup[elem]
+    >>> get_sgr_state(DEFAULT_SGR_STATE, "1;31")
+    ('dark red', '', 1)
 
-    return fg, bg
+    >>> get_sgr_state(('dark red', '', 1), "22;48;5;21")
+    ('dark red', 'h21', 0)
 
+    >>> get_sgr_state(('dark red', '', 1), "38:2::0:255:0")
+    ('#00ff00', '', 1)
 
-def get_ansii_group_matches_for_text(text: str) -> Iterator[Tuple[List[int], str]]:
+    >>> get_sgr_state(('dark red', 'black', 1), "")
+    ('', '', 0)
     """
-    Get a iterator of (ansicodes: int[], text: str) found from the text.
-
-    >>> list(get_ansii_group_matches_for_text("\033[91mHello, world"))
-    [([91], 'Hello, world')]
+    key = (state, parameters)
+    next_state = _sgr_states.get(key)
+    if next_state is not None:
+        return next_state
+
+    fg, bg, flags = state
+    codes = parameters.split(";")
+    index = 0
+    while index < len(codes):
+        sub_parameters = codes[index].split(":")
+        index += 1
+        try:
+            code = int(sub_parameters[0] or 0)
+        except ValueError:
+            continue
+        if code == 0:
+            fg, bg, flags = DEFAULT_SGR_STATE
+        elif code in fg_lookup:
+            fg = fg_lookup[code]
+        elif code in bg_lookup:
+            bg = bg_lookup[code]
+        elif code in sgr_flag_on:
+            flags |= sgr_flag_on[code]
+        elif code in sgr_flag_off:
+            flags &= ~sgr_flag_off[code]
+        elif code == 39:
+            fg = ""
+        elif code == 49:
+            bg = ""
+        elif code in (38, 48):
+            if len(sub_parameters) > 1:
+                color, _ = get_extended_color(sub_parameters[1:])
+            else:
+                color, count = get_extended_color(codes[index:index + 4])
+                index += count
+            if code == 38:
+                fg = color
+            else:
+                bg = color
+
+    if len(_sgr_states) >= SGR_CACHE_SIZE:
+        _sgr_states.clear()
+    _sgr_states[key] = (fg, bg, flags)
+    return fg, bg, flags
+
+
+def get_attr_spec(state: SgrState) -> urwid.AttrSpec:
+    """
+    Get the urwid AttrSpec of a (fg, bg, flags) state, a single instance per state
+    until SGR_CACHE_SIZE states are cached (24-bit gradients) and the cache is cleared.
 
-    >>> list(get_ansii_group_matches_for_text("\033[91mHello, world\033[97mHello, world"))
-    [([91], 'Hello, world'), ([97], 'Hello, world')]
+    >>> get_attr_spec(('light red', '', BOLD | UNDERLINE))
+    AttrSpec('light red,bold,underline', 'default')
 
-    >>> list(get_ansii_group_matches_for_text("\033[91mHello, world\\nHi"))
-    [([91], 'Hello, world\\nHi')]
+    >>> get_attr_spec(('#ff8000', 'h21', 0)) is get_attr_spec(('#ff8000', 'h21', 0))
+    True
     """
-    for match in re.finditer(ANSI_ESCAPE_REGEX, text, re.DOTALL):
-        attr = match.group(1)
-        parsed_attr = [int(i) for i in attr.split(";")]
-        text = match.group(2)
-
-        yield parsed_attr, text
+    attr_spec = _attr_specs.get(state)
+    if attr_spec is None:
+        fg, bg, flags = state
+        attr_spec = urwid.AttrSpec(
+            ",".join([fg or "default"] + [name for bit, name in enumerate(SGR_FLAGS) if flags & (1 << bit)]),
+            bg or "default",
+            2 ** 24 if fg.startswith("#") or bg.startswith("#") else 256,
+        )
+        if len(_attr_specs) >= SGR_CACHE_SIZE:
+            _attr_specs.clear()
+        _attr_specs[state] = attr_spec
+    return attr_spec
 
 
 def translate_text_for_urwid(raw_text):
     """
     Converts an ANSII escaped string into an urwid equivalent.
-    First by finding all the matches for "\033[" or "\x1b[",
-    reading the ANSII escape code(s) (semi-colon delimited),
-    and converting these to the an urwid AttrSpec.
+    A single pass over the escape sequences of the text ("\033[" or "\x1b["): the SGR ones move
+    a (fg, bg, flags) state, the other ones (cursor moves, erase line, window title...) are dropped.
+    The text between two state changes is one segment of the markup. Text without escape character
+    is returned as is with the default attributes.
 
     >>> translate_text_for_urwid("\033[91mHello, world")
     [(AttrSpec('light red', 'default'), 'Hello, world')]
@@ -171,22 +231,41 @@ def translate_text_for_urwid(raw_text):
     >>> translate_text_for_urwid("\033[0mFin, reset everything")
     [(AttrSpec('default', 'default'), 'Fin, reset everything')]
 
+    >>> translate_text_for_urwid("plain \033[1m\033[38;5;208mbold\033[K orange\033[0m")
+    [(AttrSpec('default', 'default'), 'plain '), (AttrSpec('#f80,bold', 'default'), 'bold orange')]
+
     :param raw_text:
     :return:
     """
-
-    formated_text = []
     if hasattr(raw_text, "decode"):
         raw_text = raw_text.decode("utf-8")
 
-    # Reset the start of text (+ allow for text that isn't formatted)
-    if not (raw_text.startswith("\033[") or raw_text.startswith("\x1b[")):
-        raw_text = "\x1b[0m" + raw_text
-
-    for (attr, text) in get_ansii_group_matches_for_text(raw_text):
-        fgcolor, bgcolor = translate_color(attr)
-        formated_text.append((urwid.AttrSpec(fgcolor, bgcolor), text))
+    if "\x1b" not in raw_text:
+        return [(get_attr_spec(DEFAULT_SGR_STATE), raw_text)] if raw_text else []
 
+    formated_text = []
+    state = DEFAULT_SGR_STATE
+    segment = []
+    start = 0
+    position = raw_text.find("\x1b")
+    while position >= 0:
+        if position > start:
+            segment.append(raw_text[start:position])
+        match = ESCAPE_SEQUENCE_REGEX.match(raw_text, position)
+        if match.group(2) == "m":
+            next_state = get_sgr_state(state, match.group(1))
+            if next_state != state:
+                if segment:
+                    formated_text.append((get_attr_spec(state), "".join(segment)))
+                    segment = []
+                state = next_state
+        start = match.end()
+        position = raw_text.find("\x1b", start)
+
+    if start < len(raw_text):
+        segment.append(raw_text[start:])
+    if segment:
+        formated_text.append((get_attr_spec(state), "".join(segment)))
     return formated_text
 
 
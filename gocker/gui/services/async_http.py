@@ -0,0 +1,170 @@
+import asyncio
+import base64
+import functools
+import json
+import ssl
+from typing import AsyncIterator, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlencode, urlparse
+
+READ_SIZE = 65536
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class UnsupportedHostUrlError(ValueError):
+    pass
+
+
+def parse_host_url(host_url: str):
+    if host_url.startswith('unix:'):
+        path = host_url[len('unix:'):].lstrip('/')
+        return 'unix', '/' + path, None
+    parsed_url = urlparse(host_url.replace('tcp://', 'http://'))
+    return parsed_url.scheme, parsed_url.hostname, parsed_url.port or DEFAULT_PORTS.get(parsed_url.scheme)
+
+
+def is_supported_host_url(host_url: str) -> bool:
+    return parse_host_url(host_url)[0] in ('unix', 'http', 'https')
+
+
+@functools.lru_cache(maxsize=None)
+def get_ssl_context(
+        verify: Union[bool, str] = True,
+        cert: Optional[Union[str, Tuple[str, str]]] = None,
+) -> ssl.SSLContext:
+    """
+    SSL context of the TLS settings of a requests session such as the docker client:
+    `verify` is a boolean or the path of a CA bundle, `cert` the path of the client certificate
+    or a (certificate, key) tuple.
+    """
+    context = ssl.create_default_context(cafile=verify if isinstance(verify, str) else None)
+    if verify is False:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    if isinstance(cert, tuple):
+        context.load_cert_chain(*cert)
+    elif cert is not None:
+        context.load_cert_chain(cert)
+    return context
+
+
+def get_host_ssl_context(
+        host_url: str,
+        verify: Union[bool, str] = True,
+        cert: Optional[Union[str, Tuple[str, str]]] = None,
+) -> Optional[ssl.SSLContext]:
+    if parse_host_url(host_url)[0] != 'https':
+        return None
+    return get_ssl_context(verify, cert)
+
+
+def get_authorization_header(host_url: str) -> Optional[str]:
+    if host_url.startswith('unix:'):
+        return None
+    parsed_url = urlparse(host_url.replace('tcp://', 'http://'))
+    if parsed_url.username is None:
+        return None
+    credentials = '%s:%s' % (unquote(parsed_url.username), unquote(parsed_url.password or ''))
+    return 'Basic %s' % base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+
+
+async def open_connection(host_url: str, ssl_context: Optional[ssl.SSLContext] = None):
+    scheme, host, port = parse_host_url(host_url)
+    if scheme == 'unix':
+        return await asyncio.open_unix_connection(host, limit=READ_SIZE)
+    if scheme == 'http':
+        return await asyncio.open_connection(host, port, limit=READ_SIZE)
+    if scheme == 'https':
+        return await asyncio.open_connection(host, port, ssl=ssl_context or get_ssl_context(), limit=READ_SIZE)
+    raise UnsupportedHostUrlError('Unsupported host url "%s"' % host_url)
+
+
+class AsyncHttpResponse:
+    def __init__(
+            self,
+            reader: asyncio.StreamReader,
+            writer: asyncio.StreamWriter,
+            status: int,
+            headers: Dict[str, str],
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.status = status
+        self.headers = headers
+
+    def close(self):
+        self.writer.close()
+
+    async def iter_chunks(self) -> AsyncIterator[bytes]:
+        if self.headers.get('transfer-encoding', '').lower() != 'chunked':
+            while True:
+                data = await self.reader.read(READ_SIZE)
+                if not data:
+                    return
+                yield data
+
+        while True:
+            size_line = await self.reader.readline()
+            if not size_line:
+                return
+            size = int(size_line.split(b';', 1)[0].strip() or b'0', 16)
+            if size == 0:
+                return
+            data = await self.reader.readexactly(size)
+            await self.reader.readexactly(2)
+            yield data
+
+    async def read_json(self):
+        body = b''
+        async for chunk in self.iter_chunks():
+            body += chunk
+        return json.loads(body)
+
+    async def iter_json(self) -> AsyncIterator[dict]:
+        buffer = b''
+        async for chunk in self.iter_chunks():
+            buffer += chunk
+            lines = buffer.split(b'\n')
+            buffer = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line)
+        if buffer.strip():
+            yield json.loads(buffer)
+
+
+async def http_get(
+        host_url: str,
+        path: str,
+        params: Optional[dict] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+) -> AsyncHttpResponse:
+    reader, writer = await open_connection(host_url, ssl_context)
+    if params:
+        path = '%s?%s' % (path, urlencode(params))
+    request_lines = [
+        'GET %s HTTP/1.1' % path,
+        'Host: localhost',
+        'User-Agent: gocker',
+        'Connection: close',
+    ]
+    authorization = get_authorization_header(host_url)
+    if authorization is not None:
+        request_lines.append('Authorization: %s' % authorization)
+    writer.write(('\r\n'.join(request_lines) + '\r\n\r\n').encode('latin-1'))
+    await writer.drain()
+
+    try:
+        status_line = await reader.readline()
+        status = int(status_line.split(b' ', 2)[1])
+        headers = {}
+        while True:
+            header_line = await reader.readline()
+            if header_line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = header_line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+    except (IndexError, ValueError) as error:
+        writer.close()
+        raise ConnectionError('Invalid http response from %s%s' % (host_url, path)) from error
+
+    return AsyncHttpResponse(reader, writer, status, headers)
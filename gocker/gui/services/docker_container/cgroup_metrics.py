@@ -0,0 +1,207 @@
+import logging
+import os
+import time
+from dataclasses import dataclass
+from threading import RLock
+from typing import Dict, Optional
+
+from dependency_injector.wiring import Provide, inject
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.services.docker_container.docker_containers_metrics import next_container_metric
+from gocker.gui.services.docker_container.metrics_collector import MetricsCollectorThread
+
+CGROUP_V2_CONTAINER_DIRS = [
+    'system.slice/docker-%s.scope',
+    'docker/%s',
+]
+CGROUP_V1_CPU_DIRS = [
+    'cpuacct/system.slice/docker-%s.scope',
+    'cpuacct/docker/%s',
+    'cpu,cpuacct/system.slice/docker-%s.scope',
+    'cpu,cpuacct/docker/%s',
+]
+CGROUP_V1_MEMORY_DIRS = [
+    'memory/system.slice/docker-%s.scope',
+    'memory/docker/%s',
+]
+CGROUP_V1_BLKIO_DIRS = [
+    'blkio/system.slice/docker-%s.scope',
+    'blkio/docker/%s',
+]
+
+
+@dataclass
+class CgroupFiles:
+    cpu_usage: str
+    memory_usage: str
+    is_v2: bool
+    block_io: Optional[str] = None
+
+
+@dataclass
+class CgroupSample:
+    cpu_usage_ns: int
+    memory_usage: Optional[int]
+    monotonic_ns: int
+    block_read_bytes: Optional[int] = None
+    block_write_bytes: Optional[int] = None
+
+
+class CgroupReader:
+    def __init__(self, cgroup_root: str = '/sys/fs/cgroup'):
+        self.cgroup_root = cgroup_root
+        self.is_v2 = os.path.exists(os.path.join(cgroup_root, 'cgroup.controllers'))
+
+    def find_files(self, container_id: str) -> Optional[CgroupFiles]:
+        if self.is_v2:
+            directory = self.__find_directory(CGROUP_V2_CONTAINER_DIRS, container_id)
+            if directory is None:
+                return None
+            return CgroupFiles(
+                os.path.join(directory, 'cpu.stat'),
+                os.path.join(directory, 'memory.current'),
+                True,
+                os.path.join(directory, 'io.stat'),
+            )
+
+        cpu_directory = self.__find_directory(CGROUP_V1_CPU_DIRS, container_id)
+        memory_directory = self.__find_directory(CGROUP_V1_MEMORY_DIRS, container_id)
+        if cpu_directory is None or memory_directory is None:
+            return None
+        blkio_directory = self.__find_directory(CGROUP_V1_BLKIO_DIRS, container_id)
+        return CgroupFiles(
+            os.path.join(cpu_directory, 'cpuacct.usage'),
+            os.path.join(memory_directory, 'memory.usage_in_bytes'),
+            False,
+            os.path.join(blkio_directory, 'blkio.throttle.io_service_bytes_recursive') if blkio_directory else None,
+        )
+
+    def read_sample(self, files: CgroupFiles) -> CgroupSample:
+        return CgroupSample(
+            self.__read_cpu_usage_ns(files),
+            self.__read_int(files.memory_usage),
+            time.monotonic_ns(),
+            *self.__read_block_io(files),
+        )
+
+    def __find_directory(self, candidates, container_id):
+        for candidate in candidates:
+            directory = os.path.join(self.cgroup_root, candidate % container_id)
+            if os.path.isdir(directory):
+                return directory
+        return None
+
+    def __read_cpu_usage_ns(self, files: CgroupFiles):
+        if not files.is_v2:
+            return self.__read_int(files.cpu_usage)
+        with open(files.cpu_usage, 'r', encoding='ascii') as file_handler:
+            for line in file_handler:
+                if line.startswith('usage_usec '):
+                    return int(line[len('usage_usec '):]) * 1000
+        return None
+
+    @staticmethod
+    def __read_block_io(files: CgroupFiles):
+        if files.block_io is None or not os.path.exists(files.block_io):
+            return None, None
+        read_bytes = 0
+        write_bytes = 0
+        with open(files.block_io, 'r', encoding='ascii') as file_handler:
+            for line in file_handler:
+                fields = line.split()
+                if files.is_v2:
+                    # <major>:<minor> rbytes=<n> wbytes=<n> rios=<n> ...
+                    for field in fields[1:]:
+                        key, _, value = field.partition('=')
+                        if key == 'rbytes':
+                            read_bytes += int(value)
+                        elif key == 'wbytes':
+                            write_bytes += int(value)
+                elif len(fields) == 3 and fields[1] == 'Read':
+                    read_bytes += int(fields[2])
+                elif len(fields) == 3 and fields[1] == 'Write':
+                    write_bytes += int(fields[2])
+        return read_bytes, write_bytes
+
+    @staticmethod
+    def __read_int(path):
+        with open(path, 'r', encoding='ascii') as file_handler:
+            value = file_handler.read().strip()
+        if value == 'max':
+            return None
+        return int(value)
+
+
+def calculate_cgroup_cpu_percentage(previous: Optional[CgroupSample], current: CgroupSample):
+    if previous is None or previous.cpu_usage_ns is None or current.cpu_usage_ns is None:
+        return None
+    interval_ns = current.monotonic_ns - previous.monotonic_ns
+    if interval_ns <= 0:
+        return None
+    return (current.cpu_usage_ns - previous.cpu_usage_ns) / interval_ns * 100
+
+
+class CgroupMetricsThread(MetricsCollectorThread):
+    """
+    Reads cpu and memory usage of the containers straight from the cgroup filesystem,
+    for gocker running on the same linux host as the docker daemon.
+    """
+
+    @inject
+    def __init__(
+            self,
+            draw_lock: RLock = Provide[Container.draw_lock],
+            cgroup_root: str = Provide[Container.config.metrics.cgroup_root],
+    ):
+        super().__init__(draw_lock)
+        self.reader = CgroupReader(cgroup_root)
+        self.files: Dict[str, CgroupFiles] = {}
+        self.samples: Dict[str, CgroupSample] = {}
+
+    def remove_container(self, container_id):
+        with self.lock:
+            super().remove_container(container_id)
+            self.files.pop(container_id, None)
+            self.samples.pop(container_id, None)
+
+    def run(self):
+        while not self.is_stopped():
+            now = time.monotonic()
+            for metrics in self.get_all_metrics():
+                if self.scheduler.is_due(metrics, now):
+                    self.__update(metrics.container_id)
+            time.sleep(1)
+
+    def __update(self, container_id):
+        with self.lock:
+            files = self.files.get(container_id)
+        if files is None:
+            files = self.reader.find_files(container_id)
+            if files is None:
+                return
+            with self.lock:
+                if container_id not in self.metrics:
+                    return
+                self.files[container_id] = files
+        try:
+            sample = self.reader.read_sample(files)
+        except (OSError, ValueError):
+            logging.debug('Cgroup read error for %s' % container_id, exc_info=True)
+            with self.lock:
+                self.files.pop(container_id, None)
+            return
+
+        with self.lock:
+            if container_id not in self.metrics:
+                return
+            next_container_metric(
+                self.metrics[container_id],
+                time.time() * 1000,
+                calculate_cgroup_cpu_percentage(self.samples.get(container_id), sample),
+                sample.memory_usage,
+                block_read_bytes=sample.block_read_bytes,
+                block_write_bytes=sample.block_write_bytes,
+            )
+            self.samples[container_id] = sample
+            self.scheduler.mark_sampled(self.metrics[container_id])
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import List
 
+from gocker.data_structure.ring_buffer import RingBuffer
+
 
 @dataclass
 class DockerComposeProject:
@@ -13,24 +15,99 @@ class DockerComposeProject:
 
 
 # pylint: disable=too-many-instance-attributes
-@dataclass
 class DockerContainerMetric:
-    container_id: str
-    container_name: str
-    container_ports: list
-    container_labels: list
-    status: str = ''
-    time_read: int = 0
-    cpu_percentage: float = None
-    cpu_percentage_previous: float = None
-    memory_usage: int = None
-    memory_usage_previous: int = None
+    """
+    Metric record of a container, allocated once when the container appears
+    and updated in place by the metrics collectors on every sample.
+    """
+    __slots__ = (
+        'container_id',
+        'container_name',
+        'container_ports',
+        'container_labels',
+        'status',
+        'time_read',
+        'cpu_percentage',
+        'cpu_percentage_previous',
+        'memory_usage',
+        'memory_usage_previous',
+        'cpu_history',
+        'memory_history',
+        'version',
+        'network_rx_bytes',
+        'network_tx_bytes',
+        'block_read_bytes',
+        'block_write_bytes',
+        'network_rx_rate',
+        'network_tx_rate',
+        'block_read_rate',
+        'block_write_rate',
+    )
+
+    # pylint: disable=too-many-arguments,too-many-locals
+    def __init__(
+            self,
+            container_id: str,
+            container_name: str,
+            container_ports: list,
+            container_labels: list,
+            status: str = '',
+            time_read: float = 0,
+            cpu_percentage: float = None,
+            cpu_percentage_previous: float = None,
+            memory_usage: int = None,
+            memory_usage_previous: int = None,
+            cpu_history: RingBuffer = None,
+            memory_history: RingBuffer = None,
+            version: int = 0,
+            network_rx_bytes: int = None,
+            network_tx_bytes: int = None,
+            block_read_bytes: int = None,
+            block_write_bytes: int = None,
+            network_rx_rate: float = None,
+            network_tx_rate: float = None,
+            block_read_rate: float = None,
+            block_write_rate: float = None,
+    ):
+        self.container_id = container_id
+        self.container_name = container_name
+        self.container_ports = container_ports
+        self.container_labels = container_labels
+        self.status = status
+        self.time_read = time_read
+        self.cpu_percentage = cpu_percentage
+        self.cpu_percentage_previous = cpu_percentage_previous
+        self.memory_usage = memory_usage
+        self.memory_usage_previous = memory_usage_previous
+        self.cpu_history = cpu_history
+        self.memory_history = memory_history
+        self.version = version
+        self.network_rx_bytes = network_rx_bytes
+        self.network_tx_bytes = network_tx_bytes
+        self.block_read_bytes = block_read_bytes
+        self.block_write_bytes = block_write_bytes
+        self.network_rx_rate = network_rx_rate
+        self.network_tx_rate = network_tx_rate
+        self.block_read_rate = block_read_rate
+        self.block_write_rate = block_write_rate
+
+    def __repr__(self):
+        return '%s(%s)' % (
+            self.__class__.__name__,
+            ', '.join('%s=%r' % (name, getattr(self, name)) for name in self.__slots__)
+        )
 
     def get_column(self, column_name):
         if column_name == 'container_name':
             return self.container_name
-        if column_name == 'cpu_percentage':
-            return self.cpu_percentage if self.cpu_percentage is not None else 0
-        if column_name == 'memory_usage':
-            return self.memory_usage if self.memory_usage is not None else 0
+        if column_name in [
+            'cpu_percentage',
+            'memory_usage',
+            'network_rx_rate',
+            'network_tx_rate',
+            'block_read_rate',
+            'block_write_rate',
+        ]:
+            value = getattr(self, column_name)
+            return value if value is not None else 0
         return None
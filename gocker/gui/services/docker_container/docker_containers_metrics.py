@@ -1,19 +1,16 @@
 import datetime
+import math
 import pprint
-from threading import RLock
 
-import docker
 import parsedatetime as pdt
-from dependency_injector.wiring import Provide, inject
 
-from gocker.gui.dependency_injection import Container
 from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
-from gocker.threads import StoppableThread
 
 pp = pprint.PrettyPrinter(indent=4)
 
 date_parser = pdt.Calendar(pdt.Constants())
 epoch = datetime.datetime.utcfromtimestamp(0)
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
 
 
 def unix_time_millis(_datetime):
@@ -27,77 +24,114 @@ def parse_date_time(time_str):
     return _datetime + datetime.timedelta(microseconds=microseconds)
 
 
-class DockerContainerMetricsThread(StoppableThread):
-    @inject
-    def __init__(
-            self,
-            docker_list_thread,
-            container_id,
-            container_name,
-            container_ports,
-            container_labels,
-            docker_client: docker.APIClient = Provide[Container.docker_client],
-            draw_lock: RLock = Provide[Container.draw_lock],
+def parse_timestamp_millis(time_str):
+    """
+    Fast path for the fixed format UTC timestamps of the stats api (2024-01-01T10:20:30.123456789Z),
+    slices the fields instead of going through strptime.
+    """
+    if len(time_str) < 20 or time_str[-1] != 'Z' or time_str[4] != '-' or time_str[10] != 'T':
+        return unix_time_millis(parse_date_time(time_str))
+    days = datetime.date(int(time_str[0:4]), int(time_str[5:7]), int(time_str[8:10])).toordinal() - EPOCH_ORDINAL
+    seconds = days * 86400 + int(time_str[11:13]) * 3600 + int(time_str[14:16]) * 60 + int(time_str[17:19])
+    fraction = time_str[20:-1] if time_str[19] == '.' else ''
+    return seconds * 1000 + (int(fraction[:6].ljust(6, '0')) / 1000 if fraction else 0)
+
+
+def update_container_metric(metrics: DockerContainerMetric, stat: dict):
+    if stat['preread'][0:4] == '0001':
+        return
+    time_read = parse_timestamp_millis(stat['preread'])
+
+    next_container_metric(
+        metrics,
+        time_read,
+        calculate_cpu_percentage(stat, time_read - metrics.time_read),
+        calculate_memory_usage(stat),
+        *calculate_network_bytes(stat),
+        *calculate_block_bytes(stat),
+    )
+
+
+# pylint: disable=too-many-arguments
+def next_container_metric(
+        metrics: DockerContainerMetric,
+        time_read,
+        cpu_percentage,
+        memory_usage,
+        network_rx_bytes=None,
+        network_tx_bytes=None,
+        block_read_bytes=None,
+        block_write_bytes=None,
+):
+    if (
+            round_percentage(cpu_percentage) != round_percentage(metrics.cpu_percentage) or
+            memory_usage != metrics.memory_usage
     ):
-        self.client = docker_client
-        self.lock = draw_lock
-        self.container_id = container_id
-        self.docker_list_thread = docker_list_thread
-        super().__init__(name='%s-%s' % (self.__class__.__name__, container_name))
-        self.metrics = DockerContainerMetric(
-            container_id=self.container_id,
-            container_name=container_name,
-            container_ports=container_ports,
-            container_labels=container_labels,
-            status='',
-        )
-
-    def get_container_metrics(self):
-        return self.metrics
-
-    def run(self):
-        while not self.is_stopped():
-            for stat in self.client.stats(self.container_id, True, True):
-                if self.is_stopped():
-                    return
-
-                if stat['preread'][0:4] == '0001':
-                    continue
-                time_read = unix_time_millis(parse_date_time(stat['preread']))
-
-                intervals = None
-                if self.metrics is not None:
-                    intervals = (time_read - self.metrics.time_read)
-                with self.lock:
-                    self.metrics = DockerContainerMetric(
-                        container_id=self.metrics.container_id,
-                        container_name=self.metrics.container_name,
-                        container_ports=self.metrics.container_ports,
-                        container_labels=self.metrics.container_labels,
-                        status=self.metrics.status,
-                        time_read=time_read,
-                        cpu_percentage=self.calculate_cpu_percentage(stat, intervals),
-                        cpu_percentage_previous=self.metrics.cpu_percentage if self.metrics is not None else None,
-                        memory_usage=self.calculate_memory_usage(stat),
-                        memory_usage_previous=self.metrics.memory_usage if self.metrics is not None else None,
-                    )
-
-    @staticmethod
-    def calculate_memory_usage(stat):
-        if 'usage' not in stat['memory_stats']:
-            return None
-        return stat['memory_stats']['usage']
-
-    @staticmethod
-    def calculate_cpu_percentage(metric, intervals):
-        if intervals is None:
-            return None
-        if intervals == 0:
-            return None
-        if 'online_cpus' not in metric['cpu_stats']:
-            return None
-
-        cpu_delta = metric['cpu_stats']['cpu_usage']['total_usage'] - metric['precpu_stats']['cpu_usage']['total_usage']
-        system_delta = metric['cpu_stats']['system_cpu_usage'] - metric['precpu_stats']['system_cpu_usage']
-
-        return cpu_delta / system_delta * metric['cpu_stats']['online_cpus'] * 100
+        metrics.version += 1
+    metrics.time_read = time_read
+    metrics.cpu_percentage_previous = metrics.cpu_percentage
+    metrics.cpu_percentage = cpu_percentage
+    metrics.memory_usage_previous = metrics.memory_usage
+    metrics.memory_usage = memory_usage
+    metrics.network_rx_bytes = network_rx_bytes
+    metrics.network_tx_bytes = network_tx_bytes
+    metrics.block_read_bytes = block_read_bytes
+    metrics.block_write_bytes = block_write_bytes
+
+
+def record_container_history(metrics: DockerContainerMetric):
+    """
+    Appends the current cpu and memory usage to the history, once per collector tick whatever
+    the number of samples read meanwhile, so that the history has one value per second.
+    """
+    if metrics.cpu_history is not None:
+        metrics.cpu_history.append(metrics.cpu_percentage if metrics.cpu_percentage is not None else math.nan)
+    if metrics.memory_history is not None:
+        metrics.memory_history.append(metrics.memory_usage if metrics.memory_usage is not None else math.nan)
+
+
+def round_percentage(percentage):
+    if percentage is None:
+        return None
+    return round(percentage, 2)
+
+
+def calculate_memory_usage(stat):
+    if 'usage' not in stat['memory_stats']:
+        return None
+    return stat['memory_stats']['usage']
+
+
+def calculate_network_bytes(stat):
+    if not stat.get('networks'):
+        return None, None
+    return (
+        sum(network.get('rx_bytes', 0) for network in stat['networks'].values()),
+        sum(network.get('tx_bytes', 0) for network in stat['networks'].values()),
+    )
+
+
+def calculate_block_bytes(stat):
+    io_service_bytes = (stat.get('blkio_stats') or {}).get('io_service_bytes_recursive')
+    if io_service_bytes is None:
+        return None, None
+    return (
+        sum(entry['value'] for entry in io_service_bytes if entry['op'].lower() == 'read'),
+        sum(entry['value'] for entry in io_service_bytes if entry['op'].lower() == 'write'),
+    )
+
+
+def calculate_cpu_percentage(metric, intervals):
+    if intervals is None:
+        return None
+    if intervals == 0:
+        return None
+    if 'online_cpus' not in metric['cpu_stats']:
+        return None
+
+    cpu_delta = metric['cpu_stats']['cpu_usage']['total_usage'] - metric['precpu_stats']['cpu_usage']['total_usage']
+    system_delta = metric['cpu_stats']['system_cpu_usage'] - metric['precpu_stats']['system_cpu_usage']
+    if system_delta <= 0:
+        return None
+
+    return cpu_delta / system_delta * metric['cpu_stats']['online_cpus'] * 100
@@ -1,6 +1,7 @@
 import datetime
 import logging
 import pprint
+import queue
 import time
 from threading import RLock
 
@@ -8,16 +9,40 @@ import docker
 from dependency_injector.wiring import inject, Provide
 from event_bus import EventBus
 
+from gocker.arguments import MetricsBackend
+from gocker.data_structure.ring_buffer import RingBuffer
+from gocker.gui.bus import set_listeners, listener
 from gocker.gui.dependency_injection import Container
 from gocker.gui.events import ContainerMetricsEvent, ContainerLifecycleEvent, ContainerCreatedEvent, \
-    ContainerStoppedEvent
-from gocker.gui.services.docker_container.docker_containers_metrics import DockerContainerMetricsThread
+    ContainerStoppedEvent, DockerContainerEvent, ContainerMetricsTickEvent
+from gocker.gui.services.async_http import is_supported_host_url
+from gocker.gui.services.docker_container.cgroup_metrics import CgroupMetricsThread
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_containers_metrics import record_container_history
+from gocker.gui.services.docker_container.docker_stats_multiplexer import DockerStatsMultiplexerThread
+from gocker.gui.services.docker_container.docker_stats_poller import DockerStatsPollerThread
+from gocker.gui.services.docker_container.throughput import ThroughputRates
 from gocker.threads import StoppableThread
 
 pp = pprint.PrettyPrinter(indent=4)
 
 epoch = datetime.datetime.utcfromtimestamp(0)
 
+CONTAINER_REFRESH_ACTIONS = ['start', 'unpause', 'pause', 'rename', 'health_status']
+CONTAINER_REMOVE_ACTIONS = ['die', 'destroy']
+
+
+def metrics_collector_factory(metrics_backend, docker_host_url):
+    if metrics_backend == MetricsBackend.CGROUP:
+        return CgroupMetricsThread()
+    if metrics_backend == MetricsBackend.ONESHOT:
+        return DockerStatsPollerThread()
+    if not is_supported_host_url(docker_host_url):
+        logging.error('Docker host %s is not supported by the stats streams, falling back to the oneshot metrics backend'
+                      % docker_host_url)
+        return DockerStatsPollerThread()
+    return DockerStatsMultiplexerThread()
+
 
 class DockerContainerService:
     def __init__(self):
@@ -30,17 +55,25 @@ class DockerContainerService:
     def update(self):
         self.docker_list_thread.update()
 
+    def set_visible_containers(self, container_ids):
+        self.docker_list_thread.metrics_collector.set_visible_containers(container_ids)
+
     def stop(self):
         self.docker_list_thread.stop()
 
 
+# pylint: disable=too-many-instance-attributes
 class DockerListThread(StoppableThread):
     @inject
     def __init__(
             self,
             docker_client: docker.APIClient = Provide[Container.docker_client],
+            docker_host_url: str = Provide[Container.config.docker.host_url],
             bus: EventBus = Provide[Container.bus],
             draw_lock: RLock = Provide[Container.draw_lock],
+            metrics_backend: str = Provide[Container.config.metrics.backend],
+            metrics_history_size: int = Provide[Container.config.metrics.history_size],
+            reconcile_interval: float = Provide[Container.config.inventory.reconcile_interval],
     ):
         super().__init__(name=self.__class__.__name__)
         self.docker_client = docker_client
@@ -48,27 +81,67 @@ class DockerListThread(StoppableThread):
         self.lock = draw_lock
         self.containers = {}
         self.container_plugins = {}
+        self.metrics_history_size = metrics_history_size
+        self.reconcile_interval = reconcile_interval
+        self.container_events = queue.Queue()
+        self.metrics_collector = metrics_collector_factory(metrics_backend, docker_host_url)
+        self.metrics_collector.start()
         self.docker_metrics_collector_thread = DockerMetricsCollectorThread(self)
         self.docker_metrics_collector_thread.start()
+        set_listeners(self, self.bus)
 
     def stop(self):
         self.docker_metrics_collector_thread.stop()
-        with self.lock:
-            for _, container in self.containers.items():
-                container.stop()
+        self.metrics_collector.stop()
         StoppableThread.stop(self)
 
+    @listener
+    def docker_container_event_listener(self, event: DockerContainerEvent):
+        self.container_events.put(event)
+
     def run(self):
+        next_reconciliation = time.monotonic()
         while not self.is_stopped():
-            if not self.update():
-                return
-            time.sleep(1.5)
+            try:
+                event = self.container_events.get(timeout=max(0.0, next_reconciliation - time.monotonic()))
+            except queue.Empty:
+                if not self.update():
+                    return
+                next_reconciliation = time.monotonic() + self.reconcile_interval
+                continue
+            self.__handle_container_event(event)
+
+    def __handle_container_event(self, event: DockerContainerEvent):
+        if event.action in CONTAINER_REMOVE_ACTIONS:
+            with self.lock:
+                if event.container_id in self.containers:
+                    self.__del_container(event.container_id, self.containers[event.container_id])
+            return
+
+        if event.action not in CONTAINER_REFRESH_ACTIONS:
+            return
+
+        try:
+            containers = list(self.docker_client.containers(False, filters={'id': event.container_id}))
+        except docker.errors.APIError as error:
+            logging.error('Error %s' % error)
+            return
+        with self.lock:
+            for container in containers:
+                container_id = container['Id']
+                container_name = container['Names'][0][1:]
+                if container_id not in self.containers:
+                    self.__add_container(container, container_id, container_name)
+                    continue
+                if self.containers[container_id] != container_name:
+                    self.__rename_container(container_id, container_name)
+                self.__update_container(container, container_id)
 
     def update(self):
         if self.is_stopped():
             return False
+        containers = list(self.docker_client.containers(False))
         with self.lock:
-            containers = list(self.docker_client.containers(False))
             running_container_ids = []
             for container in containers:
                 container_id = container['Id']
@@ -86,30 +159,43 @@ class DockerListThread(StoppableThread):
         return True
 
     def __add_container(self, container, container_id, container_name):
-        self.containers[container_id] = DockerContainerMetricsThread(
-            self,
-            container_id,
-            container_name,
-            container['Ports'],
-            container['Labels'],
-        )
-        self.containers[container_id].start()
+        self.containers[container_id] = container_name
+        self.metrics_collector.add_container(DockerContainerMetric(
+            container_id=container_id,
+            container_name=container_name,
+            container_ports=container['Ports'],
+            container_labels=container['Labels'],
+            status=container['Status'],
+            cpu_history=RingBuffer(self.metrics_history_size),
+            memory_history=RingBuffer(self.metrics_history_size),
+        ))
         self.bus.emit(ContainerLifecycleEvent.__name__, ContainerLifecycleEvent('start', container_name))
         self.bus.emit(ContainerCreatedEvent.__name__, ContainerCreatedEvent(container_id, container_name, container))
 
+    def __rename_container(self, container_id, container_name):
+        self.containers[container_id] = container_name
+        metrics = self.metrics_collector.get_container_metrics(container_id)
+        if metrics is not None:
+            metrics.container_name = container_name
+            metrics.version += 1
+
     def __update_container(self, container, container_id):
-        self.containers[container_id].metrics.status = container['Status']
+        metrics = self.metrics_collector.get_container_metrics(container_id)
+        if metrics is not None and metrics.status != container['Status']:
+            metrics.status = container['Status']
+            metrics.version += 1
 
     def __del_container(self, container_id, container_name):
         if container_id not in self.containers:
             logging.debug('__del_container %s not in self.containers' % container_id)
             return
-        self.containers[container_id].stop()
+        metrics = self.metrics_collector.get_container_metrics(container_id)
+        self.metrics_collector.remove_container(container_id)
         self.bus.emit(ContainerLifecycleEvent.__name__, ContainerLifecycleEvent('stop', container_name))
         self.bus.emit(ContainerStoppedEvent.__name__, ContainerStoppedEvent(
             container_id,
             container_name,
-            self.containers[container_id].metrics.container_labels
+            metrics.container_labels
         ))
         del self.containers[container_id]
 
@@ -126,13 +212,37 @@ class DockerMetricsCollectorThread(StoppableThread):
         self.bus = bus
         self.draw_lock = draw_lock
         self.docker_list_thread = docker_list_thread
+        self.versions = {}
+        self.throughput_rates = ThroughputRates()
 
     def run(self):
         while not self.is_stopped():
             with self.draw_lock:
-                result = []
-                for container_id in self.docker_list_thread.containers:
-                    if self.docker_list_thread.containers[container_id].get_container_metrics() is not None:
-                        result.append(self.docker_list_thread.containers[container_id].get_container_metrics())
-                self.bus.emit(ContainerMetricsEvent.__name__, ContainerMetricsEvent(list(result)))
-            time.sleep(1)
+                self.docker_list_thread.metrics_collector.apply_samples()
+                metric_list = self.docker_list_thread.metrics_collector.get_all_metrics()
+                self.throughput_rates.update(metric_list)
+                for metrics in metric_list:
+                    record_container_history(metrics)
+                event = self.get_metrics_delta(metric_list)
+                if event.added or event.changed or event.removed:
+                    self.bus.emit(ContainerMetricsEvent.__name__, event)
+                self.bus.emit(ContainerMetricsTickEvent.__name__, ContainerMetricsTickEvent(metric_list))
+            self.docker_list_thread.metrics_collector.wait_refresh(1)
+
+    def get_metrics_delta(self, metric_list):
+        event = ContainerMetricsEvent([], [], [])
+        container_ids = set()
+        for metrics in metric_list:
+            container_ids.add(metrics.container_id)
+            version = self.versions.get(metrics.container_id)
+            if version is None:
+                event.added.append(metrics)
+            elif version != metrics.version:
+                event.changed.append(metrics)
+            self.versions[metrics.container_id] = metrics.version
+
+        for container_id in list(self.versions):
+            if container_id not in container_ids:
+                event.removed.append(container_id)
+                del self.versions[container_id]
+        return event
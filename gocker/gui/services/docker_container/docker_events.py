@@ -5,7 +5,7 @@ from dependency_injector.wiring import Provide
 from event_bus import EventBus
 
 from gocker.gui.dependency_injection import Container
-from gocker.gui.events import SystemEvent
+from gocker.gui.events import SystemEvent, DockerContainerEvent
 from gocker.threads import StoppableThread
 
 
@@ -31,3 +31,10 @@ class DockerEventsThread(StoppableThread):
                     event['Type'],
                     event['Action']
                 ))
+            if event['Type'] == 'container':
+                self.bus.emit(DockerContainerEvent.__name__, DockerContainerEvent(
+                    event['Action'].split(':')[0],
+                    event['Actor']['ID'],
+                    event['Actor'].get('Attributes', {}),
+                    event['timeNano'] / 1e9 if 'timeNano' in event else event['time'],
+                ))
@@ -0,0 +1,85 @@
+import calendar
+import time
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+
+@lru_cache(maxsize=256)
+def parse_log_seconds(seconds: str) -> int:
+    return calendar.timegm(time.strptime(seconds, '%Y-%m-%dT%H:%M:%S'))
+
+
+def parse_log_timestamp(timestamp: str) -> Optional[float]:
+    """
+    Converts a RFC3339 timestamp with nanoseconds to an epoch time,
+    the seconds part only changes once per second and is cached.
+    """
+    seconds, _, fraction = timestamp.rstrip('Z').partition('.')
+    try:
+        return parse_log_seconds(seconds) + (float('0.' + fraction) if fraction else 0.0)
+    except ValueError:
+        return None
+
+
+def checkpoint_since(timestamp: str) -> str:
+    """
+    Converts a RFC3339 timestamp with nanoseconds (`2021-03-04T05:06:07.123456789Z`, as sent by
+    `/containers/{id}/logs?timestamps=1`) to the `seconds.nanoseconds` format of the `since` parameter.
+    """
+    seconds, _, fraction = timestamp.rstrip('Z').partition('.')
+    return '%d.%s' % (
+        parse_log_seconds(seconds),
+        (fraction + '000000000')[:9],
+    )
+
+
+class LogCheckpoint:
+    """
+    Last line displayed for a container, shared by the successive log streams of that container:
+    the timestamp of the line and how many lines with that same timestamp have been displayed.
+    """
+
+    def __init__(self):
+        self.timestamp = ''
+        self.count = 0
+        self.attachments = 0
+
+    def is_set(self):
+        return self.timestamp != ''
+
+
+class LogCheckpointFilter:
+    """
+    Removes the timestamp prefix of the lines of a log stream, returns it parsed along the line,
+    and moves the checkpoint forward.
+    `since` is inclusive and the backlog and follow requests overlap, so until a stream reaches the
+    checkpoint, its lines that are not after it are skipped.
+    """
+
+    def __init__(self, checkpoint: LogCheckpoint):
+        self.checkpoint = checkpoint
+        self.timestamp = ''
+        self.time = None
+        self.index = 0
+        self.caught_up = False
+
+    def filter(self, lines: List[Tuple[str, str]]) -> List[Tuple[str, str, Optional[float]]]:
+        checkpoint = self.checkpoint
+        result = []
+        for stream, line in lines:
+            timestamp, _, text = line.partition(' ')
+            if timestamp == self.timestamp:
+                self.index += 1
+            else:
+                self.timestamp = timestamp
+                self.time = parse_log_timestamp(timestamp)
+                self.index = 1
+            if not self.caught_up:
+                if (timestamp, self.index) <= (checkpoint.timestamp, checkpoint.count):
+                    continue
+                self.caught_up = True
+            if (timestamp, self.index) > (checkpoint.timestamp, checkpoint.count):
+                checkpoint.timestamp = timestamp
+                checkpoint.count = self.index
+            result.append((stream, text, self.time))
+        return result
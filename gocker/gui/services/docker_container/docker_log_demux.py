@@ -0,0 +1,87 @@
+import codecs
+import struct
+from itertools import repeat
+from typing import List, Tuple
+
+STREAM_HEADER = struct.Struct('>BxxxL')
+STREAM_HEADER_SIZE = 8
+STREAM_NAMES = ('stdin', 'stdout', 'stderr')
+TTY_STREAM = 1
+MAX_PARTIAL_LINE_SIZE = 16384
+
+
+class DockerLogDemuxer:
+    """
+    Incremental parser of a docker log stream.
+    Non tty containers send frames made of an 8 bytes header (stream type, 3 padding bytes,
+    big endian payload size) followed by the payload, tty containers send the raw output.
+    Frames are sliced with a memoryview over the pending bytes, each stream has its own incremental
+    utf-8 decoder and partial line, so characters and lines split across chunks are kept whole.
+    Consecutive frames of the same stream are decoded and split in one pass.
+    A partial line longer than MAX_PARTIAL_LINE_SIZE characters (a tty progress bar redrawn with carriage returns)
+    is emitted as is instead of waiting for its end of line.
+    """
+
+    def __init__(self, is_tty: bool):
+        self.is_tty = is_tty
+        self.buffer = bytearray()
+        self.decoders = [codecs.getincrementaldecoder('utf-8')(errors='replace') for _ in STREAM_NAMES]
+        self.partial_lines = ['' for _ in STREAM_NAMES]
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, str]]:
+        lines = []
+        if self.is_tty:
+            self.__add_text(TTY_STREAM, chunk, lines)
+            return lines
+
+        buffer = self.buffer
+        buffer += chunk
+        size = len(buffer)
+        offset = 0
+        run_stream = None
+        run_payloads = []
+        with memoryview(buffer) as view:
+            while size - offset >= STREAM_HEADER_SIZE:
+                stream, payload_size = STREAM_HEADER.unpack_from(buffer, offset)
+                end = offset + STREAM_HEADER_SIZE + payload_size
+                if end > size:
+                    break
+                if stream != run_stream and run_payloads:
+                    self.__add_payloads(run_stream, run_payloads, lines)
+                    run_payloads = []
+                run_stream = stream
+                run_payloads.append(view[offset + STREAM_HEADER_SIZE:end])
+                offset = end
+            if run_payloads:
+                self.__add_payloads(run_stream, run_payloads, lines)
+        del buffer[:offset]
+        return lines
+
+    def flush(self) -> List[Tuple[str, str]]:
+        lines = []
+        for stream, stream_name in enumerate(STREAM_NAMES):
+            text = self.partial_lines[stream] + self.decoders[stream].decode(b'', final=True)
+            self.partial_lines[stream] = ''
+            if text:
+                lines.append((stream_name, text.rstrip('\r')))
+        return lines
+
+    def __add_payloads(self, stream: int, payloads: List[memoryview], lines: List[Tuple[str, str]]):
+        self.__add_text(stream if stream < len(STREAM_NAMES) else TTY_STREAM, (
+            payloads[0] if len(payloads) == 1 else b''.join(payloads)
+        ), lines)
+        for payload in payloads:
+            payload.release()
+
+    def __add_text(self, stream: int, payload, lines: List[Tuple[str, str]]):
+        text = self.partial_lines[stream] + self.decoders[stream].decode(payload)
+        if '\n' in text:
+            if '\r' in text:
+                text = text.replace('\r\n', '\n')
+            stream_lines = text.split('\n')
+            text = stream_lines.pop()
+            lines.extend(zip(repeat(STREAM_NAMES[stream]), stream_lines))
+        if len(text) > MAX_PARTIAL_LINE_SIZE:
+            lines.append((STREAM_NAMES[stream], text))
+            text = ''
+        self.partial_lines[stream] = text
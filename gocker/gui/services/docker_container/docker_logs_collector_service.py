@@ -1,5 +1,12 @@
+import asyncio
+import functools
 import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
 from threading import RLock
+from typing import Dict
 
 import docker
 from dependency_injector.wiring import Provide, inject
@@ -7,19 +14,32 @@ from event_bus import EventBus
 
 from gocker.gui.bus import set_listeners, listener
 from gocker.gui.dependency_injection import Container
-from gocker.gui.events import LogReceivedEvent, ContainerCreatedEvent
+from gocker.gui.events import ContainerCreatedEvent, DockerContainerEvent
+from gocker.gui.services.async_http import get_host_ssl_context, http_get, is_supported_host_url
+from gocker.gui.services.docker_container.docker_log_checkpoint import LogCheckpoint, LogCheckpointFilter, \
+    checkpoint_since
+from gocker.gui.services.docker_container.docker_log_demux import DockerLogDemuxer
 from gocker.gui.services.log_collector import LogsCollector
-from gocker.threads import StoppableThread
+from gocker.gui.services.log_multiplexer import LogMultiplexerThread, LogStream
 
 
 class DockerLogsCollectorService(LogsCollector):
+    """
+    Keeps a checkpoint of the last displayed line of each logged container,
+    when a logged container starts again its logs are read again from that checkpoint.
+    """
+
     @inject
     def __init__(
             self,
+            log_multiplexer: LogMultiplexerThread,
             draw_lock: RLock = Provide[Container.draw_lock],
-            bus: EventBus = Provide[Container.bus]
+            bus: EventBus = Provide[Container.bus],
+            all_tail=Provide[Container.config.logs.all_tail],
     ):
-        super().__init__(draw_lock)
+        super().__init__(draw_lock, log_multiplexer)
+        self.all_tail = all_tail
+        self.checkpoints: Dict[str, LogCheckpoint] = {}
         set_listeners(self, bus)
 
     @listener
@@ -27,7 +47,22 @@ class DockerLogsCollectorService(LogsCollector):
         if 'gocker-log' not in event.container['Labels']:
             return
         if json.loads(event.container['Labels']['gocker-log']):
-            self.toggle_log(event.container_name)
+            self.add_log(event.container_name)
+
+    @listener
+    def docker_container_event_listener(self, event: DockerContainerEvent):
+        if event.action != 'start':
+            return
+        key = event.attributes.get('name')
+        if key not in self.log_streams or key not in self.checkpoints:
+            return
+        if self.checkpoints[key].is_set():
+            logging.debug('Container %s started, reading logs since %s' % (key, self.checkpoints[key].timestamp))
+            self.add_log_stream(key, self.__create_stream(key))
+            return
+        follow_since = time.time() if event.time is None else event.time
+        logging.debug('Container %s started before its first log line, following logs since %s' % (key, follow_since))
+        self.add_log_stream(key, self.__create_stream(key, follow_since=follow_since))
 
     def toggle_log(self, key):
         if self.is_logged(key):
@@ -35,37 +70,163 @@ class DockerLogsCollectorService(LogsCollector):
             return
         self.add_log(key)
 
-    def add_log(self, key):
-        if key in self.log_threads:
+    def add_all_logs(self, keys):
+        for key in keys:
+            self.add_log(key, self.all_tail)
+
+    def add_log(self, key, tail=None):
+        if key in self.log_streams:
             return
-        self.log_threads[key] = DockerLogThread(key)
-        self.log_threads[key].start()
+        self.checkpoints[key] = LogCheckpoint()
+        self.add_log_streams(key, [self.__create_stream(key, tail)])
+
+    def remove_log(self, key):
+        super().remove_log(key)
+        self.checkpoints.pop(key, None)
+
+    def __create_stream(self, key, tail=None, follow_since=None):
+        checkpoint = self.checkpoints[key]
+        checkpoint.attachments += 1
+        return DockerLogStream(key, checkpoint, follow_since, **({} if tail is None else {'tail': tail}))
 
 
-class DockerLogThread(StoppableThread):
+# pylint: disable=too-many-instance-attributes
+class DockerLogStream(LogStream):
+    """
+    Displays the last `tail` lines (or the lines of the last `since` seconds) of a container in one batch,
+    then follows the new lines from the last backlog line, or from the daemon time of the backlog response
+    when it had no line, so a daemon clock behind gocker's does not lose lines.
+    Once the checkpoint is set (the container restarted), only follows the lines after the checkpoint,
+    a container restarted before its first line only follows the lines after `follow_since`.
+    Docker hosts the async http client cannot open (ssh://...) are read with a single followed
+    docker-py request in a thread of their own, stdout and stderr are not told apart.
+    """
+
     @inject
     def __init__(
             self,
             container_name,
+            checkpoint: LogCheckpoint,
+            follow_since: float = None,
+            tail=Provide[Container.config.logs.tail],
+            since: float = Provide[Container.config.logs.since],
+            docker_host_url: str = Provide[Container.config.docker.host_url],
             docker_client: docker.APIClient = Provide[Container.docker_client],
-            bus: EventBus = Provide[Container.bus],
-            draw_lock: RLock = Provide[Container.draw_lock],
     ):
-        super().__init__(name='%s-%s' % (self.__class__.__name__, container_name))
-        self.bus = bus
-        self.docker_client = docker_client
+        super().__init__('docker-%s#%d' % (container_name, checkpoint.attachments), container_name)
         self.container_name = container_name
-        self.draw_lock = draw_lock
+        self.checkpoint = checkpoint
+        self.follow_since = follow_since
+        self.tail = tail
+        self.since = since
+        self.docker_host_url = docker_host_url
+        self.docker_client = docker_client
+        self.api_version = docker_client.api_version
+        self.ssl_context = get_host_ssl_context(docker_host_url, docker_client.verify, docker_client.cert)
+
+    async def read(self, emit):
+        if not is_supported_host_url(self.docker_host_url):
+            await self.__read_docker_client_logs(emit)
+            return
 
-    def run(self):
-        previous_chunk = ''
-        for log in self.docker_client.logs(self.container_name, stream=True):
-            if self.is_stopped():
+        response = await http_get(
+            self.docker_host_url,
+            '/v%s/containers/%s/json' % (self.api_version, self.container_name),
+            ssl_context=self.ssl_context,
+        )
+        try:
+            if response.status != 200:
+                logging.error('Log error, container %s not found' % self.container_name)
                 return
-            with self.draw_lock:
-                text = previous_chunk + log.decode('UTF-8').replace('\x1b', '\n')
-                for line in text.splitlines(keepends=True):
-                    if line[-1] == '\n':
-                        self.bus.emit(LogReceivedEvent.__name__, LogReceivedEvent(self.container_name, line.rstrip()))
-                    else:
-                        previous_chunk = line
+            is_tty = (await response.read_json())['Config']['Tty']
+        finally:
+            response.close()
+
+        if self.checkpoint.is_set() or self.follow_since is not None:
+            await self.__read_logs({
+                'stdout': 1, 'stderr': 1, 'timestamps': 1, 'follow': 1,
+                'since': checkpoint_since(self.checkpoint.timestamp) if self.checkpoint.is_set() else self.follow_since,
+            }, is_tty, emit)
+            return
+
+        params = {'stdout': 1, 'stderr': 1, 'timestamps': 1, 'tail': self.tail}
+        if self.since is not None:
+            params['since'] = time.time() - self.since
+        daemon_time = await self.__read_logs(params, is_tty, emit)
+        await self.__read_logs({
+            'stdout': 1, 'stderr': 1, 'timestamps': 1, 'follow': 1,
+            'since': checkpoint_since(self.checkpoint.timestamp) if self.checkpoint.is_set() else daemon_time,
+        }, is_tty, emit)
+
+    async def __read_docker_client_logs(self, emit):
+        params = {'stdout': True, 'stderr': True, 'timestamps': True, 'follow': True, 'stream': True}
+        if self.checkpoint.is_set():
+            params['since'] = float(checkpoint_since(self.checkpoint.timestamp))
+        elif self.follow_since is not None:
+            params['since'] = self.follow_since
+        else:
+            params['tail'] = self.tail
+            if self.since is not None:
+                params['since'] = time.time() - self.since
+
+        loop = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='docker_logs')
+        try:
+            try:
+                logs = await loop.run_in_executor(
+                    executor,
+                    functools.partial(self.docker_client.logs, self.container_name, **params)
+                )
+            except docker.errors.NotFound:
+                logging.error('Log error, container %s not found' % self.container_name)
+                return
+            try:
+                demuxer = DockerLogDemuxer(True)
+                checkpoint_filter = LogCheckpointFilter(self.checkpoint)
+                while True:
+                    chunk = await loop.run_in_executor(executor, next, logs, None)
+                    lines = checkpoint_filter.filter(demuxer.feed(chunk) if chunk is not None else demuxer.flush())
+                    if lines:
+                        await emit(self.container_name, lines)
+                    if chunk is None:
+                        return
+            finally:
+                logs.close()
+        finally:
+            executor.shutdown(wait=False)
+
+    async def __read_logs(self, params, is_tty, emit):
+        response = await http_get(
+            self.docker_host_url,
+            '/v%s/containers/%s/logs' % (self.api_version, self.container_name),
+            params,
+            self.ssl_context,
+        )
+        daemon_time = get_response_time(response)
+        try:
+            if response.status != 200:
+                logging.error('Log error for %s: http %d' % (self.container_name, response.status))
+                return daemon_time
+            is_follow = 'follow' in params
+            backlog = []
+            demuxer = DockerLogDemuxer(is_tty)
+            checkpoint_filter = LogCheckpointFilter(self.checkpoint)
+            async for chunk in response.iter_chunks():
+                lines = checkpoint_filter.filter(demuxer.feed(chunk))
+                if not is_follow:
+                    backlog.extend(lines)
+                elif lines:
+                    await emit(self.container_name, lines)
+            backlog.extend(checkpoint_filter.filter(demuxer.flush()))
+            if backlog:
+                await emit(self.container_name, backlog, backlog=not is_follow)
+        finally:
+            response.close()
+        return daemon_time
+
+
+def get_response_time(response) -> int:
+    try:
+        return int(parsedate_to_datetime(response.headers['date']).timestamp())
+    except (KeyError, TypeError, ValueError):
+        return int(time.time())
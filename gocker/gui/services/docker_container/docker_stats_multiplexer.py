@@ -0,0 +1,197 @@
+import asyncio
+import logging
+from threading import Lock, RLock
+from typing import Dict, Set
+
+import docker
+from dependency_injector.wiring import Provide, inject
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.services.async_http import UnsupportedHostUrlError, get_host_ssl_context, http_get
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_containers_metrics import update_container_metric
+from gocker.gui.services.docker_container.metrics_collector import MetricsCollectorThread
+from gocker.threads import StoppableThread
+
+SAMPLES_PER_TURN = 5
+RECONNECT_DELAY = 1
+
+
+# pylint: disable=too-many-instance-attributes
+class DockerStatsMultiplexerThread(MetricsCollectorThread):
+    """
+    Drives the stats streams of every running container from a single asyncio loop.
+    At most `max_connections` streams are opened at the same time, when more containers
+    are waiting for a connection, each stream gives its slot back after SAMPLES_PER_TURN samples.
+    Containers the scheduler puts in slow mode are not streamed, they get a single sample
+    every slow interval, or as soon as they become visible.
+    The loop never takes the draw lock, it keeps the last sample read of each container
+    and the metrics refresh applies them with `apply_samples`.
+    """
+
+    @inject
+    def __init__(
+            self,
+            docker_host_url: str = Provide[Container.config.docker.host_url],
+            docker_client: docker.APIClient = Provide[Container.docker_client],
+            draw_lock: RLock = Provide[Container.draw_lock],
+            max_connections: int = Provide[Container.config.metrics.max_connections],
+    ):
+        super().__init__(draw_lock)
+        self.docker_host_url = docker_host_url
+        self.api_version = docker_client.api_version
+        self.ssl_context = get_host_ssl_context(docker_host_url, docker_client.verify, docker_client.cert)
+        self.max_connections = max_connections
+        self.loop = asyncio.new_event_loop()
+        self.semaphore = None
+        self.waiting_count = 0
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.wake_events: Dict[str, asyncio.Event] = {}
+        self.samples_lock = Lock()
+        self.samples: Dict[str, dict] = {}
+        self.invalid_sample_container_ids: Set[str] = set()
+        self.is_host_unsupported = False
+
+    def add_container(self, metrics: DockerContainerMetric):
+        super().add_container(metrics)
+        self.loop.call_soon_threadsafe(self.__start_collect, metrics.container_id)
+
+    def remove_container(self, container_id):
+        super().remove_container(container_id)
+        self.invalid_sample_container_ids.discard(container_id)
+        self.loop.call_soon_threadsafe(self.__stop_collect, container_id)
+
+    def apply_samples(self):
+        with self.samples_lock:
+            samples, self.samples = self.samples, {}
+        for container_id, stat in samples.items():
+            if container_id not in self.metrics:
+                continue
+            try:
+                update_container_metric(self.metrics[container_id], stat)
+            except (KeyError, TypeError, ValueError):
+                if container_id not in self.invalid_sample_container_ids:
+                    self.invalid_sample_container_ids.add(container_id)
+                    logging.warning('Unexpected stats sample for %s' % container_id, exc_info=True)
+
+    def set_visible_containers(self, container_ids: Set[str]) -> Set[str]:
+        newly_visible_container_ids = super().set_visible_containers(container_ids)
+        for container_id in newly_visible_container_ids:
+            self.loop.call_soon_threadsafe(self.__wake, container_id)
+        return newly_visible_container_ids
+
+    def stop(self):
+        StoppableThread.stop(self)
+        self.loop.call_soon_threadsafe(self.__stop_loop)
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.semaphore = asyncio.Semaphore(self.max_connections)
+        try:
+            self.loop.run_forever()
+            self.loop.run_until_complete(asyncio.gather(*self.tasks.values(), return_exceptions=True))
+        finally:
+            self.loop.close()
+
+    def __stop_loop(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.loop.stop()
+
+    def __start_collect(self, container_id):
+        if container_id in self.tasks or self.is_stopped() or self.is_host_unsupported:
+            return
+        self.wake_events[container_id] = asyncio.Event()
+        self.tasks[container_id] = self.loop.create_task(self.__collect(container_id))
+
+    def __stop_collect(self, container_id):
+        if container_id not in self.tasks:
+            return
+        self.tasks.pop(container_id).cancel()
+        self.wake_events.pop(container_id, None)
+
+    def __wake(self, container_id):
+        if container_id in self.wake_events:
+            self.wake_events[container_id].set()
+
+    def __is_fast(self, container_id):
+        metrics = self.metrics.get(container_id)
+        return metrics is not None and self.scheduler.is_fast(metrics)
+
+    async def __collect(self, container_id):
+        while container_id in self.metrics:
+            self.waiting_count += 1
+            try:
+                await self.semaphore.acquire()
+            finally:
+                self.waiting_count -= 1
+            try:
+                if self.__is_fast(container_id):
+                    await self.__read_stats(container_id)
+                else:
+                    await self.__read_stats_once(container_id)
+            except UnsupportedHostUrlError as error:
+                if not self.is_host_unsupported:
+                    self.is_host_unsupported = True
+                    logging.error('Stats stream error: %s' % error)
+                return
+            except (OSError, ValueError, asyncio.IncompleteReadError):
+                logging.debug('Stats stream error for %s' % container_id, exc_info=True)
+            finally:
+                self.semaphore.release()
+
+            if container_id in self.metrics and not self.__is_fast(container_id):
+                await self.__wait_next_sample(container_id)
+                continue
+            await asyncio.sleep(0 if self.waiting_count > 0 else RECONNECT_DELAY)
+
+    async def __wait_next_sample(self, container_id):
+        wake_event = self.wake_events[container_id]
+        try:
+            await asyncio.wait_for(wake_event.wait(), timeout=self.scheduler.slow_interval)
+        except asyncio.TimeoutError:
+            pass
+        wake_event.clear()
+
+    async def __read_stats(self, container_id):
+        response = await http_get(
+            self.docker_host_url,
+            '/v%s/containers/%s/stats' % (self.api_version, container_id),
+            {'stream': 1},
+            self.ssl_context,
+        )
+        try:
+            if response.status != 200:
+                return
+            samples = 0
+            async for stat in response.iter_json():
+                if container_id not in self.metrics:
+                    return
+                self.__keep_sample(container_id, stat)
+                samples += 1
+                if samples >= SAMPLES_PER_TURN and self.waiting_count > 0:
+                    return
+                if not self.__is_fast(container_id):
+                    return
+        finally:
+            response.close()
+
+    async def __read_stats_once(self, container_id):
+        response = await http_get(
+            self.docker_host_url,
+            '/v%s/containers/%s/stats' % (self.api_version, container_id),
+            {'stream': 0},
+            self.ssl_context,
+        )
+        try:
+            if response.status != 200:
+                return
+            async for stat in response.iter_json():
+                self.__keep_sample(container_id, stat)
+                return
+        finally:
+            response.close()
+
+    def __keep_sample(self, container_id, stat):
+        with self.samples_lock:
+            self.samples[container_id] = stat
@@ -0,0 +1,124 @@
+import logging
+import math
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from threading import Event, RLock
+from typing import Dict, Optional, Set, Tuple
+
+import docker
+import requests
+from dependency_injector.wiring import Provide, inject
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.services.docker_container.docker_containers_metrics import calculate_block_bytes, \
+    calculate_cpu_percentage, calculate_memory_usage, calculate_network_bytes, next_container_metric
+from gocker.gui.services.docker_container.metrics_collector import MetricsCollectorThread
+
+TICK_INTERVAL = 1.0
+TICK_DEADLINE = 0.5
+ONE_SHOT_MINIMUM_API_VERSION = '1.41'
+
+
+class DockerStatsPollerThread(MetricsCollectorThread):
+    """
+    Polls a single stats sample of every due container on a shared tick, through a pool of
+    `max_connections` workers. The samples completed within `TICK_DEADLINE` of the tick are applied
+    together in one locked pass, with the tick timestamp, and the pass wakes up the metrics refresh.
+    A sample completing later (a slow daemon, or a `stream=False` request without one-shot, api < 1.41)
+    is applied on the pass of the following tick, with that tick timestamp.
+    A container is not polled again while its previous request is still running, so requests never pile up.
+    Cpu percentages are computed against the previous sample gocker read itself.
+    """
+
+    @inject
+    def __init__(
+            self,
+            docker_host_url: str = Provide[Container.config.docker.host_url],
+            docker_client: docker.APIClient = Provide[Container.docker_client],
+            draw_lock: RLock = Provide[Container.draw_lock],
+            max_connections: int = Provide[Container.config.metrics.max_connections],
+    ):
+        super().__init__(draw_lock)
+        self.docker_client = docker.APIClient(
+            base_url=docker_host_url,
+            version=docker_client.api_version,
+            max_pool_size=max_connections,
+        )
+        self.one_shot = True if docker.utils.version_gte(
+            docker_client.api_version,
+            ONE_SHOT_MINIMUM_API_VERSION
+        ) else None
+        self.executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='stats_poller')
+        self.previous_cpu_stats: Dict[str, dict] = {}
+        self.pending_container_ids: Set[str] = set()
+        self.in_flight: Dict[Future, Tuple[str, float]] = {}
+        self.refreshed = Event()
+
+    def remove_container(self, container_id):
+        with self.lock:
+            super().remove_container(container_id)
+            self.previous_cpu_stats.pop(container_id, None)
+
+    def run(self):
+        try:
+            while not self.is_stopped():
+                tick = (math.floor(time.time() / TICK_INTERVAL) + 1) * TICK_INTERVAL
+                time.sleep(max(0.0, tick - time.time()))
+                self.poll(tick)
+        finally:
+            self.executor.shutdown(wait=False)
+
+    def wait_refresh(self, timeout: float):
+        # the refresh follows the poll passes, the timeout only keeps it going if the poller stalls
+        if self.refreshed.wait(timeout + TICK_INTERVAL):
+            self.refreshed.clear()
+
+    def poll(self, tick: float, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            container_ids = [
+                metrics.container_id for metrics in self.metrics.values()
+                if metrics.container_id not in self.pending_container_ids and self.scheduler.is_due(metrics, now)
+            ]
+            self.pending_container_ids.update(container_ids)
+        for container_id in container_ids:
+            self.in_flight[self.executor.submit(self.__read_stats, container_id)] = (container_id, now)
+        wait(list(self.in_flight), timeout=max(0.0, tick + TICK_DEADLINE - time.time()))
+
+        completed = [future for future in self.in_flight if future.done()]
+        with self.lock:
+            for future in completed:
+                container_id, requested_at = self.in_flight.pop(future)
+                self.pending_container_ids.discard(container_id)
+                self.__apply(container_id, tick, requested_at, future)
+        self.refreshed.set()
+
+    def __apply(self, container_id: str, tick: float, requested_at: float, future: Future):
+        if future.cancelled() or future.result() is None or container_id not in self.metrics:
+            return
+        self.__update(self.metrics[container_id], future.result(), tick * 1000)
+        self.scheduler.mark_sampled(self.metrics[container_id], requested_at)
+
+    def __read_stats(self, container_id):
+        try:
+            return self.docker_client.stats(container_id, stream=False, one_shot=self.one_shot)
+        except (docker.errors.APIError, requests.RequestException):
+            logging.debug('Stats poll error for %s' % container_id, exc_info=True)
+            return None
+
+    def __update(self, metrics, stat, time_read):
+        previous_cpu_stats = self.previous_cpu_stats.get(metrics.container_id)
+        self.previous_cpu_stats[metrics.container_id] = stat['cpu_stats']
+        cpu_percentage = None
+        if previous_cpu_stats is not None and 'system_cpu_usage' in previous_cpu_stats:
+            stat['precpu_stats'] = previous_cpu_stats
+            cpu_percentage = calculate_cpu_percentage(stat, time_read - metrics.time_read)
+
+        next_container_metric(
+            metrics,
+            time_read,
+            cpu_percentage,
+            calculate_memory_usage(stat),
+            *calculate_network_bytes(stat),
+            *calculate_block_bytes(stat),
+        )
@@ -0,0 +1,40 @@
+import time
+from threading import RLock
+from typing import Dict, Set
+
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.metrics_sampling import MetricsSamplingScheduler
+from gocker.threads import StoppableThread
+
+
+class MetricsCollectorThread(StoppableThread):
+    def __init__(self, draw_lock: RLock):
+        super().__init__(name=self.__class__.__name__)
+        self.lock = draw_lock
+        self.scheduler = MetricsSamplingScheduler()
+        self.metrics: Dict[str, DockerContainerMetric] = {}
+
+    def add_container(self, metrics: DockerContainerMetric):
+        with self.lock:
+            self.metrics[metrics.container_id] = metrics
+
+    def remove_container(self, container_id):
+        with self.lock:
+            self.metrics.pop(container_id, None)
+            self.scheduler.forget(container_id)
+
+    def get_container_metrics(self, container_id):
+        return self.metrics.get(container_id)
+
+    def get_all_metrics(self):
+        return list(self.metrics.values())
+
+    def apply_samples(self):
+        pass
+
+    def wait_refresh(self, timeout: float):
+        time.sleep(timeout)
+
+    def set_visible_containers(self, container_ids: Set[str]) -> Set[str]:
+        with self.lock:
+            return self.scheduler.set_visible_containers(container_ids)
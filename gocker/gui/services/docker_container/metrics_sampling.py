@@ -0,0 +1,58 @@
+import time
+from typing import Dict, Optional, Set
+
+from dependency_injector.wiring import Provide, inject
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+
+FAST_INTERVAL = 1.0
+
+
+class MetricsSamplingScheduler:
+    """
+    Visible or busy containers are sampled every FAST_INTERVAL seconds,
+    hidden and idle ones only every `slow_interval` seconds.
+    """
+
+    @inject
+    def __init__(
+            self,
+            slow_interval: float = Provide[Container.config.metrics.slow_interval],
+            busy_threshold: float = Provide[Container.config.metrics.busy_threshold],
+    ):
+        self.slow_interval = slow_interval
+        self.busy_threshold = busy_threshold
+        self.visible_container_ids: Optional[Set[str]] = None
+        self.next_sample_times: Dict[str, float] = {}
+
+    def set_visible_containers(self, container_ids: Set[str]) -> Set[str]:
+        previous_container_ids = self.visible_container_ids or set()
+        self.visible_container_ids = set(container_ids)
+        newly_visible_container_ids = self.visible_container_ids - previous_container_ids
+        for container_id in newly_visible_container_ids:
+            self.next_sample_times.pop(container_id, None)
+        return newly_visible_container_ids
+
+    def is_visible(self, container_id: str):
+        return self.visible_container_ids is None or container_id in self.visible_container_ids
+
+    def is_busy(self, metrics: DockerContainerMetric):
+        return metrics.cpu_percentage is not None and metrics.cpu_percentage >= self.busy_threshold
+
+    def is_fast(self, metrics: DockerContainerMetric):
+        return self.is_visible(metrics.container_id) or self.is_busy(metrics)
+
+    def get_interval(self, metrics: DockerContainerMetric):
+        return FAST_INTERVAL if self.is_fast(metrics) else self.slow_interval
+
+    def is_due(self, metrics: DockerContainerMetric, now: float = None):
+        now = time.monotonic() if now is None else now
+        return now >= self.next_sample_times.get(metrics.container_id, 0)
+
+    def mark_sampled(self, metrics: DockerContainerMetric, now: float = None):
+        now = time.monotonic() if now is None else now
+        self.next_sample_times[metrics.container_id] = now + self.get_interval(metrics)
+
+    def forget(self, container_id: str):
+        self.next_sample_times.pop(container_id, None)
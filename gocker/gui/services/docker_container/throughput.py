@@ -0,0 +1,56 @@
+from typing import Dict, List, Tuple
+
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+
+THROUGHPUT_COUNTERS = [
+    ('network_rx_bytes', 'network_rx_rate'),
+    ('network_tx_bytes', 'network_tx_rate'),
+    ('block_read_bytes', 'block_read_rate'),
+    ('block_write_bytes', 'block_write_rate'),
+]
+
+
+def calculate_rate(current, previous, interval):
+    if current is None or previous is None or current < previous:
+        return None
+    return (current - previous) / interval
+
+
+class ThroughputRates:
+    """
+    Turns the cumulative network and block io counters of the metric records
+    into per second rates, in one pass over all the containers per collector tick.
+    """
+
+    def __init__(self):
+        self.previous_samples: Dict[str, Tuple] = {}
+
+    def update(self, metric_list: List[DockerContainerMetric]):
+        samples = {}
+        for metrics in metric_list:
+            sample = (metrics.time_read,) + tuple(getattr(metrics, counter) for counter, _ in THROUGHPUT_COUNTERS)
+            previous_sample = self.previous_samples.get(metrics.container_id)
+            if previous_sample is not None and previous_sample[0] == sample[0]:
+                samples[metrics.container_id] = previous_sample
+                continue
+            samples[metrics.container_id] = sample
+            if previous_sample is None:
+                continue
+            self.__set_rates(metrics, sample, previous_sample)
+        self.previous_samples = samples
+
+    @staticmethod
+    def __set_rates(metrics: DockerContainerMetric, sample, previous_sample):
+        interval = (sample[0] - previous_sample[0]) / 1000
+        if interval <= 0:
+            return
+        is_changed = False
+        for index, (_, rate_name) in enumerate(THROUGHPUT_COUNTERS):
+            rate = calculate_rate(sample[index + 1], previous_sample[index + 1], interval)
+            if rate is None and getattr(metrics, rate_name) is None:
+                continue
+            if rate is None or getattr(metrics, rate_name) is None or int(rate) != int(getattr(metrics, rate_name)):
+                is_changed = True
+            setattr(metrics, rate_name, rate)
+        if is_changed:
+            metrics.version += 1
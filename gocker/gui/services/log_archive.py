@@ -0,0 +1,177 @@
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import List, Optional, Tuple
+
+from dependency_injector.wiring import Provide, inject
+from event_bus import EventBus
+
+from gocker.gui.bus import listener, set_listeners
+from gocker.gui.dependency_injection import Container
+from gocker.gui.events import LogLinesIngestedEvent
+from gocker.gui.services.log_buffer import LogLine
+from gocker.threads import StoppableThread
+
+ARCHIVE_QUEUE_SIZE = 1000
+ARCHIVE_POLL_INTERVAL = 0.5
+ARCHIVE_FLUSH_INTERVAL = 5.0
+ARCHIVE_CLOSE_TIMEOUT = 5.0
+ARCHIVE_RETRY_INTERVAL = 30.0
+ARCHIVE_BUFFER_SIZE = 1024 * 1024
+SEGMENT_PREFIX = 'gocker-logs-'
+SEGMENT_SUFFIX = '.jsonl.gz'
+
+
+def format_archive_lines(receive_time: float, context: str, lines: List[LogLine]) -> str:
+    return ''.join(
+        json.dumps({
+            'time': receive_time,
+            'timestamp': timestamp,
+            'container': context,
+            'stream': stream,
+            'line': line,
+        }) + '\n' for stream, line, timestamp in lines
+    )
+
+
+# pylint: disable=too-many-instance-attributes
+class LogArchiveThread(StoppableThread):
+    """
+    Appends every log line read by the log multiplexer, before the overflow policy of its buffer drops or
+    samples it, as a json line with its container, stream, timestamp and receive time,
+    to gzip segment files of `directory` (readable with zcat).
+    The bus listener only queues the lines, a full queue drops them instead of blocking the
+    log multiplexer. Segments are rotated when their compressed size reaches `segment_size` bytes,
+    when a segment is opened the oldest ones are removed so that all of them stay under `retention` bytes.
+    A write error is logged and the archive is retried every ARCHIVE_RETRY_INTERVAL seconds,
+    the lines received meanwhile wait in the queue until it is full.
+    """
+
+    @inject
+    def __init__(
+            self,
+            directory: Optional[str] = Provide[Container.config.logs.archive_dir],
+            segment_size: int = Provide[Container.config.logs.archive_segment_size],
+            retention: int = Provide[Container.config.logs.archive_retention],
+            bus: EventBus = Provide[Container.bus],
+    ):
+        super().__init__(name=self.__class__.__name__)
+        self.directory = directory
+        self.segment_size = segment_size
+        self.retention = retention
+        self.batches: queue.Queue = queue.Queue(ARCHIVE_QUEUE_SIZE)
+        self.dropped = 0
+        self.segment_index = 0
+        self.segment_file = None
+        self.segment = None
+        self.closed = threading.Event()
+        set_listeners(self, bus)
+
+    @listener
+    def log_lines_ingested_event_listener(self, event: LogLinesIngestedEvent):
+        if self.directory is None:
+            return
+        try:
+            self.batches.put_nowait((time.time(), event.context, event.lines))
+        except queue.Full:
+            self.dropped += len(event.lines)
+
+    def start(self):
+        if self.directory is None:
+            return
+        super().start()
+
+    def stop(self):
+        StoppableThread.stop(self)
+        if self.directory is not None:
+            self.closed.wait(ARCHIVE_CLOSE_TIMEOUT)
+
+    def run(self):
+        try:
+            while not self.is_stopped():
+                try:
+                    self.__archive()
+                except OSError as error:
+                    logging.error('Log archive error in %s: %s, retrying in %d seconds' % (
+                        self.directory,
+                        error,
+                        ARCHIVE_RETRY_INTERVAL,
+                    ))
+                    self.__close_segment()
+                    self._stop.wait(ARCHIVE_RETRY_INTERVAL)
+        finally:
+            self.__close_segment()
+            self.closed.set()
+
+    def __archive(self):
+        os.makedirs(self.directory, exist_ok=True)
+        next_flush = time.monotonic() + ARCHIVE_FLUSH_INTERVAL
+        while not self.is_stopped():
+            self.__write(self.__get_batches(ARCHIVE_POLL_INTERVAL))
+            if self.segment is not None and time.monotonic() >= next_flush:
+                self.segment.flush()
+                next_flush = time.monotonic() + ARCHIVE_FLUSH_INTERVAL
+        self.__write(self.__get_batches(None))
+
+    def __get_batches(self, timeout: Optional[float]) -> List[Tuple[float, str, List[LogLine]]]:
+        batches = []
+        try:
+            if timeout is not None:
+                batches.append(self.batches.get(timeout=timeout))
+            while True:
+                batches.append(self.batches.get_nowait())
+        except queue.Empty:
+            pass
+        return batches
+
+    def __write(self, batches: List[Tuple[float, str, List[LogLine]]]):
+        for receive_time, context, lines in batches:
+            if self.segment is None:
+                self.__open_segment()
+            self.segment.write(format_archive_lines(receive_time, context, lines).encode('utf-8'))
+            if self.segment_file.tell() >= self.segment_size:
+                self.__close_segment()
+        if self.dropped > 0:
+            logging.warning('Log archive is late, %d lines not archived' % self.dropped)
+            self.dropped = 0
+
+    def __open_segment(self):
+        self.segment_index += 1
+        path = os.path.join(self.directory, '%s%s-%06d%s' % (
+            SEGMENT_PREFIX,
+            time.strftime('%Y%m%d-%H%M%S'),
+            self.segment_index,
+            SEGMENT_SUFFIX,
+        ))
+        self.segment_file = open(path, 'ab', buffering=ARCHIVE_BUFFER_SIZE)  # pylint: disable=consider-using-with
+        self.segment = gzip.GzipFile(filename='', mode='wb', fileobj=self.segment_file)
+        self.__apply_retention(os.path.basename(path))
+
+    def __close_segment(self):
+        if self.segment_file is None:
+            return
+        try:
+            if self.segment is not None:
+                self.segment.close()
+            self.segment_file.close()
+        except OSError as error:
+            logging.error('Log archive error in %s: %s' % (self.directory, error))
+        self.segment = None
+        self.segment_file = None
+
+    def __apply_retention(self, current_segment: str):
+        segments = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX) and name != current_segment
+        )
+        sizes = {name: os.path.getsize(os.path.join(self.directory, name)) for name in segments}
+        total_size = sum(sizes.values())
+        for name in segments:
+            if total_size + self.segment_size <= self.retention:
+                return
+            os.unlink(os.path.join(self.directory, name))
+            total_size -= sizes[name]
@@ -0,0 +1,110 @@
+import asyncio
+from collections import deque
+from typing import List, Optional, Tuple
+
+from gocker.arguments import LogOverflowPolicy
+from gocker.gui.services.log_rate import LogRateMeter
+
+MAX_SAMPLING = 1024
+
+# (stream name, line, epoch timestamp of the line if known)
+LogLine = Tuple[str, str, Optional[float]]
+
+
+# pylint: disable=too-many-instance-attributes
+class LogSourceBuffer:
+    """
+    Bounded queue of the lines read from one log stream and not yet sent to the ui.
+    """
+
+    def __init__(self, context: str, capacity: int, policy: str, flood_threshold: int = 0):
+        self.context = context
+        self.capacity = capacity
+        self.policy = policy
+        self.lines = deque()
+        self.accepted = 0
+        self.dropped = 0
+        self.sampling = 1
+        self.sample_index = 0
+        self.flood_threshold = flood_threshold
+        self.flood_sampling = 1
+        self.flood_index = 0
+        self.rate = LogRateMeter()
+        self.space_available = asyncio.Event()
+        self.space_available.set()
+
+    def __len__(self):
+        return len(self.lines)
+
+    def is_full(self):
+        return len(self.lines) >= self.capacity
+
+    async def put(self, lines: List[LogLine], backlog: bool = False):
+        self.accepted += len(lines)
+        if not backlog:
+            self.rate.add(len(lines), sum(len(item[1]) + 1 for item in lines))
+        if self.flood_threshold > 0 and not backlog:
+            lines = self.__sample_flood(lines)
+        if self.policy == LogOverflowPolicy.BLOCK:
+            await self.__put_blocking(lines)
+            return
+        if self.policy == LogOverflowPolicy.SAMPLE:
+            self.__put_sampled(lines)
+            return
+        self.__put_dropping_oldest(lines)
+
+    def pop(self, count: int) -> List[LogLine]:
+        count = min(count, len(self.lines))
+        lines = [self.lines.popleft() for _ in range(count)]
+        if not self.is_full():
+            self.space_available.set()
+        if len(self.lines) == 0:
+            self.sampling = 1
+        return lines
+
+    def get_sampling(self):
+        return max(self.sampling, self.flood_sampling)
+
+    def __sample_flood(self, lines: List[LogLine]) -> List[LogLine]:
+        lines_rate, _ = self.rate.rates()
+        self.flood_sampling = 1
+        while lines_rate > self.flood_threshold * self.flood_sampling and self.flood_sampling < MAX_SAMPLING:
+            self.flood_sampling *= 2
+        if self.flood_sampling == 1:
+            return lines
+        kept = lines[(-self.flood_index) % self.flood_sampling::self.flood_sampling]
+        self.flood_index += len(lines)
+        self.dropped += len(lines) - len(kept)
+        return kept
+
+    async def __put_blocking(self, lines: List[LogLine]):
+        while lines:
+            free = self.capacity - len(self.lines)
+            if free <= 0:
+                self.space_available.clear()
+                await self.space_available.wait()
+                continue
+            self.lines.extend(lines[:free])
+            lines = lines[free:]
+
+    def __put_dropping_oldest(self, lines: List[LogLine]):
+        self.lines.extend(lines)
+        overflow = len(self.lines) - self.capacity
+        if overflow <= 0:
+            return
+        for _ in range(overflow):
+            self.lines.popleft()
+        self.dropped += overflow
+
+    def __put_sampled(self, lines: List[LogLine]):
+        if self.is_full():
+            self.sampling = min(self.sampling * 2, MAX_SAMPLING)
+        for line in lines:
+            if self.is_full():
+                self.sample_index += 1
+                if self.sample_index % self.sampling != 0:
+                    self.dropped += 1
+                    continue
+                self.lines.popleft()
+                self.dropped += 1
+            self.lines.append(line)
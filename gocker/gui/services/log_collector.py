@@ -1,31 +1,44 @@
-from threading import Thread
+from typing import Dict, List
+
+from gocker.gui.services.log_multiplexer import LogMultiplexerThread, LogStream
 
 
 class LogsCollector:
-    def __init__(self, lock):
+    def __init__(self, lock, log_multiplexer: LogMultiplexerThread):
         self.lock = lock
-        self.log_threads = {}
+        self.log_multiplexer = log_multiplexer
+        self.log_streams: Dict[str, List[LogStream]] = {}
 
     def stop(self):
-        # pylint: disable=unused-variable
-        for thread_id, log_thread in self.log_threads.items():
-            log_thread.stop()
+        for key in list(self.log_streams):
+            self.remove_log(key)
+
+    def add_log_streams(self, key, streams: List[LogStream]):
+        with self.lock:
+            self.log_streams[key] = streams
+        for stream in streams:
+            self.log_multiplexer.add_stream(stream)
+
+    def add_log_stream(self, key, stream: LogStream):
+        """
+        Adds a stream to a logged key, the previous one is kept until it ends by itself.
+        """
+        with self.lock:
+            self.log_streams[key] = self.log_streams[key][-1:] + [stream]
+        self.log_multiplexer.add_stream(stream)
 
     def remove_log(self, key):
-        if key not in self.log_threads:
+        if key not in self.log_streams:
             return
 
         with self.lock:
-            if isinstance(self.log_threads[key], Thread):
-                self.log_threads[key].stop()
-            else:
-                self.log_threads[key][0].stop()
-                self.log_threads[key][1].stop()
-            del self.log_threads[key]
+            for stream in self.log_streams[key]:
+                self.log_multiplexer.remove_stream(stream.key)
+            del self.log_streams[key]
 
     def get_logged(self):
-        return self.log_threads.keys()
+        return self.log_streams.keys()
 
     def is_logged(self, key):
         # pylint: disable=consider-iterating-dictionary
-        return key in self.log_threads.keys()
+        return key in self.log_streams.keys()
@@ -0,0 +1,158 @@
+import itertools
+import re
+import threading
+from abc import ABC, abstractmethod
+from threading import RLock
+from typing import Callable, Iterator, List, Optional
+
+from dependency_injector.wiring import Provide, inject
+
+from gocker.data_structure.log_fields import LogFieldCondition, parse_field_query
+from gocker.data_structure.log_store import LogStore
+from gocker.gui.dependency_injection import Container
+from gocker.threads import StoppableThread
+
+LOG_FILTER_STEP_SIZE = 2000
+LOG_FILTER_POLL_INTERVAL = 0.5
+LOG_FIELD_QUERY_PREFIX = ':'
+
+
+class LogFilter(ABC):
+    @abstractmethod
+    def get_candidate_ranges(self, store: LogStore) -> List[range]:
+        pass
+
+    @abstractmethod
+    def match(self, store: LogStore, positions: List[int]) -> List[int]:
+        pass
+
+
+class LogRegexFilter(LogFilter):
+    """
+    Entries whose `context text` matches a regex, pre-filtered with the trigram index of the store.
+    """
+
+    def __init__(self, pattern: re.Pattern):
+        self.pattern = pattern
+
+    def get_candidate_ranges(self, store: LogStore) -> List[range]:
+        return store.get_candidate_ranges(self.pattern)
+
+    def match(self, store: LogStore, positions: List[int]) -> List[int]:
+        return [
+            position for position in positions
+            if position in store and self.pattern.search(store.get_search_text(position))
+        ]
+
+
+class LogFieldFilter(LogFilter):
+    """
+    Entries whose json fields match all the conditions, evaluated on the field columns of the store.
+    """
+
+    def __init__(self, conditions: List[LogFieldCondition]):
+        self.conditions = conditions
+
+    def get_candidate_ranges(self, store: LogStore) -> List[range]:
+        return store.get_field_candidate_ranges(self.conditions)
+
+    def match(self, store: LogStore, positions: List[int]) -> List[int]:
+        return store.match_fields(self.conditions, positions)
+
+
+def parse_log_filter(text: str, fields: List[str]) -> Optional[LogFilter]:
+    """
+    A field query when `text` starts with LOG_FIELD_QUERY_PREFIX followed by conditions on the extracted
+    json `fields` (`:level=error duration>500`), otherwise a case insensitive regex,
+    matched literally when it is not a valid regex.
+    """
+    if text == '':
+        return None
+    if text.startswith(LOG_FIELD_QUERY_PREFIX):
+        conditions = parse_field_query(text[len(LOG_FIELD_QUERY_PREFIX):], fields)
+        if conditions is not None:
+            return LogFieldFilter(conditions)
+    try:
+        return LogRegexFilter(re.compile(text, re.IGNORECASE))
+    except re.error:
+        return LogRegexFilter(re.compile(re.escape(text), re.IGNORECASE))
+
+
+# pylint: disable=too-many-instance-attributes
+class LogFilterThread(StoppableThread):
+    """
+    Applies the log pane filter out of the urwid main loop.
+    `apply` cancels the running scan and starts a new one over the entries of the store, the candidates given
+    by the filter (trigram index or field columns) are checked LOG_FILTER_STEP_SIZE at a time, each step
+    holding the draw lock, and its matches are handed to `on_matches` along with the progress of the scan
+    (1.0 once done).
+    The positions of the entries added or folded meanwhile are queued with `add_positions` and matched once
+    the scan is done, so that live matches keep flowing while the filter is set.
+    """
+
+    @inject
+    def __init__(
+            self,
+            store: LogStore,
+            on_matches: Callable[[List[int], float], None],
+            draw_lock: RLock = Provide[Container.draw_lock],
+    ):
+        super().__init__(name=self.__class__.__name__)
+        self.store = store
+        self.on_matches = on_matches
+        self.draw_lock = draw_lock
+        self.log_filter: Optional[LogFilter] = None
+        self.candidates: Iterator[int] = iter(())
+        self.candidates_count = 0
+        self.scanned = 0
+        self.pending: List[int] = []
+        self.wake = threading.Event()
+
+    def apply(self, log_filter: Optional[LogFilter]):
+        with self.draw_lock:
+            self.log_filter = log_filter
+            self.pending = []
+            ranges = log_filter.get_candidate_ranges(self.store) if log_filter is not None else []
+            self.candidates = itertools.chain.from_iterable(ranges)
+            self.candidates_count = sum(len(candidates) for candidates in ranges)
+            self.scanned = 0
+        self.wake.set()
+
+    def add_positions(self, positions: List[int]):
+        with self.draw_lock:
+            if self.log_filter is None:
+                return
+            self.pending.extend(positions)
+        self.wake.set()
+
+    def is_scanning(self):
+        return self.log_filter is not None and self.scanned < self.candidates_count
+
+    def stop(self):
+        StoppableThread.stop(self)
+        self.wake.set()
+
+    def run(self):
+        while not self.is_stopped():
+            self.wake.wait(LOG_FILTER_POLL_INTERVAL)
+            self.wake.clear()
+            while not self.is_stopped() and self.__step():
+                pass
+
+    def __step(self) -> bool:
+        with self.draw_lock:
+            if self.log_filter is None:
+                return False
+            if self.is_scanning():
+                positions = list(itertools.islice(self.candidates, LOG_FILTER_STEP_SIZE))
+                self.scanned = self.candidates_count if len(positions) == 0 else self.scanned + len(positions)
+            else:
+                positions = self.pending[:LOG_FILTER_STEP_SIZE]
+                del self.pending[:LOG_FILTER_STEP_SIZE]
+            if len(positions) == 0:
+                return False
+            self.on_matches(
+                self.log_filter.match(self.store, positions),
+                self.scanned / self.candidates_count if self.is_scanning() else 1.0,
+            )
+            return True
@@ -0,0 +1,43 @@
+import re
+from typing import Dict, Optional
+
+LOG_GROUP_MAX_LINES = 1000
+PYTHON_TRACEBACK_START = 'Traceback '
+
+
+class LogLineGrouper:
+    """
+    Tells, line by line, if a log line continues the previous line of the same stream (stack trace frames,
+    wrapped messages...), in constant time per line.
+    With a `start_pattern`, every line that does not match it continues the previous one (e.g. a leading
+    timestamp), otherwise the lines matching `continuation_pattern` do (e.g. indentation). The exception line
+    that ends a python traceback is kept in the traceback. A group is closed after LOG_GROUP_MAX_LINES lines.
+    """
+
+    def __init__(self, start_pattern: Optional[str], continuation_pattern: Optional[str]):
+        self.start_pattern = re.compile(start_pattern) if start_pattern else None
+        self.continuation_pattern = re.compile(continuation_pattern) if continuation_pattern else None
+        self.group_sizes: Dict[str, int] = {}
+        self.python_tracebacks: Dict[str, bool] = {}
+
+    def is_enabled(self):
+        return self.start_pattern is not None or self.continuation_pattern is not None
+
+    def is_continuation(self, stream: str, line: str) -> bool:
+        group_size = self.group_sizes.get(stream, 0)
+        python_traceback = self.python_tracebacks.get(stream, False)
+        if self.start_pattern is not None:
+            continuation = self.start_pattern.match(line) is None
+        else:
+            continuation = self.continuation_pattern.match(line) is not None
+            if python_traceback and not continuation and line:
+                continuation = True
+                python_traceback = False
+
+        if not continuation or group_size == 0 or group_size >= LOG_GROUP_MAX_LINES:
+            self.group_sizes[stream] = 1
+            self.python_tracebacks[stream] = line.startswith(PYTHON_TRACEBACK_START)
+            return False
+        self.group_sizes[stream] = group_size + 1
+        self.python_tracebacks[stream] = python_traceback
+        return True
@@ -0,0 +1,215 @@
+import asyncio
+import functools
+import heapq
+import itertools
+import logging
+import time
+from abc import ABC, abstractmethod
+from threading import RLock
+from typing import Awaitable, Callable, Dict, List
+
+from dependency_injector.wiring import Provide, inject
+from event_bus import EventBus
+
+from gocker.data_structure.log_fields import LogFieldExtractor
+from gocker.gui.dependency_injection import Container
+from gocker.gui.events import LogBatchReceivedEvent, LogReceivedEvent, LogCountersEvent, LogLinesIngestedEvent
+from gocker.gui.services.async_http import UnsupportedHostUrlError
+from gocker.gui.services.log_buffer import LogLine, LogSourceBuffer
+from gocker.gui.services.log_grouper import LogLineGrouper
+from gocker.threads import StoppableThread
+
+LOG_BATCH_WINDOW = 0.05
+LOG_BATCH_MAX_SIZE = 5000
+LOG_COUNTERS_INTERVAL = 1.0
+
+
+class LogStream(ABC):
+    """
+    A raw log source read by the LogMultiplexerThread,
+    `read` awaits `emit` with the decoded (stream name, line, timestamp) tuples until the source is closed,
+    past lines read when the stream is attached are emitted with `backlog=True`.
+    """
+
+    def __init__(self, key: str, context: str):
+        self.key = key
+        self.context = context
+
+    @abstractmethod
+    async def read(self, emit: Callable[..., Awaitable[None]]):
+        pass
+
+
+# pylint: disable=too-many-instance-attributes
+class LogMultiplexerThread(StoppableThread):
+    """
+    Reads every log stream from a single asyncio loop and sends their lines to the ui in batches.
+    """
+
+    @inject
+    def __init__(
+            self,
+            bus: EventBus = Provide[Container.bus],
+            draw_lock: RLock = Provide[Container.draw_lock],
+            buffer_size: int = Provide[Container.config.logs.buffer_size],
+            overflow_policy: str = Provide[Container.config.logs.overflow_policy],
+            flood_threshold: int = Provide[Container.config.logs.flood_threshold],
+            reorder_window: float = Provide[Container.config.logs.reorder_window],
+            multiline_start: str = Provide[Container.config.logs.multiline_start],
+            multiline_continuation: str = Provide[Container.config.logs.multiline_continuation],
+            json_fields: List[str] = Provide[Container.config.logs.json_fields],
+    ):
+        super().__init__(name=self.__class__.__name__)
+        self.bus = bus
+        self.draw_lock = draw_lock
+        self.buffer_size = buffer_size
+        self.overflow_policy = overflow_policy
+        self.flood_threshold = flood_threshold
+        self.reorder_window = reorder_window
+        self.reorder_heap = []
+        self.reorder_sequence = itertools.count()
+        self.multiline_start = multiline_start
+        self.multiline_continuation = multiline_continuation
+        self.groupers: Dict[str, LogLineGrouper] = {}
+        self.field_extractor = LogFieldExtractor(json_fields)
+        self.loop = asyncio.new_event_loop()
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.buffers: Dict[str, LogSourceBuffer] = {}
+        self.flush_handle = None
+
+    def add_stream(self, stream: LogStream):
+        self.loop.call_soon_threadsafe(self.__start_stream, stream)
+
+    def remove_stream(self, key: str):
+        self.loop.call_soon_threadsafe(self.__stop_stream, key)
+
+    def stop(self):
+        StoppableThread.stop(self)
+        self.loop.call_soon_threadsafe(self.__stop_loop)
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.call_soon(self.__emit_counters)
+        try:
+            self.loop.run_forever()
+            self.loop.run_until_complete(asyncio.gather(*self.tasks.values(), return_exceptions=True))
+        finally:
+            self.loop.close()
+
+    async def __emit_lines(
+            self,
+            buffer: LogSourceBuffer,
+            context: str,
+            lines: List[LogLine],
+            backlog: bool = False,
+    ):
+        self.bus.emit(LogLinesIngestedEvent.__name__, LogLinesIngestedEvent(context, lines))
+        await buffer.put(lines, backlog)
+        self.__schedule_flush()
+
+    def __schedule_flush(self):
+        if self.flush_handle is None:
+            self.flush_handle = self.loop.call_later(LOG_BATCH_WINDOW, self.__flush)
+
+    def __flush(self):
+        self.flush_handle = None
+        logs = []
+        buffers = [(key, buffer) for key, buffer in self.buffers.items() if len(buffer) > 0]
+        while buffers and len(logs) < LOG_BATCH_MAX_SIZE:
+            share = max(1, (LOG_BATCH_MAX_SIZE - len(logs)) // len(buffers))
+            for key, buffer in buffers:
+                logs.extend(self.__get_events(key, buffer, buffer.pop(share)))
+            buffers = [(key, buffer) for key, buffer in buffers if len(buffer) > 0]
+        if self.reorder_window > 0:
+            logs = self.__reorder(logs)
+
+        for key in [key for key, buffer in self.buffers.items() if key not in self.tasks and len(buffer) == 0]:
+            del self.buffers[key]
+            self.groupers.pop(key, None)
+
+        if logs:
+            with self.draw_lock:
+                self.bus.emit(LogBatchReceivedEvent.__name__, LogBatchReceivedEvent(logs))
+
+        if buffers or self.reorder_heap:
+            self.__schedule_flush()
+
+    def __get_events(self, key: str, buffer: LogSourceBuffer, lines: List[LogLine]):
+        grouper = self.groupers[key]
+        if not grouper.is_enabled():
+            events = [LogReceivedEvent(buffer.context, line, stream, timestamp) for stream, line, timestamp in lines]
+        else:
+            events = [
+                LogReceivedEvent(buffer.context, line, stream, timestamp, grouper.is_continuation(stream, line))
+                for stream, line, timestamp in lines
+            ]
+        if self.field_extractor.is_enabled():
+            for event in events:
+                if not event.continuation:
+                    event.fields = self.field_extractor.extract(event.line)
+        return events
+
+    def __reorder(self, logs: List[LogReceivedEvent]) -> List[LogReceivedEvent]:
+        now = time.time()
+        for log in logs:
+            heapq.heappush(self.reorder_heap, (
+                now if log.timestamp is None else min(log.timestamp, now),
+                next(self.reorder_sequence),
+                log,
+            ))
+        ordered_logs = []
+        while self.reorder_heap and self.reorder_heap[0][0] <= now - self.reorder_window:
+            ordered_logs.append(heapq.heappop(self.reorder_heap)[2])
+        return ordered_logs
+
+    def __emit_counters(self):
+        counters = self.__get_counters()
+        with self.draw_lock:
+            self.bus.emit(LogCountersEvent.__name__, counters)
+        self.loop.call_later(LOG_COUNTERS_INTERVAL, self.__emit_counters)
+
+    def __get_counters(self):
+        event = LogCountersEvent({}, {}, {}, {}, {})
+        for buffer in self.buffers.values():
+            lines_rate, bytes_rate = buffer.rate.rates()
+            event.accepted[buffer.context] = event.accepted.get(buffer.context, 0) + buffer.accepted
+            event.dropped[buffer.context] = event.dropped.get(buffer.context, 0) + buffer.dropped
+            event.sampling[buffer.context] = max(event.sampling.get(buffer.context, 1), buffer.get_sampling())
+            event.lines_rate[buffer.context] = event.lines_rate.get(buffer.context, 0) + lines_rate
+            event.bytes_rate[buffer.context] = event.bytes_rate.get(buffer.context, 0) + bytes_rate
+        return event
+
+    def __stop_loop(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.loop.stop()
+
+    def __start_stream(self, stream: LogStream):
+        if stream.key in self.tasks or self.is_stopped():
+            return
+        self.buffers[stream.key] = LogSourceBuffer(
+            stream.context,
+            self.buffer_size,
+            self.overflow_policy,
+            self.flood_threshold,
+        )
+        self.groupers[stream.key] = LogLineGrouper(self.multiline_start, self.multiline_continuation)
+        self.tasks[stream.key] = self.loop.create_task(self.__read(stream, self.buffers[stream.key]))
+
+    def __stop_stream(self, key: str):
+        self.buffers.pop(key, None)
+        self.groupers.pop(key, None)
+        if key not in self.tasks:
+            return
+        self.tasks.pop(key).cancel()
+
+    async def __read(self, stream: LogStream, buffer: LogSourceBuffer):
+        try:
+            await stream.read(functools.partial(self.__emit_lines, buffer))
+        except UnsupportedHostUrlError as error:
+            logging.error('Log stream error for %s: %s' % (stream.key, error))
+        except (OSError, ValueError, asyncio.IncompleteReadError):
+            logging.debug('Log stream error for %s' % stream.key, exc_info=True)
+        finally:
+            if self.tasks.get(stream.key) is asyncio.current_task():
+                del self.tasks[stream.key]
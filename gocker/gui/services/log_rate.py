@@ -0,0 +1,39 @@
+import time
+from typing import Callable, Tuple
+
+LOG_RATE_WINDOW = 5
+
+
+class LogRateMeter:
+    """
+    Lines and bytes per second of a log stream over the last `window` seconds.
+    Counts are kept in one bucket per second, adding lines only touches the bucket of the current second.
+    """
+
+    def __init__(self, window: int = LOG_RATE_WINDOW, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.lines = [0] * window
+        self.bytes = [0] * window
+        self.second = int(clock())
+        self.start = self.second
+
+    def add(self, lines: int, size: int):
+        self.__rotate()
+        index = self.second % self.window
+        self.lines[index] += lines
+        self.bytes[index] += size
+
+    def rates(self) -> Tuple[float, float]:
+        self.__rotate()
+        duration = max(1, min(self.window, self.second - self.start + 1))
+        return sum(self.lines) / duration, sum(self.bytes) / duration
+
+    def __rotate(self):
+        second = int(self.clock())
+        if second == self.second:
+            return
+        for elapsed in range(self.second + 1, min(second, self.second + self.window) + 1):
+            self.lines[elapsed % self.window] = 0
+            self.bytes[elapsed % self.window] = 0
+        self.second = second
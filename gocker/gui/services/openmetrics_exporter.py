@@ -0,0 +1,110 @@
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+from dependency_injector.wiring import Provide, inject
+from event_bus import EventBus
+
+from gocker.gui.bus import listener, set_listeners
+from gocker.gui.dependency_injection import Container
+from gocker.gui.events import ContainerMetricsTickEvent
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.threads import StoppableThread
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# (family name, type, help, record attribute, scale)
+METRIC_FAMILIES = [
+    ('gocker_container_cpu_percent', 'gauge', 'Cpu usage, 100 is one full cpu', 'cpu_percentage', 1),
+    ('gocker_container_memory_usage_bytes', 'gauge', 'Memory usage', 'memory_usage', 1),
+    ('gocker_container_network_receive_bytes', 'counter', 'Bytes received on all interfaces',
+     'network_rx_bytes', 1),
+    ('gocker_container_network_transmit_bytes', 'counter', 'Bytes sent on all interfaces',
+     'network_tx_bytes', 1),
+    ('gocker_container_block_read_bytes', 'counter', 'Bytes read from block devices', 'block_read_bytes', 1),
+    ('gocker_container_block_write_bytes', 'counter', 'Bytes written to block devices', 'block_write_bytes', 1),
+    ('gocker_container_last_sample_timestamp_seconds', 'gauge', 'Time of the last sample', 'time_read', 0.001),
+]
+
+
+def escape_label_value(value: str):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_openmetrics(metric_list: List[DockerContainerMetric]) -> bytes:
+    metric_list = sorted(metric_list, key=lambda metrics: metrics.container_name)
+    labels = [
+        'id="%s",name="%s"' % (escape_label_value(metrics.container_id), escape_label_value(metrics.container_name))
+        for metrics in metric_list
+    ]
+    lines = []
+    for family_name, family_type, family_help, attribute, scale in METRIC_FAMILIES:
+        lines.append('# TYPE %s %s' % (family_name, family_type))
+        lines.append('# HELP %s %s.' % (family_name, family_help))
+        sample_name = family_name + '_total' if family_type == 'counter' else family_name
+        for metrics, label in zip(metric_list, labels):
+            value = getattr(metrics, attribute)
+            if value is None or (attribute == 'time_read' and value == 0):
+                continue
+            lines.append('%s{%s} %s' % (sample_name, label, repr(value * scale)))
+    lines.append('# EOF\n')
+    return '\n'.join(lines).encode('utf-8')
+
+
+class OpenMetricsExporter:
+    """
+    Serves the metrics of the containers in OpenMetrics text format.
+    The page is rendered once per collector tick, a scrape only sends the last rendered buffer.
+    """
+
+    @inject
+    def __init__(
+            self,
+            port: Optional[int] = Provide[Container.config.metrics.port],
+            address: str = Provide[Container.config.metrics.address],
+            bus: EventBus = Provide[Container.bus],
+    ):
+        self.port = port
+        self.address = address
+        self.buffer = render_openmetrics([])
+        self.server = None
+        self.server_thread = None
+        set_listeners(self, bus)
+
+    @listener
+    def container_metrics_tick_listener(self, event: ContainerMetricsTickEvent):
+        if self.server is None:
+            return
+        self.buffer = render_openmetrics(event.metrics)
+
+    def start(self):
+        if self.port is None:
+            return
+        exporter = self
+
+        class OpenMetricsRequestHandler(BaseHTTPRequestHandler):
+            def do_GET(self):  # pylint: disable=invalid-name
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                buffer = exporter.buffer
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(buffer)))
+                self.end_headers()
+                self.wfile.write(buffer)
+
+            def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+                logging.debug(format % args)
+
+        self.server = ThreadingHTTPServer((self.address, self.port), OpenMetricsRequestHandler)
+        self.server.daemon_threads = True
+        self.server_thread = StoppableThread(target=self.server.serve_forever, name=self.__class__.__name__)
+        self.server_thread.start()
+        logging.info('OpenMetrics exporter listening on %s:%d' % (self.address, self.port))
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
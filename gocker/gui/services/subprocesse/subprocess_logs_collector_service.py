@@ -1,20 +1,20 @@
+import codecs
+import time
 from threading import RLock
 
-import requests
-import urllib3
 from dependency_injector.wiring import inject, Provide
-from event_bus import EventBus
 
 from gocker.gui.dependency_injection import Container
-from gocker.gui.events import LogReceivedEvent
+from gocker.gui.services.async_http import http_get
+from gocker.gui.services.docker_container.docker_log_demux import MAX_PARTIAL_LINE_SIZE
 from gocker.gui.services.log_collector import LogsCollector
-from gocker.threads import StoppableThread
+from gocker.gui.services.log_multiplexer import LogMultiplexerThread, LogStream
 
 
 class SubprocessLogsCollectorService(LogsCollector):
     @inject
-    def __init__(self, lock: RLock = Provide[Container.draw_lock]):
-        super().__init__(lock)
+    def __init__(self, log_multiplexer: LogMultiplexerThread, lock: RLock = Provide[Container.draw_lock]):
+        super().__init__(lock, log_multiplexer)
 
     def toggle_log(self, key, supervisor_client_options, container_name, group_name):
         if self.is_logged(key):
@@ -23,66 +23,67 @@ class SubprocessLogsCollectorService(LogsCollector):
         self.add_log(key, supervisor_client_options, container_name, group_name)
 
     def add_log(self, key, supervisor_client_options, container_name, group_name):
-        if key in self.log_threads:
+        if key in self.log_streams:
             return
-        self.log_threads[key] = [
-            SupervisordSubprocessLogThread(
+        self.add_log_streams(key, [
+            SupervisordSubprocessLogStream(
                 supervisor_client_options,
                 container_name,
                 group_name,
                 'stdout'
             ),
-            SupervisordSubprocessLogThread(
+            SupervisordSubprocessLogStream(
                 supervisor_client_options,
                 container_name,
                 group_name,
                 'stderr'
             )
-        ]
-        self.log_threads[key][0].start()
-        self.log_threads[key][1].start()
+        ])
 
-    def stop(self):
-        for thread_id in list(self.log_threads):
-            self.log_threads[thread_id][0].stop()
-            self.log_threads[thread_id][1].stop()
-            del self.log_threads[thread_id]
 
-
-class SupervisordSubprocessLogThread(StoppableThread):
-    @inject
+class SupervisordSubprocessLogStream(LogStream):
     def __init__(
             self,
             supervisor_client_options: dict,
             container_name: str,
             group_name: str,
             stream: str,
-            bus: EventBus = Provide[Container.bus],
-            lock: RLock = Provide[Container.draw_lock],
     ):
-        super().__init__(name='%s-%s-%s' % (self.__class__.__name__, container_name, group_name))
-        self.bus = bus
+        super().__init__(
+            'supervisord-%s-%s-%s' % (container_name, group_name, stream),
+            '%s -%s' % (container_name, group_name),
+        )
         self.supervisor_client_options = supervisor_client_options
-        self.lock = lock
         self.container_name = container_name
         self.group_name = group_name
         self.stream = stream
-        url = '%s/logtail/%s/%s' % (self.supervisor_client_options['url'], self.group_name, stream)
-        self.request = requests.get(url, stream=True, timeout=20)
-        if self.request.encoding is None:
-            self.request.encoding = 'utf-8'
 
-    def run(self):
+    async def read(self, emit):
+        response = await http_get(
+            self.supervisor_client_options['url'],
+            '/logtail/%s/%s' % (self.group_name, self.stream),
+        )
         try:
-            for line in self.request.iter_lines(decode_unicode=True):
-                if self.is_stopped():
-                    return
-                with self.lock:
-                    self.bus.emit(LogReceivedEvent.__name__, LogReceivedEvent(
-                        '%s -%s' % (self.container_name, self.group_name),
-                        '[%s] %s' % (self.stream, line.rstrip()),
-                    ))
-        except urllib3.exceptions.ProtocolError:
-            return
-        except requests.ConnectionError:
-            return
+            if response.status != 200:
+                return
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            previous_chunk = ''
+            async for chunk in response.iter_chunks():
+                lines = (previous_chunk + decoder.decode(chunk)).split('\n')
+                previous_chunk = lines.pop()
+                if len(previous_chunk) > MAX_PARTIAL_LINE_SIZE:
+                    lines.append(previous_chunk)
+                    previous_chunk = ''
+                if lines:
+                    await self.__emit_lines(emit, lines)
+            previous_chunk += decoder.decode(b'', final=True)
+            if previous_chunk:
+                await self.__emit_lines(emit, [previous_chunk])
+        finally:
+            response.close()
+
+    async def __emit_lines(self, emit, lines):
+        receive_time = time.time()
+        await emit(self.context, [
+            (self.stream, '[%s] %s' % (self.stream, line.rstrip()), receive_time) for line in lines
+        ])
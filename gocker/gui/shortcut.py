@@ -16,6 +16,7 @@ shortcuts = {
     'KILL_CONTAINER': Shortcut('k', 'kill container', True),
     'TAG_CONTAINER': Shortcut(' ', 'tag container', True),
     'INSPECT_CONTAINER': Shortcut('i', 'inspect container', True),
+    'CONTAINER_METRICS': Shortcut('m', 'container metrics history', True),
     'CONTAINER_SHELL': Shortcut('s', 'shell in container', True),
     'SUBPROCESS_START_STOP': Shortcut('s', 'start/stop in subprocess', True),
     'SUBPROCESS_RESTART': Shortcut('r', 'restart in subprocess', True),
@@ -26,6 +27,7 @@ shortcuts = {
     'SHOW_LOG': Shortcut('l', 'show logs', True),
     'SHOW_ALL_LOG': Shortcut('L', 'show all logs', True),
     'LOG_MARKER': Shortcut('M', 'Add a marker in logs', True),
+    'TOGGLE_LOG_GROUP': Shortcut('enter', 'expand/collapse log entry', True, 'expand log'),
     'SELECT_NEXT_PANE': Shortcut('tab', 'select next pane', True, 'next'),
     'SELECT_PREVIOUS_PANE': Shortcut('shift tab', 'select previous pane', True, 'previous'),
 }
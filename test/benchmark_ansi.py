@@ -0,0 +1,62 @@
+"""
+Benchmark of the ANSI to urwid markup translation, run with `python -m test.benchmark_ansi`.
+
+`before` is the previous translation (a regex over the text, the codes of every segment parsed and a new
+AttrSpec built for each of them), `after` is translate_text_for_urwid.
+"""
+import re
+import time
+
+import urwid
+
+from gocker.gui.helpers.urwidhelper import bg_lookup, fg_lookup, translate_text_for_urwid
+
+LINES = 20000
+SAMPLES = {
+    'plain': '2021-03-04 05:06:07,123 INFO [main] request %d handled in 12 ms',
+    'levels': '\x1b[36m2021-03-04T05:06:07Z\x1b[0m \x1b[32mINFO\x1b[0m \x1b[1mrequest\x1b[0m id=%d status=\x1b[33m200\x1b[0m',
+    'compose': '\x1b[36mweb_1  |\x1b[0m \x1b[2m05:06:07\x1b[22m \x1b[1;31mERROR\x1b[0m failed to handle %d\x1b[K',
+    '256': '\x1b[38;5;244m05:06:07\x1b[0m \x1b[38;5;208;1mWARN\x1b[0m \x1b[38;5;39mhttp\x1b[39m slow query %d',
+    'truecolor': '\x1b[38;2;120;120;120m05:06:07\x1b[0m \x1b[48;2;200;0;0;38;2;255;255;255m FATAL \x1b[0m crash %d',
+}
+
+
+def translate_color_before(codes):
+    fgcolor, bgcolor = '', ''
+    for code in codes:
+        if code == 0:
+            fgcolor, bgcolor = '', ''
+        fgcolor = fg_lookup.get(code, fgcolor)
+        bgcolor = bg_lookup.get(code, bgcolor)
+    return fgcolor, bgcolor
+
+
+def translate_before(raw_text):
+    formated_text = []
+    if not raw_text.startswith('\x1b['):
+        raw_text = '\x1b[0m' + raw_text
+    for match in re.finditer(r'[\x1b\033]\[([\d;]+)m([^\x1b\033]+)', raw_text, re.DOTALL):
+        fgcolor, bgcolor = translate_color_before([int(code) for code in match.group(1).split(';')])
+        formated_text.append((urwid.AttrSpec(fgcolor, bgcolor), match.group(2)))
+    return formated_text
+
+
+def measure(translate, lines):
+    started = time.perf_counter()
+    for line in lines:
+        translate(line)
+    return (time.perf_counter() - started) / len(lines) * 1000000
+
+
+def main():
+    for sample, line in SAMPLES.items():
+        lines = [line % index for index in range(LINES)]
+        print('%-10s before %6.2f us/line  after %6.2f us/line' % (
+            sample,
+            measure(translate_before, lines),
+            measure(translate_text_for_urwid, lines),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Micro-benchmark of the docker log stream parsing, run with `python -m test.benchmark_log_demux`.
+
+`before` replays the previous implementation: bytes concatenation of the pending frames,
+a full decode of each chunk and string concatenation of the partial line,
+`after` is the DockerLogDemuxer.
+"""
+import struct
+import time
+
+from gocker.gui.services.docker_container.docker_log_demux import DockerLogDemuxer
+
+LINES = 200000
+CHUNK_SIZE = 16384
+
+
+def build_stream():
+    frames = []
+    for index in range(LINES):
+        payload = ('2024-01-01T00:00:00Z \x1b[32mINFO\x1b[0m request %d handled in 12ms é\n' % index).encode()
+        frames.append(struct.pack('>BxxxL', 1 if index % 5 else 2, len(payload)) + payload)
+    data = b''.join(frames)
+    return [data[offset:offset + CHUNK_SIZE] for offset in range(0, len(data), CHUNK_SIZE)]
+
+
+def previous_demux(chunks):
+    lines = []
+    buffer = b''
+    previous_chunk = ''
+    for chunk in chunks:
+        buffer += chunk
+        payloads = []
+        offset = 0
+        while len(buffer) - offset >= 8:
+            size = int.from_bytes(buffer[offset + 4:offset + 8], 'big')
+            if len(buffer) - offset - 8 < size:
+                break
+            payloads.append(buffer[offset + 8:offset + 8 + size])
+            offset += 8 + size
+        buffer = buffer[offset:]
+        text = previous_chunk + b''.join(payloads).decode('UTF-8', errors='replace').replace('\x1b', '\n')
+        previous_chunk = ''
+        for line in text.splitlines(keepends=True):
+            if line[-1] == '\n':
+                lines.append(line.rstrip())
+            else:
+                previous_chunk = line
+    return lines
+
+
+def demux(chunks):
+    demuxer = DockerLogDemuxer(False)
+    lines = []
+    for chunk in chunks:
+        lines.extend(demuxer.feed(chunk))
+    return lines
+
+
+def measure(name, function, chunks):
+    size = sum(len(chunk) for chunk in chunks)
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        function(chunks)
+        durations.append(time.perf_counter() - start)
+    duration = min(durations)
+    print('%-6s %8.0f klines/s %8.1f MB/s' % (name, LINES / duration / 1000, size / duration / 1000000))
+
+
+def main():
+    chunks = build_stream()
+    measure('before', previous_demux, chunks)
+    measure('after', demux, chunks)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark of the log pane field queries, run with `python -m test.benchmark_log_fields`.
+
+`reparse` decodes the json of every entry to evaluate the query, `columns` evaluates it on the field
+columns extracted when the lines were received.
+"""
+import json
+import time
+
+from gocker.data_structure.log_fields import LogFieldExtractor
+from gocker.data_structure.log_store import LogStore
+from gocker.gui.services.log_filter import parse_log_filter
+
+LINES = 200000
+FIELDS = ['level', 'msg', 'trace_id', 'duration']
+LEVELS = ['debug', 'info', 'info', 'info', 'warn', 'error']
+QUERIES = [':level=error', ':level=error duration>450', ':duration>=499', ':msg~timeout level!=debug']
+
+
+def get_store():
+    extractor = LogFieldExtractor(FIELDS)
+    store = LogStore(LINES)
+    for index in range(LINES):
+        line = json.dumps({
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'level': LEVELS[index % len(LEVELS)],
+            'msg': 'request timeout' if index % 1000 == 0 else 'request %d handled' % index,
+            'trace_id': '%032x' % (index * 7919),
+            'duration': index % 500,
+        })
+        store.append('svc-%d' % (index % 10), line, fields=extractor.extract(line))
+    return store
+
+
+def reparse(store, log_filter):
+    matches = []
+    for position in range(store.start, store.end):
+        document = json.loads(store.get(position).text)
+        fields = {field: document[field] for field in FIELDS if field in document}
+        if all(
+                condition.field in fields and (
+                    condition.matches_value(str(fields[condition.field])) if condition.operator in ('=', '!=', '~')
+                    else {'>': float.__gt__, '>=': float.__ge__, '<': float.__lt__, '<=': float.__le__}[
+                        condition.operator
+                    ](float(fields[condition.field]), condition.number)
+                )
+                for condition in log_filter.conditions
+        ):
+            matches.append(position)
+    return matches
+
+
+def columns(store, log_filter):
+    return [
+        position
+        for candidates in log_filter.get_candidate_ranges(store)
+        for position in log_filter.match(store, list(candidates))
+    ]
+
+
+def main():
+    store = get_store()
+    for query in QUERIES:
+        log_filter = parse_log_filter(query, FIELDS)
+        started = time.perf_counter()
+        expected = reparse(store, log_filter)
+        reparse_time = time.perf_counter() - started
+        started = time.perf_counter()
+        matches = columns(store, log_filter)
+        columns_time = time.perf_counter() - started
+        assert matches == expected, query
+        print('%-26s %7d matches  reparse %8.1f ms  columns %7.1f ms' % (
+            query, len(matches), reparse_time * 1000, columns_time * 1000
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark of the log pane filter, run with `python -m test.benchmark_log_filter`.
+
+`scan` runs the regex on every entry of the store, as the filter did, `indexed` only runs it on the
+entries of the blocks that the trigram index returns for the literals of the regex.
+"""
+import re
+import time
+import tracemalloc
+
+from gocker.data_structure.log_store import LogStore
+
+LINES = 1000000
+CONTEXTS = ['svc-%d' % index for index in range(10)]
+PATTERNS = ['payment refused', 'status=5\\d\\d', 'user-4242[^0-9]', 'timeout|refused', '\\d{4} ms']
+
+
+def get_store():
+    store = LogStore(LINES)
+    for index in range(LINES):
+        store.append(
+            CONTEXTS[index % len(CONTEXTS)],
+            '%s INFO request %d user-%d handled status=%d in %d ms%s' % (
+                time.strftime('%H:%M:%S'), index, index % 10007, 500 if index % 50000 == 0 else 200,
+                index % 500, ' payment refused' if index % 100003 == 0 else '',
+            ),
+        )
+    return store
+
+
+def measure(store, pattern):
+    regex = re.compile(pattern, re.IGNORECASE)
+    started = time.perf_counter()
+    scanned = [position for position in range(store.start, store.end) if regex.search(store.get_search_text(position))]
+    scan = time.perf_counter() - started
+    started = time.perf_counter()
+    indexed = store.search(regex)
+    search = time.perf_counter() - started
+    assert scanned == indexed
+    print('%-18s %7d matches  scan %8.1f ms  indexed %8.1f ms' % (pattern, len(indexed), scan * 1000, search * 1000))
+
+
+def main():
+    tracemalloc.start()
+    store = get_store()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('%d lines, %d bytes/line, index %d trigrams' % (LINES, size / LINES, len(store.index.postings)))
+    for pattern in PATTERNS:
+        measure(store, pattern)
+
+
+if __name__ == '__main__':
+    main()
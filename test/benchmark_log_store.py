@@ -0,0 +1,59 @@
+"""
+Memory benchmark of the log pane storage, run with `python -m test.benchmark_log_store`.
+
+`before` keeps one ContainerLogListViewItem per line, as the log pane did, `after` appends the lines
+to a LogStore, widgets are then only built for the rows on screen.
+"""
+import time
+import tracemalloc
+
+from gocker.data_structure.log_store import LogStore
+from gocker.gui.components.container_log_list import ContainerLogListViewItem
+
+LINES = 20000
+CONTEXTS = ['svc-%d' % index for index in range(10)]
+
+
+def get_lines():
+    now = time.time()
+    return [
+        (CONTEXTS[index % len(CONTEXTS)], '\x1b[32m%s INFO\x1b[0m request %d handled in %d ms é' % (
+            time.strftime('%H:%M:%S'), index, index % 500
+        ), 'stderr' if index % 7 == 0 else 'stdout', now + index / 1000)
+        for index in range(LINES)
+    ]
+
+
+def store_before(lines):
+    return [
+        ContainerLogListViewItem(context, [line], stream, timestamp)
+        for context, line, stream, timestamp in lines
+    ]
+
+
+def store_after(lines):
+    store = LogStore(LINES)
+    for context, line, stream, timestamp in lines:
+        store.append(context, line, stream, timestamp)
+    return store
+
+
+def measure(name, store):
+    lines = get_lines()
+    tracemalloc.start()
+    started = time.perf_counter()
+    stored = store(lines)
+    seconds = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print('%-6s %8d bytes/line  %6.2f us/line' % (name, size / LINES, seconds / LINES * 1000000))
+    return stored
+
+
+def main():
+    measure('before', store_before)
+    measure('after', store_after)
+
+
+if __name__ == '__main__':
+    main()
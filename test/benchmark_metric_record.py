@@ -0,0 +1,126 @@
+"""
+Micro-benchmark of the per sample metric update, run with `python -m test.benchmark_metric_record`.
+
+`before` replays the previous implementation: a new dataclass record per sample and strptime
+for the timestamp, `after` updates the __slots__ record in place with the fixed format parser.
+"""
+import dataclasses
+import math
+import sys
+import timeit
+import tracemalloc
+
+from gocker.data_structure.ring_buffer import RingBuffer
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_containers_metrics import calculate_cpu_percentage, \
+    calculate_memory_usage, parse_date_time, record_container_history, unix_time_millis, update_container_metric
+
+SAMPLES = 20000
+
+STAT = {
+    'read': '2024-01-01T10:20:31.123456789Z',
+    'preread': '2024-01-01T10:20:30.123456789Z',
+    'cpu_stats': {'cpu_usage': {'total_usage': 2000}, 'system_cpu_usage': 20000, 'online_cpus': 4},
+    'precpu_stats': {'cpu_usage': {'total_usage': 1000}, 'system_cpu_usage': 10000},
+    'memory_stats': {'usage': 4096},
+    'networks': {'eth0': {'rx_bytes': 1000, 'tx_bytes': 500}},
+    'blkio_stats': {'io_service_bytes_recursive': [{'op': 'read', 'value': 10}, {'op': 'write', 'value': 20}]},
+}
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclasses.dataclass
+class PreviousDockerContainerMetric:
+    container_id: str
+    container_name: str
+    container_ports: list
+    container_labels: list
+    status: str = ''
+    time_read: int = 0
+    cpu_percentage: float = None
+    cpu_percentage_previous: float = None
+    memory_usage: int = None
+    memory_usage_previous: int = None
+    cpu_history: RingBuffer = None
+    memory_history: RingBuffer = None
+    version: int = 0
+
+
+def previous_update_container_metric(metrics: PreviousDockerContainerMetric, stat: dict):
+    time_read = unix_time_millis(parse_date_time(stat['preread']))
+    cpu_percentage = calculate_cpu_percentage(stat, time_read - metrics.time_read)
+    memory_usage = calculate_memory_usage(stat)
+    metrics.cpu_history.append(cpu_percentage if cpu_percentage is not None else math.nan)
+    metrics.memory_history.append(memory_usage if memory_usage is not None else math.nan)
+    return PreviousDockerContainerMetric(
+        container_id=metrics.container_id,
+        container_name=metrics.container_name,
+        container_ports=metrics.container_ports,
+        container_labels=metrics.container_labels,
+        status=metrics.status,
+        time_read=time_read,
+        cpu_percentage=cpu_percentage,
+        cpu_percentage_previous=metrics.cpu_percentage,
+        memory_usage=memory_usage,
+        memory_usage_previous=metrics.memory_usage,
+        cpu_history=metrics.cpu_history,
+        memory_history=metrics.memory_history,
+        version=metrics.version + 1,
+    )
+
+
+def new_before():
+    return PreviousDockerContainerMetric('id', 'name', [], {}, cpu_history=RingBuffer(600),
+                                         memory_history=RingBuffer(600))
+
+
+def new_after():
+    return DockerContainerMetric('id', 'name', [], {}, cpu_history=RingBuffer(600), memory_history=RingBuffer(600))
+
+
+def record_size(metrics):
+    if hasattr(metrics, '__dict__'):
+        return sys.getsizeof(metrics) + sys.getsizeof(metrics.__dict__)
+    return sys.getsizeof(metrics)
+
+
+def measure(name, new_metrics, update):
+    def run():
+        metrics = new_metrics()
+        for _ in range(SAMPLES):
+            metrics = update(metrics, STAT) or metrics
+
+    seconds = min(timeit.repeat(run, number=1, repeat=5))
+
+    metrics = new_metrics()
+    metrics = update(metrics, STAT) or metrics
+    tracemalloc.start()
+    peaks = []
+    for _ in range(100):
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        metrics = update(metrics, STAT) or metrics
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - current)
+    tracemalloc.stop()
+
+    print('%-6s %8.2f us/sample  %6d bytes allocated/sample  %6d bytes/record' % (
+        name,
+        seconds / SAMPLES * 1000000,
+        sum(peaks) / len(peaks),
+        record_size(metrics),
+    ))
+
+
+def update_and_record_container_metric(metrics: DockerContainerMetric, stat: dict):
+    update_container_metric(metrics, stat)
+    record_container_history(metrics)
+
+
+def main():
+    measure('before', new_before, previous_update_container_metric)
+    measure('after', new_after, update_and_record_container_metric)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import argparse
+import unittest
+
+from gocker.arguments import positive_int_type, regex_type
+
+
+class TestArgumentTypes(unittest.TestCase):
+
+    def test_positive_int_type(self):
+        self.assertEqual(600, positive_int_type('600'))
+        for value in ['0', '-1', 'ten']:
+            with self.assertRaises(argparse.ArgumentTypeError):
+                positive_int_type(value)
+
+    def test_regex_type(self):
+        self.assertEqual(r'\d{4}-', regex_type(r'\d{4}-'))
+        self.assertEqual('', regex_type(''))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            regex_type('[unclosed')
+
+
+if __name__ == '__main__':
+    unittest.main()
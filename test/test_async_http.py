@@ -0,0 +1,64 @@
+import asyncio
+import os
+import ssl
+import tempfile
+import unittest
+
+from gocker.gui.services.async_http import UnsupportedHostUrlError, get_host_ssl_context, get_ssl_context, \
+    http_get, is_supported_host_url, open_connection, parse_host_url
+
+STATS_CHUNKS = [b'{"read": 1, "cpu"', b': {"usage": 2}}\n{"read"', b': 2}\n', b'{"read": 3}']
+
+
+async def get_chunked_stats(path):
+    requests = []
+
+    async def serve(reader, writer):
+        requests.append((await reader.readuntil(b'\r\n\r\n')).split(b'\r\n', 1)[0])
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n')
+        for chunk in STATS_CHUNKS:
+            writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_unix_server(serve, path)
+    async with server:
+        response = await http_get('unix://' + path, '/v1.41/containers/abc/stats', {'stream': 1})
+        try:
+            return requests, response.status, [stat async for stat in response.iter_json()]
+        finally:
+            response.close()
+
+
+class TestAsyncHttp(unittest.TestCase):
+
+    def test_parse_host_url(self):
+        self.assertEqual(('unix', '/var/run/docker.sock', None), parse_host_url('unix:///var/run/docker.sock'))
+        self.assertEqual(('http', 'docker', 2375), parse_host_url('tcp://docker:2375'))
+        self.assertEqual(('https', 'docker', 443), parse_host_url('https://docker'))
+
+    def test_supported_host_url(self):
+        self.assertTrue(is_supported_host_url('https://docker:2376'))
+        self.assertFalse(is_supported_host_url('ssh://user@docker'))
+        with self.assertRaises(UnsupportedHostUrlError):
+            asyncio.run(open_connection('ssh://user@docker'))
+
+    def test_ssl_context(self):
+        self.assertIsNone(get_host_ssl_context('unix:///var/run/docker.sock'))
+        self.assertIs(get_host_ssl_context('https://docker:2376'), get_host_ssl_context('https://other:2376'))
+        self.assertEqual(ssl.CERT_REQUIRED, get_ssl_context().verify_mode)
+        self.assertEqual(ssl.CERT_NONE, get_host_ssl_context('https://docker:2376', False).verify_mode)
+
+    def test_chunked_json_stream(self):
+        with tempfile.TemporaryDirectory() as directory:
+            requests, status, stats = asyncio.run(get_chunked_stats(os.path.join(directory, 'docker.sock')))
+
+        self.assertEqual([b'GET /v1.41/containers/abc/stats?stream=1 HTTP/1.1'], requests)
+        self.assertEqual(200, status)
+        self.assertEqual([{'read': 1, 'cpu': {'usage': 2}}, {'read': 2}, {'read': 3}], stats)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from gocker.gui.services.docker_container.cgroup_metrics import CgroupMetricsThread, CgroupReader, CgroupSample, \
+    calculate_cgroup_cpu_percentage
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+
+CONTAINER_ID = 'abc123'
+
+
+def write_file(root, path, content):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'w', encoding='ascii') as file_handler:
+        file_handler.write(content)
+
+
+class TestCgroupReader(unittest.TestCase):
+
+    def setUp(self):
+        # pylint: disable=consider-using-with
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_v2_systemd_driver(self):
+        write_file(self.root, 'cgroup.controllers', 'cpu memory io')
+        write_file(self.root, 'system.slice/docker-%s.scope/cpu.stat' % CONTAINER_ID,
+                   'usage_usec 1500\nuser_usec 1000\nsystem_usec 500\n')
+        write_file(self.root, 'system.slice/docker-%s.scope/memory.current' % CONTAINER_ID, '4096\n')
+
+        reader = CgroupReader(self.root)
+        files = reader.find_files(CONTAINER_ID)
+        sample = reader.read_sample(files)
+
+        self.assertTrue(reader.is_v2)
+        self.assertEqual(1500000, sample.cpu_usage_ns)
+        self.assertEqual(4096, sample.memory_usage)
+
+    def test_v2_cgroupfs_driver(self):
+        write_file(self.root, 'cgroup.controllers', 'cpu memory io')
+        write_file(self.root, 'docker/%s/cpu.stat' % CONTAINER_ID, 'usage_usec 10\n')
+        write_file(self.root, 'docker/%s/memory.current' % CONTAINER_ID, '12\n')
+
+        sample = CgroupReader(self.root).read_sample(CgroupReader(self.root).find_files(CONTAINER_ID))
+
+        self.assertEqual(10000, sample.cpu_usage_ns)
+        self.assertEqual(12, sample.memory_usage)
+
+    def test_v1_fallback(self):
+        write_file(self.root, 'cpuacct/docker/%s/cpuacct.usage' % CONTAINER_ID, '123456789\n')
+        write_file(self.root, 'memory/docker/%s/memory.usage_in_bytes' % CONTAINER_ID, '2048\n')
+
+        reader = CgroupReader(self.root)
+        sample = reader.read_sample(reader.find_files(CONTAINER_ID))
+
+        self.assertFalse(reader.is_v2)
+        self.assertEqual(123456789, sample.cpu_usage_ns)
+        self.assertEqual(2048, sample.memory_usage)
+
+    def test_block_io(self):
+        write_file(self.root, 'cgroup.controllers', 'cpu memory io')
+        write_file(self.root, 'docker/%s/cpu.stat' % CONTAINER_ID, 'usage_usec 10\n')
+        write_file(self.root, 'docker/%s/memory.current' % CONTAINER_ID, '12\n')
+        write_file(self.root, 'docker/%s/io.stat' % CONTAINER_ID,
+                   '8:0 rbytes=100 wbytes=200 rios=1 wios=2\n8:16 rbytes=10 wbytes=20 rios=1 wios=2\n')
+
+        reader = CgroupReader(self.root)
+        sample = reader.read_sample(reader.find_files(CONTAINER_ID))
+
+        self.assertEqual(110, sample.block_read_bytes)
+        self.assertEqual(220, sample.block_write_bytes)
+
+    def test_unknown_container(self):
+        write_file(self.root, 'cgroup.controllers', 'cpu memory io')
+
+        self.assertIsNone(CgroupReader(self.root).find_files(CONTAINER_ID))
+
+    def test_cpu_percentage(self):
+        previous = CgroupSample(1000000000, 0, 1000000000)
+        current = CgroupSample(1500000000, 0, 2000000000)
+
+        self.assertIsNone(calculate_cgroup_cpu_percentage(None, current))
+        self.assertAlmostEqual(50.0, calculate_cgroup_cpu_percentage(previous, current))
+
+
+class RemovingCgroupReader(CgroupReader):
+    """
+    Removes the container from the collector while its cgroup files are looked up.
+    """
+
+    def __init__(self, cgroup_root, collector):
+        super().__init__(cgroup_root)
+        self.collector = collector
+
+    def find_files(self, container_id):
+        files = super().find_files(container_id)
+        self.collector.remove_container(container_id)
+        return files
+
+
+class TestCgroupMetricsThread(unittest.TestCase):
+
+    def test_container_removed_during_lookup(self):
+        with tempfile.TemporaryDirectory() as root:
+            write_file(root, 'cgroup.controllers', 'cpu memory io')
+            write_file(root, 'docker/%s/cpu.stat' % CONTAINER_ID, 'usage_usec 10\n')
+            write_file(root, 'docker/%s/memory.current' % CONTAINER_ID, '12\n')
+            collector = CgroupMetricsThread(threading.RLock(), root)
+            collector.reader = RemovingCgroupReader(root, collector)
+            collector.add_container(DockerContainerMetric(CONTAINER_ID, 'svc', [], []))
+
+            collector._CgroupMetricsThread__update(CONTAINER_ID)  # pylint: disable=protected-access
+
+        self.assertEqual({}, collector.files)
+        self.assertIsNone(collector.get_container_metrics(CONTAINER_ID))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import re
+import unittest
+
+from gocker.gui.components.containers_list import ContainersListView
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+
+
+def new_metrics(container_id, cpu_percentage):
+    return DockerContainerMetric(container_id, container_id, [], {}, cpu_percentage=cpu_percentage)
+
+
+class TestContainersListView(unittest.TestCase):
+
+    def setUp(self):
+        self.view = ContainersListView()
+        self.containers = [new_metrics('c%d' % index, index) for index in range(3)]
+        self.view.apply_containers_delta(self.containers, [], [])
+
+    def get_rows(self):
+        return [item.container_metrics.container_id for item in self.view.walker]
+
+    def test_added_and_removed_rows(self):
+        self.view.apply_containers_delta([new_metrics('b', 0)], [], ['c1'])
+
+        self.assertEqual(['b', 'c0', 'c2'], self.get_rows())
+
+    def test_changed_row_is_replaced_in_place_when_sorted_by_name(self):
+        rows = list(self.view.walker)
+        self.containers[0].cpu_percentage = 10
+
+        self.view.apply_containers_delta([], [self.containers[0]], [])
+
+        self.assertEqual(['c0', 'c1', 'c2'], self.get_rows())
+        self.assertIsNot(rows[0], self.view.walker[0])
+        self.assertIs(rows[1], self.view.walker[1])
+        self.assertIs(rows[2], self.view.walker[2])
+
+    def test_changed_row_is_sorted_again_when_sorted_by_metric(self):
+        self.view.next_sort_column_container()
+        self.assertEqual(['c0', 'c1', 'c2'], self.get_rows())
+        self.containers[0].cpu_percentage = 10
+
+        self.view.apply_containers_delta([], [self.containers[0]], [])
+
+        self.assertEqual(['c1', 'c2', 'c0'], self.get_rows())
+
+    def test_renamed_row_is_sorted_and_filtered_again(self):
+        self.containers[0].container_name = 'zz'
+        self.view.apply_containers_delta([], [self.containers[0]], [])
+        self.assertEqual(['c1', 'c2', 'c0'], self.get_rows())
+
+        self.view.filter = re.compile('c')
+        self.view.reload_list()
+        self.assertEqual(['c1', 'c2'], self.get_rows())
+        self.containers[0].container_name = 'c3'
+        self.view.apply_containers_delta([], [self.containers[0]], [])
+        self.assertEqual(['c1', 'c2', 'c0'], self.get_rows())
+
+
+if __name__ == '__main__':
+    unittest.main()
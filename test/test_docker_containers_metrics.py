@@ -0,0 +1,48 @@
+import math
+import unittest
+
+from gocker.data_structure.ring_buffer import RingBuffer
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_containers_metrics import calculate_block_bytes, \
+    calculate_network_bytes, next_container_metric, record_container_history
+
+
+class TestContainerHistory(unittest.TestCase):
+
+    def test_one_value_per_tick(self):
+        metrics = DockerContainerMetric('id', 'name', [], {}, cpu_history=RingBuffer(10), memory_history=RingBuffer(10))
+        record_container_history(metrics)
+        for sample in range(5):
+            next_container_metric(metrics, sample * 200, float(sample), 1024 * sample)
+        record_container_history(metrics)
+        record_container_history(metrics)
+
+        self.assertTrue(math.isnan(metrics.cpu_history.values()[0]))
+        self.assertEqual([4.0, 4.0], metrics.cpu_history.values()[1:])
+        self.assertEqual([4096.0, 4096.0], metrics.memory_history.values()[1:])
+
+
+class TestContainerThroughputCounters(unittest.TestCase):
+
+    def test_counters(self):
+        stat = {
+            'networks': {'eth0': {'rx_bytes': 1000, 'tx_bytes': 500}, 'eth1': {'rx_bytes': 24}},
+            'blkio_stats': {'io_service_bytes_recursive': [
+                {'op': 'Read', 'value': 10},
+                {'op': 'write', 'value': 20},
+                {'op': 'read', 'value': 5},
+                {'op': 'Total', 'value': 35},
+            ]},
+        }
+
+        self.assertEqual((1024, 500), calculate_network_bytes(stat))
+        self.assertEqual((15, 20), calculate_block_bytes(stat))
+
+    def test_missing_counters(self):
+        self.assertEqual((None, None), calculate_network_bytes({}))
+        self.assertEqual((None, None), calculate_block_bytes({}))
+        self.assertEqual((None, None), calculate_block_bytes({'blkio_stats': {'io_service_bytes_recursive': None}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
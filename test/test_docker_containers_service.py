@@ -0,0 +1,165 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from dependency_injector import providers
+from event_bus import EventBus
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.events import ContainerMetricsEvent, ContainerStoppedEvent, DockerContainerEvent
+from gocker.gui.services.docker_container import docker_containers_service
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_containers_service import DockerListThread, \
+    DockerMetricsCollectorThread
+from gocker.gui.services.docker_container.metrics_collector import MetricsCollectorThread
+
+
+class FakeDockerClient:
+    def __init__(self):
+        self.running = {}
+        self.calls = []
+
+    def containers(self, _all, filters=None):
+        self.calls.append(filters)
+        return [
+            container for container in self.running.values()
+            if filters is None or container['Id'] == filters['id']
+        ]
+
+    def start(self, container_id, name, status='Up 1 second'):
+        self.running[container_id] = {
+            'Id': container_id,
+            'Names': ['/' + name],
+            'Ports': [],
+            'Labels': {},
+            'Status': status,
+        }
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestDockerMetricsCollectorThread(unittest.TestCase):
+
+    def setUp(self):
+        self.thread = DockerMetricsCollectorThread(None, EventBus(), threading.RLock())
+
+    def test_metrics_delta(self):
+        first = DockerContainerMetric('a', 'first', [], {})
+        second = DockerContainerMetric('b', 'second', [], {})
+        self.assertEqual(ContainerMetricsEvent([first, second], [], []), self.thread.get_metrics_delta([first, second]))
+        self.assertEqual(ContainerMetricsEvent([], [], []), self.thread.get_metrics_delta([first, second]))
+
+        second.version += 1
+        third = DockerContainerMetric('c', 'third', [], {})
+        self.assertEqual(ContainerMetricsEvent([third], [second], ['a']), self.thread.get_metrics_delta([second, third]))
+        self.assertEqual(ContainerMetricsEvent([], [], []), self.thread.get_metrics_delta([second, third]))
+
+
+# pylint: disable=c-extension-no-member
+class TestDockerListThread(unittest.TestCase):
+
+    def setUp(self):
+        self.client = FakeDockerClient()
+        self.client.start('a', 'first')
+        self.container = Container()
+        self.container.docker_client.override(providers.Object(self.client))
+        self.container.config.from_dict({
+            'docker': {'host_url': 'unix:///var/run/docker.sock'},
+            'metrics': {'backend': 'stream', 'history_size': 10},
+        })
+        self.container.wire(modules=[docker_containers_service])
+        self.bus = self.container.bus()
+        self.stopped = []
+        self.bus.add_event(self.stopped.append, ContainerStoppedEvent.__name__)
+        self.thread = None
+
+    def tearDown(self):
+        if self.thread is not None:
+            self.thread.stop()
+        self.container.unwire()
+
+    def start_thread(self, reconcile_interval=60.0):
+        with mock.patch.object(
+                docker_containers_service,
+                'metrics_collector_factory',
+                lambda *_: MetricsCollectorThread(self.container.draw_lock())
+        ):
+            self.thread = DockerListThread(reconcile_interval=reconcile_interval)
+        self.thread.start()
+        self.assertTrue(wait_until(lambda: 'a' in self.thread.containers))
+
+    def emit(self, action, container_id):
+        self.bus.emit(DockerContainerEvent.__name__, DockerContainerEvent(action, container_id, {}))
+
+    def get_metrics(self, container_id):
+        return self.thread.metrics_collector.get_container_metrics(container_id)
+
+    def test_start_event_adds_the_container(self):
+        self.start_thread()
+        self.client.start('b', 'second')
+
+        self.emit('start', 'b')
+
+        self.assertTrue(wait_until(lambda: self.get_metrics('b') is not None))
+        self.assertEqual('second', self.get_metrics('b').container_name)
+        self.assertEqual([None, {'id': 'b'}], self.client.calls)
+
+    def test_die_and_destroy_events_remove_the_container(self):
+        self.client.start('b', 'second')
+        self.start_thread()
+        del self.client.running['a']
+        del self.client.running['b']
+
+        self.emit('die', 'a')
+        self.emit('destroy', 'b')
+
+        self.assertTrue(wait_until(lambda: len(self.thread.containers) == 0))
+        self.assertEqual(['first', 'second'], [event.container_name for event in self.stopped])
+        self.assertIsNone(self.get_metrics('a'))
+        self.assertEqual([None], self.client.calls)
+
+    def test_rename_event_renames_the_container(self):
+        self.start_thread()
+        version = self.get_metrics('a').version
+        self.client.start('a', 'renamed')
+
+        self.emit('rename', 'a')
+
+        self.assertTrue(wait_until(lambda: self.get_metrics('a').container_name == 'renamed'))
+        self.assertEqual('renamed', self.thread.containers['a'])
+        self.assertGreater(self.get_metrics('a').version, version)
+
+    def test_health_status_event_updates_the_status(self):
+        self.start_thread()
+        self.client.start('a', 'first', 'Up 1 second (healthy)')
+
+        self.emit('health_status', 'a')
+
+        self.assertTrue(wait_until(lambda: self.get_metrics('a').status == 'Up 1 second (healthy)'))
+
+    def test_unhandled_events_do_not_query_the_daemon(self):
+        self.start_thread()
+
+        self.emit('exec_start', 'a')
+        self.emit('start', 'b')
+
+        self.assertTrue(wait_until(lambda: len(self.client.calls) == 2))
+        self.assertEqual([None, {'id': 'b'}], self.client.calls)
+
+    def test_missed_events_are_caught_up_by_the_reconciliation(self):
+        self.start_thread(reconcile_interval=0.1)
+        self.client.start('b', 'second')
+        del self.client.running['a']
+
+        self.assertTrue(wait_until(lambda: list(self.thread.containers) == ['b']))
+        self.assertEqual(['first'], [event.container_name for event in self.stopped])
+
+
+if __name__ == '__main__':
+    unittest.main()
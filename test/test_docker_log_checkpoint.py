@@ -0,0 +1,49 @@
+import unittest
+
+from gocker.gui.services.docker_container.docker_log_checkpoint import LogCheckpoint, LogCheckpointFilter, \
+    checkpoint_since
+
+FIRST = '2021-03-04T05:06:07.000000001Z'
+SECOND = '2021-03-04T05:06:07.100000000Z'
+
+
+class TestDockerLogCheckpoint(unittest.TestCase):
+
+    def test_checkpoint_since(self):
+        self.assertEqual('1614834367.100000000', checkpoint_since(SECOND))
+        self.assertEqual('1614834367.120000000', checkpoint_since('2021-03-04T05:06:07.12Z'))
+
+    def test_filter_strips_timestamps_and_moves_checkpoint(self):
+        checkpoint = LogCheckpoint()
+
+        lines = LogCheckpointFilter(checkpoint).filter([
+            ('stdout', '%s first' % FIRST),
+            ('stderr', '%s second' % SECOND),
+            ('stdout', '%s third' % SECOND),
+        ])
+
+        self.assertEqual([('stdout', 'first'), ('stderr', 'second'), ('stdout', 'third')], [
+            (stream, line) for stream, line, _ in lines
+        ])
+        self.assertAlmostEqual(1614834367.1, lines[2][2], places=6)
+        self.assertEqual(SECOND, checkpoint.timestamp)
+        self.assertEqual(2, checkpoint.count)
+
+    def test_resumed_stream_skips_displayed_lines(self):
+        checkpoint = LogCheckpoint()
+        LogCheckpointFilter(checkpoint).filter([
+            ('stdout', '%s first' % FIRST),
+            ('stdout', '%s second' % SECOND),
+        ])
+
+        resumed = LogCheckpointFilter(checkpoint)
+
+        self.assertEqual([], resumed.filter([('stdout', '%s second' % SECOND)]))
+        self.assertEqual(['same time', 'restarted'], [line for _, line, _ in resumed.filter([
+            ('stdout', '%s same time' % SECOND),
+            ('stdout', '2021-03-04T05:06:09.000000000Z restarted'),
+        ])])
+
+
+if __name__ == '__main__':
+    unittest.main()
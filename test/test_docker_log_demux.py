@@ -0,0 +1,57 @@
+import struct
+import unittest
+
+from gocker.gui.services.docker_container.docker_log_demux import MAX_PARTIAL_LINE_SIZE, STREAM_HEADER, \
+    STREAM_HEADER_SIZE, DockerLogDemuxer
+
+
+def frame(stream, payload: bytes):
+    return struct.pack('>BxxxL', stream, len(payload)) + payload
+
+
+class TestDockerLogDemuxer(unittest.TestCase):
+
+    def test_stream_header_size(self):
+        self.assertEqual(STREAM_HEADER.size, STREAM_HEADER_SIZE)
+
+    def test_frames_split_across_chunks(self):
+        data = frame(1, 'héllo\nwor'.encode()) + frame(2, b'oops\n') + frame(1, 'ld ✓\r\n'.encode())
+        demuxer = DockerLogDemuxer(False)
+
+        lines = []
+        for index in range(len(data)):
+            lines.extend(demuxer.feed(data[index:index + 1]))
+
+        self.assertEqual([('stdout', 'héllo'), ('stderr', 'oops'), ('stdout', 'world ✓')], lines)
+        self.assertEqual(0, len(demuxer.buffer))
+
+    def test_tty_stream(self):
+        data = 'first \x1b[32mline\x1b[0m\nsecond é'.encode()
+        demuxer = DockerLogDemuxer(True)
+
+        lines = demuxer.feed(data[:-1]) + demuxer.feed(data[-1:])
+
+        self.assertEqual([('stdout', 'first \x1b[32mline\x1b[0m')], lines)
+        self.assertEqual([('stdout', 'second é')], demuxer.flush())
+
+    def test_crlf_split_across_chunks(self):
+        demuxer = DockerLogDemuxer(True)
+
+        lines = demuxer.feed(b'hello\r') + demuxer.feed(b'\nnext\r\n')
+
+        self.assertEqual([('stdout', 'hello'), ('stdout', 'next')], lines)
+
+    def test_partial_line_is_bounded(self):
+        demuxer = DockerLogDemuxer(True)
+
+        lines = []
+        for progress in range(2000):
+            lines.extend(demuxer.feed(('\rdownloading %d%%' % progress).encode()))
+
+        self.assertGreater(len(lines), 0)
+        self.assertTrue(all(len(line) <= MAX_PARTIAL_LINE_SIZE + 32 for _, line in lines))
+        self.assertLessEqual(len(demuxer.partial_lines[1]), MAX_PARTIAL_LINE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from dependency_injector import providers
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.events import ContainerCreatedEvent, DockerContainerEvent
+from gocker.gui.services.docker_container import docker_logs_collector_service
+from gocker.gui.services.docker_container.docker_log_checkpoint import LogCheckpoint
+from gocker.gui.services.docker_container.docker_logs_collector_service import DockerLogsCollectorService, \
+    DockerLogStream
+
+
+class FakeDockerClient:
+    api_version = '1.41'
+    verify = True
+    cert = None
+
+
+class RecordingLogMultiplexer:
+    def __init__(self):
+        self.added = []
+        self.streams = []
+        self.removed = []
+
+    def add_stream(self, stream):
+        self.added.append(stream.key)
+        self.streams.append(stream)
+
+    def remove_stream(self, key):
+        self.removed.append(key)
+
+
+# pylint: disable=c-extension-no-member
+class TestDockerLogsCollectorService(unittest.TestCase):
+
+    def setUp(self):
+        self.container = Container()
+        self.container.docker_client.override(providers.Object(FakeDockerClient()))
+        self.container.config.from_dict({
+            'docker': {'host_url': 'unix:///var/run/docker.sock'},
+            'logs': {'tail': 10, 'all_tail': 100, 'since': None},
+        })
+        self.container.wire(modules=[docker_logs_collector_service])
+
+    def tearDown(self):
+        self.container.unwire()
+
+    def test_labelled_container_restart_keeps_the_log(self):
+        bus = self.container.bus()
+        multiplexer = RecordingLogMultiplexer()
+        collector = DockerLogsCollectorService(multiplexer)
+        container = {'Labels': {'gocker-log': 'true'}}
+
+        bus.emit(ContainerCreatedEvent.__name__, ContainerCreatedEvent('id-1', 'svc', container))
+        bus.emit(DockerContainerEvent.__name__, DockerContainerEvent('die', 'id-1', {'name': 'svc'}))
+        bus.emit(DockerContainerEvent.__name__, DockerContainerEvent('start', 'id-1', {'name': 'svc'}, 1704103205.5))
+        bus.emit(ContainerCreatedEvent.__name__, ContainerCreatedEvent('id-1', 'svc', container))
+
+        self.assertTrue(collector.is_logged('svc'))
+        self.assertIn('svc', collector.checkpoints)
+        self.assertEqual(['docker-svc#1', 'docker-svc#2'], multiplexer.added)
+        self.assertEqual([], multiplexer.removed)
+        self.assertEqual([None, 1704103205.5], [stream.follow_since for stream in multiplexer.streams])
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+
+    async def read_json(self):
+        return self.body
+
+    async def iter_chunks(self):
+        yield self.body
+
+    def close(self):
+        pass
+
+
+class TestDockerLogStream(unittest.TestCase):
+
+    def read(self, stream, logs_responses):
+        requests = []
+        emitted = []
+
+        async def fake_http_get(_, path, params=None, ssl_context=None):  # pylint: disable=unused-argument
+            requests.append(params)
+            if path.endswith('/json'):
+                return FakeResponse({'Config': {'Tty': True}})
+            return logs_responses.pop(0)
+
+        async def emit(_, lines, backlog=False):
+            emitted.append((backlog, [line for _, line, _ in lines]))
+
+        with mock.patch.object(docker_logs_collector_service, 'http_get', fake_http_get):
+            asyncio.run(stream.read(emit))
+        return requests[1:], emitted
+
+    def new_stream(self, checkpoint=None):
+        return DockerLogStream(
+            'svc', checkpoint or LogCheckpoint(), None, 10, None, 'unix:///var/run/docker.sock', FakeDockerClient()
+        )
+
+    def test_follow_resumes_after_the_last_backlog_line(self):
+        requests, emitted = self.read(self.new_stream(), [
+            FakeResponse(b'2024-01-01T10:00:00.000000001Z one\n2024-01-01T10:00:00.000000002Z two\n'),
+            FakeResponse(b'2024-01-01T10:00:00.000000002Z two\n2024-01-01T10:00:01.000000000Z three\n'),
+        ])
+
+        self.assertNotIn('until', requests[0])
+        self.assertEqual('1704103200.000000002', requests[1]['since'])
+        self.assertEqual([(True, ['one', 'two']), (False, ['three'])], emitted)
+
+    def test_follow_starts_at_the_daemon_time_without_backlog(self):
+        requests, emitted = self.read(self.new_stream(), [
+            FakeResponse(b'', {'date': 'Mon, 01 Jan 2024 10:00:05 GMT'}),
+            FakeResponse(b'2024-01-01T10:00:05.000000000Z new\n'),
+        ])
+
+        self.assertEqual(1704103205, requests[1]['since'])
+        self.assertEqual([(False, ['new'])], emitted)
+
+    def test_restart_before_the_first_line_only_follows(self):
+        stream = DockerLogStream(
+            'svc', LogCheckpoint(), 1704103205.5, 10, None, 'unix:///var/run/docker.sock', FakeDockerClient()
+        )
+        requests, emitted = self.read(stream, [
+            FakeResponse(b'2024-01-01T10:00:06.000000000Z after restart\n'),
+        ])
+
+        self.assertEqual([1704103205.5], [params['since'] for params in requests])
+        self.assertIn('follow', requests[0])
+        self.assertEqual([(False, ['after restart'])], emitted)
+
+    def test_unsupported_host_is_read_with_the_docker_client(self):
+        class FakeLogs:
+            def __init__(self, chunks):
+                self.chunks = iter(chunks)
+                self.closed = False
+
+            def __next__(self):
+                return next(self.chunks)
+
+            def close(self):
+                self.closed = True
+
+        class FakeLogsDockerClient(FakeDockerClient):
+            def __init__(self):
+                self.calls = []
+                self.streams = []
+
+            def logs(self, container, **params):
+                self.calls.append((container, params))
+                self.streams.append(FakeLogs([b'2024-01-01T10:00:00.000000001Z one\n2024-01-01T10:00:', b'01.0Z two']))
+                return self.streams[-1]
+
+        client = FakeLogsDockerClient()
+        emitted = []
+
+        async def emit(_, lines):
+            emitted.append([line for _, line, _ in lines])
+
+        stream = DockerLogStream('svc', LogCheckpoint(), None, 10, None, 'ssh://user@docker', client)
+        asyncio.run(stream.read(emit))
+
+        self.assertEqual([('svc', {
+            'stdout': True, 'stderr': True, 'timestamps': True, 'follow': True, 'stream': True, 'tail': 10
+        })], client.calls)
+        self.assertEqual([['one'], ['two']], emitted)
+        self.assertTrue(client.streams[0].closed)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from dependency_injector import providers
+
+from gocker.gui.dependency_injection import Container
+from gocker.gui.services.docker_container import docker_stats_multiplexer, metrics_sampling
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_stats_multiplexer import DockerStatsMultiplexerThread
+
+
+class FakeDockerClient:
+    api_version = '1.41'
+    verify = True
+    cert = None
+
+
+def get_stat(sample):
+    return {
+        'preread': '2024-01-01T10:20:%02d.000000000Z' % (sample % 60),
+        'cpu_stats': {'cpu_usage': {'total_usage': 2000}, 'system_cpu_usage': 20000, 'online_cpus': 4},
+        'precpu_stats': {'cpu_usage': {'total_usage': 1000}, 'system_cpu_usage': 10000},
+        'memory_stats': {'usage': 4096},
+    }
+
+
+class FakeStatsDaemon:
+    """
+    Unix socket server streaming a stats sample every 10 ms on each connection, in its own loop.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.loop = asyncio.new_event_loop()
+        self.started = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        server = self.loop.run_until_complete(asyncio.start_unix_server(self.serve, self.path))
+        self.started.set()
+        try:
+            self.loop.run_forever()
+            server.close()
+            tasks = asyncio.all_tasks(self.loop)
+            for task in tasks:
+                task.cancel()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        finally:
+            self.loop.close()
+
+    async def serve(self, reader, writer):
+        await reader.readuntil(b'\r\n\r\n')
+        writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nTransfer-Encoding: chunked\r\n\r\n')
+        try:
+            for sample in range(1000):
+                chunk = json.dumps(get_stat(sample)).encode() + b'\n'
+                writer.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                await writer.drain()
+                await asyncio.sleep(0.01)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def start(self):
+        self.thread.start()
+        self.started.wait(5)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(5)
+
+
+# pylint: disable=c-extension-no-member
+class TestDockerStatsMultiplexerThread(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()  # pylint: disable=consider-using-with
+        path = os.path.join(self.directory.name, 'docker.sock')
+        self.daemon = FakeStatsDaemon(path)
+        self.daemon.start()
+        self.container = Container()
+        self.container.docker_client.override(providers.Object(FakeDockerClient()))
+        self.container.config.from_dict({
+            'docker': {'host_url': 'unix://' + path},
+            'metrics': {'max_connections': 2, 'slow_interval': 10.0, 'busy_threshold': 5.0},
+        })
+        self.container.wire(modules=[docker_stats_multiplexer, metrics_sampling])
+
+    def tearDown(self):
+        self.container.unwire()
+        self.daemon.stop()
+        self.directory.cleanup()
+
+    def test_connections_are_bounded_and_rotated(self):
+        open_streams = []
+        max_open_streams = [0]
+        streamed_container_ids = []
+        http_get = docker_stats_multiplexer.http_get
+
+        async def counting_http_get(host_url, path, params=None, ssl_context=None):
+            response = await http_get(host_url, path, params, ssl_context)
+            open_streams.append(response)
+            streamed_container_ids.append(path.split('/')[3])
+            max_open_streams[0] = max(max_open_streams[0], len(open_streams))
+            close = response.close
+
+            def counting_close():
+                open_streams.remove(response)
+                close()
+            response.close = counting_close
+            return response
+
+        with mock.patch.object(docker_stats_multiplexer, 'http_get', counting_http_get):
+            multiplexer = DockerStatsMultiplexerThread()
+            multiplexer.start()
+            for container_id in ['a', 'b', 'c', 'd']:
+                multiplexer.add_container(DockerContainerMetric(container_id, container_id, [], []))
+            time.sleep(1.5)
+            multiplexer.stop()
+        multiplexer.apply_samples()
+
+        self.assertEqual(2, max_open_streams[0])
+        self.assertEqual({'a', 'b', 'c', 'd'}, set(streamed_container_ids))
+        self.assertGreater(len(streamed_container_ids), 4)
+        self.assertEqual(4096, multiplexer.get_container_metrics('d').memory_usage)
+
+    def test_unexpected_samples_are_skipped(self):
+        multiplexer = DockerStatsMultiplexerThread()
+        multiplexer.add_container(DockerContainerMetric('a', 'a', [], []))
+        multiplexer.add_container(DockerContainerMetric('b', 'b', [], []))
+        multiplexer.samples = {'a': {'preread': '2024-01-01T10:20:00.000000000Z'}, 'b': get_stat(1)}
+
+        with mock.patch.object(docker_stats_multiplexer.logging, 'warning') as warning:
+            multiplexer.apply_samples()
+
+        warning.assert_called_once()
+        self.assertEqual(4096, multiplexer.get_container_metrics('b').memory_usage)
+        self.assertEqual({}, multiplexer.samples)
+
+    def test_unsupported_host_stops_the_streams(self):
+        async def unsupported_http_get(*_):
+            raise docker_stats_multiplexer.UnsupportedHostUrlError('ssh://docker is not supported')
+
+        with mock.patch.object(docker_stats_multiplexer, 'http_get', unsupported_http_get), \
+                mock.patch.object(docker_stats_multiplexer.logging, 'error') as error:
+            multiplexer = DockerStatsMultiplexerThread()
+            multiplexer.start()
+            for container_id in ['a', 'b', 'c']:
+                multiplexer.add_container(DockerContainerMetric(container_id, container_id, [], []))
+            time.sleep(0.5)
+            self.assertEqual({}, {key: task for key, task in multiplexer.tasks.items() if not task.done()})
+            multiplexer.stop()
+
+        error.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+
+from dependency_injector import providers
+
+from gocker.data_structure.ring_buffer import RingBuffer
+from gocker.gui.dependency_injection import Container
+from gocker.gui.services.docker_container import docker_stats_poller, metrics_sampling
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.docker_stats_poller import DockerStatsPollerThread
+
+
+class FakeDockerClient:
+    api_version = '1.40'
+
+
+class SlowStatsClient:
+    """
+    Answers the stats requests once `release` is set.
+    """
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def stats(self, container_id, stream, one_shot):
+        with self.lock:
+            self.calls.append((container_id, stream, one_shot))
+        self.release.wait(5)
+        return {'cpu_stats': {}, 'memory_stats': {'usage': 1024}}
+
+
+# pylint: disable=c-extension-no-member
+class TestDockerStatsPollerThread(unittest.TestCase):
+
+    def setUp(self):
+        self.container = Container()
+        self.container.docker_client.override(providers.Object(FakeDockerClient()))
+        self.container.config.from_dict({
+            'docker': {'host_url': 'unix:///var/run/docker.sock'},
+            'metrics': {'max_connections': 4, 'slow_interval': 10.0, 'busy_threshold': 5.0},
+        })
+        self.container.wire(modules=[docker_stats_poller, metrics_sampling])
+
+    def tearDown(self):
+        self.container.unwire()
+
+    def add_containers(self, poller, container_ids):
+        for container_id in container_ids:
+            poller.add_container(DockerContainerMetric(
+                container_id, container_id, [], [], cpu_history=RingBuffer(10), memory_history=RingBuffer(10)
+            ))
+
+    def test_samples_of_a_tick_are_applied_together(self):
+        poller = DockerStatsPollerThread()
+        client = SlowStatsClient()
+        client.release.set()
+        poller.docker_client = client
+        self.add_containers(poller, ['a', 'b', 'c'])
+
+        tick = time.time()
+        poller.poll(tick, 0.0)
+        self.assertEqual(
+            [tick * 1000] * 3,
+            [poller.get_container_metrics(container_id).time_read for container_id in ['a', 'b', 'c']]
+        )
+        self.assertTrue(poller.refreshed.is_set())
+        poller.executor.shutdown(wait=True)
+
+    def test_slow_requests_are_not_resubmitted_and_applied_on_a_later_tick(self):
+        poller = DockerStatsPollerThread()
+        client = SlowStatsClient()
+        poller.docker_client = client
+        self.add_containers(poller, ['a', 'b'])
+
+        poller.poll(100.0, 0.0)
+        poller.poll(101.0, 1.0)
+        self.assertEqual([('a', False, None), ('b', False, None)], sorted(client.calls))
+        self.assertEqual(0, poller.get_container_metrics('a').time_read)
+
+        client.release.set()
+        poller.executor.shutdown(wait=True)
+        poller.poll(102.0, 2.0)
+        metrics = poller.get_container_metrics('a')
+        self.assertEqual((102000.0, 1024), (metrics.time_read, metrics.memory_usage))
+        self.assertEqual(set(), poller.pending_container_ids)
+        self.assertEqual({}, poller.in_flight)
+        self.assertFalse(poller.scheduler.is_due(metrics, 0.5))
+        self.assertTrue(poller.scheduler.is_due(metrics, 1.0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import gzip
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from event_bus import EventBus
+
+from gocker.gui.events import LogLinesIngestedEvent
+from gocker.gui.services import log_archive
+from gocker.gui.services.log_archive import LogArchiveThread, SEGMENT_PREFIX
+
+
+def read_segments(directory):
+    lines = []
+    for name in sorted(os.listdir(directory)):
+        with gzip.open(os.path.join(directory, name), 'rt', encoding='utf-8') as segment:
+            lines.extend(json.loads(line) for line in segment)
+    return lines
+
+
+class TestLogArchiveThread(unittest.TestCase):
+
+    def test_archive_lines(self):
+        with tempfile.TemporaryDirectory() as directory:
+            bus = EventBus()
+            archive = LogArchiveThread(directory, 1024 * 1024, 10 * 1024 * 1024, bus)
+            archive.start()
+            bus.emit(LogLinesIngestedEvent.__name__, LogLinesIngestedEvent('svc', [
+                ('stdout', 'first é', 1700000000.5),
+                ('stderr', 'second', None),
+            ]))
+            archive.stop()
+
+            lines = read_segments(directory)
+
+        self.assertEqual(
+            [('svc', 'stdout', 'first é', 1700000000.5), ('svc', 'stderr', 'second', None)],
+            [(line['container'], line['stream'], line['line'], line['timestamp']) for line in lines]
+        )
+        self.assertIsInstance(lines[0]['time'], float)
+
+    def test_rotation_and_retention(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, '%s00000000-000000-000001.jsonl.gz' % SEGMENT_PREFIX), 'wb') as old:
+                old.write(b'x' * 200)
+            bus = EventBus()
+            archive = LogArchiveThread(directory, 20 * 1024, 100 * 1024, bus)
+            archive.start()
+            for _ in range(10):
+                bus.emit(LogLinesIngestedEvent.__name__, LogLinesIngestedEvent('svc', [
+                    ('stdout', os.urandom(64).hex(), None) for _ in range(500)
+                ]))
+            archive.stop()
+
+            segments = os.listdir(directory)
+
+        self.assertNotIn('%s00000000-000000-000001.jsonl.gz' % SEGMENT_PREFIX, segments)
+        self.assertGreater(len(segments), 1)
+
+    def test_retry_after_error(self):
+        with tempfile.TemporaryDirectory() as parent, mock.patch.object(log_archive, 'ARCHIVE_RETRY_INTERVAL', 0.1):
+            directory = os.path.join(parent, 'archive')
+            with open(directory, 'w', encoding='utf-8'):
+                pass
+            bus = EventBus()
+            archive = LogArchiveThread(directory, 1024 * 1024, 10 * 1024 * 1024, bus)
+            failed = threading.Event()
+            with mock.patch.object(log_archive.logging, 'error', side_effect=lambda *_: failed.set()):
+                archive.start()
+                self.assertTrue(failed.wait(5))
+            os.unlink(directory)
+            os.makedirs(directory)
+            bus.emit(LogLinesIngestedEvent.__name__, LogLinesIngestedEvent('svc', [('stdout', 'after', None)]))
+            for _ in range(50):
+                if len(os.listdir(directory)) > 0:
+                    break
+                time.sleep(0.1)
+            archive.stop()
+
+            lines = read_segments(directory)
+
+        self.assertEqual(['after'], [line['line'] for line in lines])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import asyncio
+import unittest
+
+from gocker.arguments import LogOverflowPolicy
+from gocker.gui.services.log_buffer import LogSourceBuffer
+from gocker.gui.services.log_rate import LogRateMeter
+
+
+def lines(start, end):
+    return [('stdout', 'line %d' % index) for index in range(start, end)]
+
+
+class TestLogSourceBuffer(unittest.TestCase):
+
+    def test_drop_oldest(self):
+        async def scenario():
+            buffer = LogSourceBuffer('svc', 5, LogOverflowPolicy.DROP_OLDEST)
+            await buffer.put(lines(0, 8))
+            return buffer
+
+        buffer = asyncio.run(scenario())
+
+        self.assertEqual(lines(3, 8), buffer.pop(10))
+        self.assertEqual(8, buffer.accepted)
+        self.assertEqual(3, buffer.dropped)
+
+    def test_sample(self):
+        async def scenario():
+            buffer = LogSourceBuffer('svc', 4, LogOverflowPolicy.SAMPLE)
+            await buffer.put(lines(0, 4))
+            await buffer.put(lines(4, 12))
+            return buffer
+
+        buffer = asyncio.run(scenario())
+
+        self.assertEqual(2, buffer.sampling)
+        self.assertEqual(4, len(buffer))
+        self.assertEqual(12, buffer.accepted)
+        self.assertEqual(8, buffer.dropped)
+        buffer.pop(4)
+        self.assertEqual(1, buffer.sampling)
+
+    def test_block(self):
+        async def scenario():
+            buffer = LogSourceBuffer('svc', 3, LogOverflowPolicy.BLOCK)
+            producer = asyncio.ensure_future(buffer.put(lines(0, 5)))
+            await asyncio.sleep(0)
+            self.assertFalse(producer.done())
+            first = buffer.pop(3)
+            await producer
+            return buffer, first
+
+        buffer, first = asyncio.run(scenario())
+
+        self.assertEqual(lines(0, 3), first)
+        self.assertEqual(lines(3, 5), buffer.pop(3))
+        self.assertEqual(5, buffer.accepted)
+        self.assertEqual(0, buffer.dropped)
+
+    def test_flood_sampling(self):
+        async def scenario():
+            buffer = LogSourceBuffer('svc', 1000, LogOverflowPolicy.DROP_OLDEST, flood_threshold=10)
+            buffer.rate = LogRateMeter(clock=lambda: 100.0)
+            await buffer.put(lines(0, 10))
+            await buffer.put(lines(10, 30))
+            await buffer.put(lines(30, 50))
+            return buffer
+
+        buffer = asyncio.run(scenario())
+
+        self.assertEqual(8, buffer.get_sampling())
+        self.assertEqual(lines(0, 10) + lines(10, 30)[::4] + lines(30, 50)[4::8], buffer.pop(100))
+        self.assertEqual(50, buffer.accepted)
+        self.assertEqual(15 + 18, buffer.dropped)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from gocker.data_structure import log_store
+from gocker.data_structure.log_fields import LogFieldExtractor, parse_field_query
+from gocker.data_structure.log_store import LogStore
+from gocker.gui.services.log_filter import LogFieldFilter, LogRegexFilter, parse_log_filter
+
+FIELDS = ['level', 'msg', 'duration', 'http.status']
+
+
+class TestLogFields(unittest.TestCase):
+
+    def setUp(self):
+        self.chunk_size = log_store.LOG_STORE_CHUNK_SIZE
+        log_store.LOG_STORE_CHUNK_SIZE = 4
+
+    def tearDown(self):
+        log_store.LOG_STORE_CHUNK_SIZE = self.chunk_size
+
+    def test_extract(self):
+        extractor = LogFieldExtractor(FIELDS)
+
+        self.assertEqual(
+            {'level': 'error', 'duration': 812, 'http.status': 502},
+            extractor.extract('{"level": "error", "duration": 812, "http": {"status": 502}, "msg": null}'),
+        )
+        self.assertIsNone(extractor.extract('plain text {"level": "error"}'))
+        self.assertIsNone(extractor.extract('{"level": truncated'))
+
+    def test_parse_query(self):
+        log_filter = parse_log_filter(':level=error duration>=500 msg~"timed? out"', FIELDS)
+
+        self.assertIsInstance(log_filter, LogFieldFilter)
+        self.assertEqual(
+            [('level', '=', 'error'), ('duration', '>=', '500'), ('msg', '~', 'timed? out')],
+            [(condition.field, condition.operator, condition.value) for condition in log_filter.conditions],
+        )
+        self.assertIsNone(parse_field_query('user=bob', FIELDS))
+        self.assertIsNone(parse_field_query('duration>slow', FIELDS))
+        self.assertIsNone(parse_field_query('level=error timeout', FIELDS))
+        self.assertIsInstance(parse_log_filter(':level!=info', FIELDS), LogFieldFilter)
+        self.assertIsInstance(parse_log_filter('level!=info', FIELDS), LogRegexFilter)
+        self.assertIsInstance(parse_log_filter(':level=error timeout', FIELDS), LogRegexFilter)
+        self.assertIsInstance(parse_log_filter('[unbalanced', FIELDS), LogRegexFilter)
+
+    def test_match_fields(self):
+        extractor = LogFieldExtractor(FIELDS)
+        store = LogStore(100)
+        lines = [
+            'plain line',
+            '{"level": "info", "msg": "ok", "duration": 12}',
+            '{"level": "ERROR", "msg": "request timed out", "duration": 1500}',
+            'time=2024-01-01T10:20:30Z level=error msg=hello',
+            '{"level": "error", "msg": "refused", "duration": "300"}',
+            '{"level": "warn", "msg": "slow", "duration": 900.5}',
+            '{"level": "error", "msg": "no duration"}',
+        ]
+        for line in lines:
+            store.append('svc', line, fields=extractor.extract(line))
+
+        def search(query):
+            log_filter = parse_log_filter(query, FIELDS)
+            return [
+                position
+                for candidates in log_filter.get_candidate_ranges(store)
+                for position in log_filter.match(store, list(candidates))
+            ]
+
+        self.assertEqual([2, 4, 6], search(':level=error'))
+        self.assertEqual([3], search('level=error'))
+        self.assertEqual([3], search('msg=hello'))
+        self.assertEqual([2], search(':level=error duration>500'))
+        self.assertEqual([2, 5], search(':duration>=900'))
+        self.assertEqual([1, 5], search(':level!=error'))
+        self.assertEqual([2, 4], search(':msg~"timed out|refused"'))
+        self.assertEqual([4], search(':duration=300.0'))
+        self.assertEqual('1500', store.get_field(2, 'duration'))
+        self.assertIsNone(store.get_field(0, 'level'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import re
+import threading
+import unittest
+
+from gocker.data_structure.log_store import LogStore
+from gocker.gui.services.log_filter import LogFilterThread, LogRegexFilter, LOG_FILTER_STEP_SIZE
+
+
+class TestLogFilterThread(unittest.TestCase):
+
+    def setUp(self):
+        self.store = LogStore(10 * LOG_FILTER_STEP_SIZE)
+        for index in range(5 * LOG_FILTER_STEP_SIZE):
+            self.store.append('svc', 'request %d status %d' % (index, 500 if index % 100 == 0 else 200))
+        self.matches = []
+        self.progress = []
+        self.done = threading.Event()
+
+    def on_matches(self, positions, progress):
+        self.matches.extend(positions)
+        self.progress.append(progress)
+        if progress == 1.0:
+            self.done.set()
+
+    def test_progressive_and_live_matches(self):
+        lock = threading.RLock()
+        log_filter = LogFilterThread(self.store, self.on_matches, lock)
+        log_filter.apply(LogRegexFilter(re.compile('request 1\\d* status')))
+        log_filter.apply(LogRegexFilter(re.compile('status 500')))
+        log_filter.start()
+        try:
+            self.assertTrue(self.done.wait(5))
+            self.assertEqual(list(range(0, 5 * LOG_FILTER_STEP_SIZE, 100)), self.matches)
+            self.assertEqual(sorted(self.progress), self.progress)
+            self.assertGreater(len(self.progress), 1)
+
+            self.done.clear()
+            with lock:
+                positions = [
+                    self.store.append('svc', 'request live status 500'),
+                    self.store.append('svc', 'request live status 200'),
+                ]
+            log_filter.add_positions(positions)
+            self.assertTrue(self.done.wait(5))
+            self.assertEqual(positions[:1], self.matches[-1:])
+        finally:
+            log_filter.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+from gocker.arguments import DEFAULT_LOG_MULTILINE_CONTINUATION
+from gocker.gui.services.log_grouper import LogLineGrouper
+
+
+def continuations(grouper, lines, stream='stdout'):
+    return [grouper.is_continuation(stream, line) for line in lines]
+
+
+class TestLogLineGrouper(unittest.TestCase):
+
+    def test_python_traceback(self):
+        grouper = LogLineGrouper(None, DEFAULT_LOG_MULTILINE_CONTINUATION)
+
+        self.assertEqual([False, False, True, True, True, False], continuations(grouper, [
+            'INFO starting',
+            'Traceback (most recent call last):',
+            '  File "app.py", line 3, in <module>',
+            '    main()',
+            'ValueError: boom',
+            'INFO restarting',
+        ]))
+
+    def test_java_stack_trace(self):
+        grouper = LogLineGrouper(None, DEFAULT_LOG_MULTILINE_CONTINUATION)
+
+        self.assertEqual([False, True, True, True, True, False], continuations(grouper, [
+            'Exception in thread "main" java.lang.IllegalStateException: boom',
+            '\tat com.example.App.main(App.java:12)',
+            'Caused by: java.lang.NullPointerException',
+            '\tat com.example.App.init(App.java:20)',
+            '\t... 1 more',
+            '12:00:01 INFO next',
+        ]))
+
+    def test_start_pattern_and_streams(self):
+        grouper = LogLineGrouper(r'\d{4}-\d\d-\d\d ', None)
+
+        self.assertEqual([False, True], continuations(grouper, ['2021-03-04 first', 'wrapped']))
+        self.assertEqual([False, True], continuations(grouper, ['not a start', 'wrapped'], 'stderr'))
+        self.assertEqual([True, False], continuations(grouper, ['still wrapped', '2021-03-04 second']))
+
+    def test_disabled(self):
+        self.assertFalse(LogLineGrouper(None, '').is_enabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from event_bus import EventBus
+
+from gocker.arguments import LogOverflowPolicy
+from gocker.gui.events import LogBatchReceivedEvent, LogCountersEvent, LogLinesIngestedEvent
+from gocker.gui.services import log_multiplexer
+from gocker.gui.services.log_multiplexer import LogMultiplexerThread, LogStream
+
+
+class ScriptedLogStream(LogStream):
+    def __init__(self, key, chunks):
+        super().__init__(key, key)
+        self.chunks = chunks
+
+    async def read(self, emit):
+        for delay, lines in self.chunks:
+            await asyncio.sleep(delay)
+            await emit(self.context, lines)
+
+
+class EndlessLogStream(LogStream):
+    async def read(self, emit):
+        index = 0
+        while True:
+            await emit(self.context, [('stdout', '%s %d' % (self.key, index), None)])
+            index += 1
+            await asyncio.sleep(0.01)
+
+
+class TestLogMultiplexerThread(unittest.TestCase):
+
+    def new_multiplexer(self, bus):
+        return LogMultiplexerThread(bus, threading.RLock(), 100000, LogOverflowPolicy.DROP_OLDEST, 0, 0, None, None, [])
+
+    def test_streams_are_attached_and_detached(self):
+        bus = EventBus()
+        received = []
+        bus.add_event(lambda event: received.extend(event.logs), LogBatchReceivedEvent.__name__)
+        multiplexer = self.new_multiplexer(bus)
+        multiplexer.start()
+
+        multiplexer.add_stream(EndlessLogStream('svc', 'svc'))
+        multiplexer.add_stream(EndlessLogStream('svc', 'svc'))
+        time.sleep(0.3)
+        multiplexer.remove_stream('svc')
+        time.sleep(0.2)
+        count = len(received)
+        time.sleep(0.2)
+        multiplexer.stop()
+
+        self.assertGreater(count, 0)
+        self.assertEqual(count, len(received))
+        self.assertEqual(['svc %d' % index for index in range(count)], [log.line for log in received])
+        self.assertEqual({}, multiplexer.tasks)
+
+    def test_lines_are_sent_in_bounded_batches(self):
+        bus = EventBus()
+        batches = []
+        bus.add_event(batches.append, LogBatchReceivedEvent.__name__)
+        multiplexer = self.new_multiplexer(bus)
+        multiplexer.start()
+
+        multiplexer.add_stream(ScriptedLogStream('a', [(0, [('stdout', 'a', None)] * 4000)]))
+        multiplexer.add_stream(ScriptedLogStream('b', [(0, [('stdout', 'b', None)] * 4000)]))
+        time.sleep(0.5)
+        multiplexer.stop()
+
+        self.assertEqual([log_multiplexer.LOG_BATCH_MAX_SIZE, 3000], [len(batch.logs) for batch in batches])
+        self.assertEqual(
+            {'a': 2500, 'b': 2500},
+            {context: len([log for log in batches[0].logs if log.context == context]) for context in ['a', 'b']}
+        )
+
+    def test_reorder_by_timestamp(self):
+        bus = EventBus()
+        received = []
+        bus.add_event(lambda event: received.extend(event.logs), LogBatchReceivedEvent.__name__)
+        multiplexer = LogMultiplexerThread(
+            bus, threading.RLock(), 100, LogOverflowPolicy.DROP_OLDEST, 0, 0.3, None, None, []
+        )
+        multiplexer.start()
+        now = time.time()
+
+        multiplexer.add_stream(ScriptedLogStream('late', [
+            (0.1, [('stdout', 'late 1', now + 0.01), ('stdout', 'late 3', now + 0.03)]),
+        ]))
+        multiplexer.add_stream(ScriptedLogStream('early', [
+            (0, [('stdout', 'early 2', now + 0.02)]),
+            (0, [('stdout', 'no timestamp', None)]),
+        ]))
+        time.sleep(1)
+        multiplexer.stop()
+
+        self.assertEqual(
+            ['late 1', 'early 2', 'late 3', 'no timestamp'],
+            [log.line for log in received]
+        )
+
+    def test_ingested_lines_before_overflow(self):
+        bus = EventBus()
+        received = []
+        ingested = []
+        bus.add_event(lambda event: received.extend(event.logs), LogBatchReceivedEvent.__name__)
+        bus.add_event(ingested.append, LogLinesIngestedEvent.__name__)
+        multiplexer = LogMultiplexerThread(
+            bus, threading.RLock(), 2, LogOverflowPolicy.DROP_OLDEST, 0, 0, None, None, []
+        )
+        multiplexer.start()
+
+        lines = [('stdout', 'line %d' % index, None) for index in range(10)]
+        multiplexer.add_stream(ScriptedLogStream('svc', [(0, lines)]))
+        time.sleep(0.5)
+        multiplexer.stop()
+
+        self.assertEqual(['line 8', 'line 9'], [log.line for log in received])
+        self.assertEqual([LogLinesIngestedEvent('svc', lines)], ingested)
+
+    def test_counters_are_sent_while_streams_are_quiet(self):
+        bus = EventBus()
+        counters = []
+        bus.add_event(counters.append, LogCountersEvent.__name__)
+        with mock.patch.object(log_multiplexer, 'LOG_COUNTERS_INTERVAL', 0.1):
+            multiplexer = LogMultiplexerThread(
+                bus, threading.RLock(), 100, LogOverflowPolicy.DROP_OLDEST, 0, 0, None, None, []
+            )
+            multiplexer.start()
+            multiplexer.add_stream(ScriptedLogStream('svc', [(0, [('stdout', 'line', None)]), (10, [])]))
+            time.sleep(0.2)
+            sent = len(counters)
+            time.sleep(0.5)
+            multiplexer.stop()
+
+        self.assertGreaterEqual(len(counters) - sent, 3)
+        self.assertEqual(1, counters[-1].accepted['svc'])
+
+
+if __name__ == '__main__':
+    unittest.main()
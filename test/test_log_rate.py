@@ -0,0 +1,25 @@
+import unittest
+
+from gocker.gui.services.log_rate import LogRateMeter
+
+
+class TestLogRateMeter(unittest.TestCase):
+
+    def test_sliding_window(self):
+        now = [100.0]
+        meter = LogRateMeter(window=5, clock=lambda: now[0])
+
+        meter.add(10, 1000)
+        now[0] = 101.5
+        meter.add(20, 2000)
+        self.assertEqual((15, 1500), meter.rates())
+
+        now[0] = 105.2
+        self.assertEqual((4, 400), meter.rates())
+
+        now[0] = 120.0
+        self.assertEqual((0, 0), meter.rates())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from gocker.data_structure import log_store
+from gocker.data_structure.log_store import LogStore
+
+
+class TestLogStore(unittest.TestCase):
+
+    def setUp(self):
+        self.chunk_size = log_store.LOG_STORE_CHUNK_SIZE
+        log_store.LOG_STORE_CHUNK_SIZE = 4
+
+    def tearDown(self):
+        log_store.LOG_STORE_CHUNK_SIZE = self.chunk_size
+
+    def test_append_and_get(self):
+        store = LogStore(100)
+
+        store.append('svc', 'first é')
+        position = store.append('svc', 'Traceback', 'stderr', 12.5)
+        store.fold(position, '  File "x.py"')
+
+        entry = store.get(position)
+        self.assertEqual(('svc', 'stderr', 12.5), (entry.context, entry.stream, entry.timestamp))
+        self.assertEqual('Traceback\n  File "x.py"', entry.text)
+        self.assertEqual(['first é'], store.get(0).lines)
+        self.assertIsNone(store.get(0).timestamp)
+
+    def test_trim_releases_chunks(self):
+        store = LogStore(5)
+
+        for index in range(11):
+            store.append('svc-%d' % (index % 2), 'line %d' % index)
+
+        self.assertEqual(5, len(store))
+        self.assertEqual((6, 11), (store.start, store.end))
+        self.assertNotIn(5, store)
+        self.assertEqual(2, len(store.chunks))
+        self.assertEqual(['line 6', 'line 10'], [store.get(position).lines[0] for position in (6, 10)])
+        self.assertEqual('svc-0', store.get(10).context)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.metrics_sampling import FAST_INTERVAL, MetricsSamplingScheduler
+
+
+def new_metrics(container_id, cpu_percentage=None):
+    return DockerContainerMetric(container_id, container_id, [], {}, cpu_percentage=cpu_percentage)
+
+
+class TestMetricsSamplingScheduler(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = MetricsSamplingScheduler(10.0, 5.0)
+        self.visible = new_metrics('visible', 0.1)
+        self.idle = new_metrics('idle', 0.1)
+        self.busy = new_metrics('busy', 50.0)
+
+    def test_all_visible_before_the_first_render(self):
+        for metrics in (self.visible, self.idle, self.busy):
+            self.assertEqual(FAST_INTERVAL, self.scheduler.get_interval(metrics))
+
+    def test_due_intervals(self):
+        self.scheduler.set_visible_containers({'visible'})
+        for metrics in (self.visible, self.idle, self.busy):
+            self.assertTrue(self.scheduler.is_due(metrics, 100.0))
+            self.scheduler.mark_sampled(metrics, 100.0)
+
+        self.assertTrue(self.scheduler.is_due(self.visible, 101.0))
+        self.assertTrue(self.scheduler.is_due(self.busy, 101.0))
+        self.assertFalse(self.scheduler.is_due(self.idle, 101.0))
+        self.assertFalse(self.scheduler.is_due(self.idle, 109.9))
+        self.assertTrue(self.scheduler.is_due(self.idle, 110.0))
+
+    def test_newly_visible_container_is_due(self):
+        self.scheduler.set_visible_containers({'visible'})
+        self.scheduler.mark_sampled(self.idle, 100.0)
+
+        self.assertEqual({'idle'}, self.scheduler.set_visible_containers({'visible', 'idle'}))
+        self.assertTrue(self.scheduler.is_due(self.idle, 100.5))
+        self.assertEqual(set(), self.scheduler.set_visible_containers({'visible', 'idle'}))
+
+    def test_forget(self):
+        self.scheduler.set_visible_containers(set())
+        self.scheduler.mark_sampled(self.idle, 100.0)
+        self.scheduler.forget('idle')
+
+        self.assertTrue(self.scheduler.is_due(self.idle, 100.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
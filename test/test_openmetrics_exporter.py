@@ -0,0 +1,63 @@
+import unittest
+import urllib.error
+import urllib.request
+
+from event_bus import EventBus
+
+from gocker.gui.events import ContainerMetricsTickEvent
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.openmetrics_exporter import OPENMETRICS_CONTENT_TYPE, OpenMetricsExporter, \
+    render_openmetrics
+
+
+def new_metrics():
+    metrics = DockerContainerMetric('abc', 'web "1"\\n', [], {}, time_read=1700000000500, cpu_percentage=12.5)
+    metrics.network_rx_bytes = 2048
+    return metrics
+
+
+class TestRenderOpenMetrics(unittest.TestCase):
+
+    def test_render(self):
+        lines = render_openmetrics([
+            new_metrics(),
+            DockerContainerMetric('def', 'idle', [], {}),
+        ]).decode('utf-8').split('\n')
+
+        self.assertIn('# TYPE gocker_container_network_receive_bytes counter', lines)
+        self.assertIn('gocker_container_network_receive_bytes_total{id="abc",name="web \\"1\\"\\\\n"} 2048', lines)
+        self.assertIn('gocker_container_cpu_percent{id="abc",name="web \\"1\\"\\\\n"} 12.5', lines)
+        self.assertIn('gocker_container_last_sample_timestamp_seconds{id="abc",name="web \\"1\\"\\\\n"} 1700000000.5', lines)
+        self.assertEqual([], [line for line in lines if 'id="def"' in line])
+        self.assertEqual([], [line for line in lines if 'memory_usage_bytes{' in line])
+        self.assertEqual(['# EOF', ''], lines[-2:])
+
+
+class TestOpenMetricsExporter(unittest.TestCase):
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.exporter = OpenMetricsExporter(0, '127.0.0.1', self.bus)
+        self.exporter.start()
+        self.url = 'http://127.0.0.1:%d' % self.exporter.server.server_address[1]
+
+    def tearDown(self):
+        self.exporter.stop()
+
+    def test_scrape(self):
+        self.bus.emit(ContainerMetricsTickEvent.__name__, ContainerMetricsTickEvent([new_metrics()]))
+
+        with urllib.request.urlopen(self.url + '/metrics') as response:
+            self.assertEqual(OPENMETRICS_CONTENT_TYPE, response.headers['Content-Type'])
+            body = response.read()
+        self.assertEqual(render_openmetrics([new_metrics()]), body)
+
+    def test_not_found(self):
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            urllib.request.urlopen(self.url + '/other')  # pylint: disable=consider-using-with
+        context.exception.close()
+        self.assertEqual(404, context.exception.code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from gocker.data_structure.ring_buffer import RingBuffer
+
+
+class TestRingBuffer(unittest.TestCase):
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            RingBuffer(0)
+
+    def test_wrap_around(self):
+        ring_buffer = RingBuffer(4)
+        self.assertEqual([], ring_buffer.values())
+
+        for value in range(6):
+            ring_buffer.append(float(value))
+
+        self.assertEqual(4, len(ring_buffer))
+        self.assertEqual([2.0, 3.0, 4.0, 5.0], ring_buffer.values())
+        self.assertEqual([4.0, 5.0], ring_buffer.last(2))
+        self.assertEqual([2.0, 3.0, 4.0, 5.0], ring_buffer.last(10))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,24 @@
+import math
+import unittest
+
+from gocker.gui.helpers.sparkline import downsample, sparkline
+
+
+class TestSparkline(unittest.TestCase):
+
+    def test_sparkline(self):
+        self.assertEqual('▁▂▃▄▅▆▇█', sparkline([float(value) for value in range(8)], 8))
+        self.assertEqual('  ▁ █', sparkline([1.0, math.nan, 3.0], 5))
+        self.assertEqual('▁▁', sparkline([5.0, 5.0], 2))
+        self.assertEqual('   ', sparkline([math.nan], 3))
+
+    def test_minimum(self):
+        self.assertEqual('▄█', sparkline([50.0, 100.0], 2, 0.0))
+
+    def test_downsample_keeps_maximum(self):
+        self.assertEqual([3.0, 7.0], downsample([1.0, 3.0, math.nan, 2.0, 7.0, 0.0], 2))
+        self.assertTrue(math.isnan(downsample([math.nan, math.nan, 1.0, 2.0], 2)[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
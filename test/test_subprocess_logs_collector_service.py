@@ -0,0 +1,53 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from gocker.gui.services.docker_container.docker_log_demux import MAX_PARTIAL_LINE_SIZE
+from gocker.gui.services.subprocesse import subprocess_logs_collector_service
+from gocker.gui.services.subprocesse.subprocess_logs_collector_service import SupervisordSubprocessLogStream
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def iter_chunks(self):
+        for chunk in self.chunks:
+            yield chunk
+
+    def close(self):
+        pass
+
+
+def read_lines(chunks):
+    async def fake_http_get(*_):
+        return FakeResponse(chunks)
+
+    async def emit(_, batch):
+        lines.extend(line for _, line, _ in batch)
+
+    lines = []
+    stream = SupervisordSubprocessLogStream({'url': 'http://supervisor'}, 'svc', 'worker', 'stdout')
+    with mock.patch.object(subprocess_logs_collector_service, 'http_get', fake_http_get):
+        asyncio.run(stream.read(emit))
+    return lines
+
+
+class TestSupervisordSubprocessLogStream(unittest.TestCase):
+
+    def test_characters_split_across_chunks_are_decoded_whole(self):
+        encoded = 'café\nnaïve'.encode('utf-8')
+        split = encoded.index('é'.encode('utf-8')) + 1
+
+        self.assertEqual(['[stdout] café', '[stdout] naïve'], read_lines([encoded[:split], encoded[split:]]))
+
+    def test_partial_line_is_capped(self):
+        lines = read_lines([b'x' * (MAX_PARTIAL_LINE_SIZE + 1), b'y\n'])
+
+        self.assertEqual(['[stdout] ' + 'x' * (MAX_PARTIAL_LINE_SIZE + 1), '[stdout] y'], lines)
+
+
+if __name__ == '__main__':
+    unittest.main()
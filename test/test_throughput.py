@@ -0,0 +1,72 @@
+import unittest
+
+from gocker.gui.services.docker_container.dataclass import DockerContainerMetric
+from gocker.gui.services.docker_container.throughput import ThroughputRates
+
+
+def set_counters(metrics, time_read, network_rx_bytes, block_read_bytes=None):
+    metrics.time_read = time_read
+    metrics.network_rx_bytes = network_rx_bytes
+    metrics.network_tx_bytes = 0
+    metrics.block_read_bytes = block_read_bytes
+
+
+class TestThroughputRates(unittest.TestCase):
+
+    def setUp(self):
+        self.rates = ThroughputRates()
+        self.metrics = DockerContainerMetric('id', 'name', [], {})
+
+    def test_rates_from_two_samples(self):
+        set_counters(self.metrics, 1000, 1000, 500)
+        self.rates.update([self.metrics])
+        self.assertIsNone(self.metrics.network_rx_rate)
+
+        set_counters(self.metrics, 3000, 5000, 2500)
+        self.rates.update([self.metrics])
+
+        self.assertEqual(2000.0, self.metrics.network_rx_rate)
+        self.assertEqual(0.0, self.metrics.network_tx_rate)
+        self.assertEqual(1000.0, self.metrics.block_read_rate)
+        self.assertIsNone(self.metrics.block_write_rate)
+
+    def test_counter_reset(self):
+        set_counters(self.metrics, 1000, 5000)
+        self.rates.update([self.metrics])
+        set_counters(self.metrics, 2000, 6000)
+        self.rates.update([self.metrics])
+        set_counters(self.metrics, 3000, 100)
+        self.rates.update([self.metrics])
+
+        self.assertIsNone(self.metrics.network_rx_rate)
+
+    def test_unchanged_time_read_keeps_previous_sample(self):
+        set_counters(self.metrics, 1000, 1000)
+        self.rates.update([self.metrics])
+        set_counters(self.metrics, 1000, 1500)
+        self.rates.update([self.metrics])
+        self.assertIsNone(self.metrics.network_rx_rate)
+
+        set_counters(self.metrics, 2000, 3000)
+        self.rates.update([self.metrics])
+
+        self.assertEqual(2000.0, self.metrics.network_rx_rate)
+
+    def test_version_bumped_when_a_rate_changes(self):
+        set_counters(self.metrics, 1000, 1000)
+        self.rates.update([self.metrics])
+        set_counters(self.metrics, 2000, 2000)
+        self.rates.update([self.metrics])
+        version = self.metrics.version
+
+        set_counters(self.metrics, 3000, 3000)
+        self.rates.update([self.metrics])
+        self.assertEqual(version, self.metrics.version)
+
+        set_counters(self.metrics, 4000, 5000)
+        self.rates.update([self.metrics])
+        self.assertEqual(version + 1, self.metrics.version)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import re
+import unittest
+
+from gocker.data_structure import log_store
+from gocker.data_structure.log_store import LogStore
+from gocker.data_structure.trigram_index import TRIGRAM_BLOCK_SIZE, TrigramIndex, get_required_trigrams
+
+
+class TestTrigramIndex(unittest.TestCase):
+
+    def test_required_trigrams(self):
+        self.assertEqual(
+            {'foo', 'qux'},
+            get_required_trigrams(re.compile('foo(bar|baz)?qu[x]\\d{2,}abc?')),
+        )
+        self.assertEqual(
+            {'err', 'rro', 'ror', 'out'},
+            get_required_trigrams(re.compile('ERROR.*(time)+out', re.IGNORECASE)),
+        )
+        self.assertEqual({'tim', 'ime', 'top'}, get_required_trigrams(re.compile('time(?i:stop)')))
+        self.assertEqual(set(), get_required_trigrams(re.compile('a|b|[0-9]+')))
+
+    def test_candidate_blocks(self):
+        index = TrigramIndex()
+        for position in range(200):
+            index.add(position, 'line %d%s' % (position, ' Timeout' if position in (3, 130) else ''))
+
+        self.assertIsNone(index.get_candidate_blocks(set()))
+        self.assertEqual([0, 2], index.get_candidate_blocks({'tim', 'out'}))
+        self.assertEqual([], index.get_candidate_blocks({'zzz'}))
+
+        index.discard_before(100)
+        self.assertEqual([2], index.get_candidate_blocks({'tim', 'out'}))
+
+
+class TestLogStoreSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.chunk_size = log_store.LOG_STORE_CHUNK_SIZE
+        log_store.LOG_STORE_CHUNK_SIZE = 16
+
+    def tearDown(self):
+        log_store.LOG_STORE_CHUNK_SIZE = self.chunk_size
+
+    def test_search_matches_full_scan(self):
+        store = LogStore(300)
+        for index in range(1000):
+            position = store.append(
+                'svc-%d' % (index % 3),
+                'request %d status %d' % (index, 500 if index % 97 == 0 else 200),
+            )
+            if index % 89 == 0:
+                store.fold(position, '  Caused by: Timeout')
+
+        for pattern in ['status 500', 'svc-2 request 9', 'caused by: timeout', 'request \\d+ status [45]', '^svc']:
+            regex = re.compile(pattern, re.IGNORECASE)
+            self.assertEqual(
+                [
+                    position for position in range(store.start, store.end)
+                    if regex.search(store.get_search_text(position))
+                ],
+                store.search(regex),
+                pattern,
+            )
+
+    def test_search_non_ascii_case_variants(self):
+        store = LogStore(1000)
+        for text in ['STOP', 'ſtop', 'kill', '\u212aill', 'INFO', '\u0130nfo', '\u0131nfo']:
+            store.append('svc', text)
+            for index in range(TRIGRAM_BLOCK_SIZE - 1):
+                store.append('svc', 'line %d' % index)
+
+        for pattern in ['stop', 'kill', 'info']:
+            regex = re.compile(pattern, re.IGNORECASE)
+            self.assertEqual(
+                [
+                    position for position in range(store.start, store.end)
+                    if regex.search(store.get_search_text(position))
+                ],
+                store.search(regex),
+                pattern,
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from gocker.gui.helpers import urwidhelper
+from gocker.gui.helpers.urwidhelper import SGR_CACHE_SIZE, translate_text_for_urwid
+
+
+def get_segments(text):
+    return [(attr_spec.foreground, attr_spec.background, segment) for attr_spec, segment in translate_text_for_urwid(text)]
+
+
+class TestTranslateTextForUrwid(unittest.TestCase):
+
+    def test_plain_text(self):
+        self.assertEqual([('default', 'default', 'plain line')], get_segments('plain line'))
+        self.assertEqual([], get_segments(''))
+
+    def test_sgr_state_is_kept_across_sequences(self):
+        self.assertEqual(
+            [
+                ('default', 'default', 'a '),
+                ('dark red,bold', 'default', 'b'),
+                ('default,bold', 'dark blue', 'c'),
+                ('default', 'default', 'd'),
+            ],
+            get_segments('a \x1b[1m\x1b[31mb\x1b[39;44mc\x1b[0md'),
+        )
+
+    def test_extended_colors(self):
+        self.assertEqual(
+            [('#f80', 'light red', 'x'), ('#0a0b0c', '#ffffff', 'y')],
+            get_segments('\x1b[38;5;208;48;5;9mx\x1b[38;2;10;11;12;48:2::255:255:255my'),
+        )
+
+    def test_other_escapes_are_dropped(self):
+        self.assertEqual(
+            [('dark green', 'default', 'ok done')],
+            get_segments('\x1b]0;title\x07\x1b[32mok\x1b[K \x1b(Bdone'),
+        )
+
+    def test_attr_specs_are_shared(self):
+        first = translate_text_for_urwid('\x1b[1;33mwarn')[0][0]
+        second = translate_text_for_urwid('\x1b[33m\x1b[1mwarn')[0][0]
+        self.assertIs(first, second)
+
+    def test_caches_are_bounded(self):
+        for red in range(256):
+            for green in range(0, 256, 8):
+                translate_text_for_urwid('\x1b[38;2;%d;%d;0mx' % (red, green))
+
+        # pylint: disable=protected-access
+        self.assertLessEqual(len(urwidhelper._sgr_states), SGR_CACHE_SIZE)
+        self.assertLessEqual(len(urwidhelper._attr_specs), SGR_CACHE_SIZE)
+
+
+if __name__ == '__main__':
+    unittest.main()